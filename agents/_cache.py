@@ -0,0 +1,212 @@
+"""Content-addressed cache of agent responses.
+
+Every runner funnels its LLM call through `cached_run`, which keys the
+response on (model id, system prompt hash, output schema hash, user message).
+Re-running a job with identical inputs then costs no tokens, and after a
+prompt change only the stages whose prompt (or upstream output) changed are
+re-executed — e.g. a Narrative Editor tweak replays every window from cache.
+
+The store is a single SQLite file (`LLM_CACHE_PATH`, default under `data/`)
+so it survives restarts and is shared by every worker on the host. Entries
+expire after `LLM_CACHE_TTL_SEC` and the least-recently-used rows are evicted
+beyond `LLM_CACHE_MAX_ENTRIES`. `LLM_CACHE_ENABLED=false` bypasses it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from agents._ratelimit import estimate_tokens, get_rate_limiter
+from agents._settings import AgentSettings
+from agents._usage import record_run_failure, record_run_usage, run_usage
+
+_log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    output TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+)
+"""
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _schema_hash(output_type: type[BaseModel]) -> str:
+    return _sha256(json.dumps(output_type.model_json_schema(), sort_keys=True))
+
+
+def cache_key(model: str, system_prompt: str, output_type: type[BaseModel], user_msg: str) -> str:
+    """Stable key for one agent call; any input change yields a new key."""
+    parts = (model, _sha256(system_prompt), _schema_hash(output_type), _sha256(user_msg))
+    return _sha256("\x1f".join(parts))
+
+
+class ResponseCache:
+    """SQLite-backed TTL + LRU store of validated agent outputs (as JSON)."""
+
+    def __init__(self, path: Path, *, ttl_sec: float, max_entries: int) -> None:
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Short-lived connections: callers run on event loops in several threads
+        # and processes, and sqlite3 connections must not cross threads.
+        conn = sqlite3.connect(self.path, timeout=10.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get[T: BaseModel](self, key: str, output_type: type[T]) -> T | None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT output FROM responses WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_sec),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+        try:
+            return output_type.model_validate_json(row[0])
+        except ValidationError:
+            # Same schema hash, so only a corrupted row lands here.
+            _log.warning("Discarding unreadable cache entry %s", key[:12])
+            self.delete(key)
+            return None
+
+    def put(self, key: str, output: BaseModel) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, output, created_at, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, output.model_dump_json(), now, now),
+            )
+            self._evict(conn, now)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock, self._connect() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_sec,))
+        excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY used_at LIMIT ?)",
+                (excess,),
+            )
+
+
+@lru_cache(maxsize=4)
+def _open_cache(path: str, ttl_sec: float, max_entries: int) -> ResponseCache:
+    return ResponseCache(Path(path), ttl_sec=ttl_sec, max_entries=max_entries)
+
+
+def get_response_cache(settings: AgentSettings) -> ResponseCache | None:
+    """The shared cache for these settings, or None when caching is bypassed."""
+    if not settings.llm_cache_enabled:
+        return None
+    try:
+        return _open_cache(
+            settings.llm_cache_path, settings.llm_cache_ttl_sec, settings.llm_cache_max_entries
+        )
+    except (OSError, sqlite3.Error):
+        _log.warning("LLM cache unavailable at %s — running uncached", settings.llm_cache_path)
+        return None
+
+
+async def cached_run[T: BaseModel](
+    agent: Any,
+    user_msg: str,
+    *,
+    system_prompt: str,
+    output_type: type[T],
+    settings: AgentSettings,
+    role: str = "",
+    validate: Callable[[T], None] | None = None,
+) -> T:
+    """`agent.run(user_msg).output`, served from the response cache when possible.
+
+    Misses are paced by the shared rate limiter before the request is sent.
+    SQLite reads and writes run in a worker thread, off the event loop that the
+    other windows' calls share. Cache errors never fail a run; they only cost the cache hit. Misses are
+    recorded in the usage accumulator under `role`, failed calls as failures.
+    `validate` may reject an output that parsed but is unusable (by raising)
+    before it is cached.
+    """
+    cache = get_response_cache(settings)
+    key = cache_key(settings.llm_model, system_prompt, output_type, user_msg)
+    if cache is not None:
+        try:
+            hit = await asyncio.to_thread(cache.get, key, output_type)
+        except sqlite3.Error:
+            _log.warning("LLM cache read failed", exc_info=True)
+            hit = None
+        if hit is not None:
+            _log.debug("LLM cache hit %s (%s)", key[:12], output_type.__name__)
+            return hit
+
+    limiter = get_rate_limiter(settings)
+    est_tokens = estimate_tokens(system_prompt, user_msg)
+    if limiter is not None:
+        await limiter.acquire(est_tokens)
+    started = time.perf_counter()
+    try:
+        result = await agent.run(user_msg)
+    except Exception:
+        record_run_failure(role=role, latency_sec=time.perf_counter() - started)
+        raise
+    record_run_usage(result, role=role, latency_sec=time.perf_counter() - started)
+    if limiter is not None:
+        usage = run_usage(result)
+        limiter.settle(est_tokens, usage.total_tokens if usage else None)
+    output: T = result.output
+    if validate is not None:
+        try:
+            validate(output)
+        except Exception:
+            record_run_failure(role=role)
+            raise
+    if cache is not None:
+        try:
+            await asyncio.to_thread(cache.put, key, output)
+        except sqlite3.Error:
+            _log.warning("LLM cache write failed", exc_info=True)
+    return output
+
+
+__all__ = ["ResponseCache", "cache_key", "cached_run", "get_response_cache"]
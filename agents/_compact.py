@@ -0,0 +1,75 @@
+"""Compact rendering of agent inputs.
+
+Every `_format_input` takes a `compact` flag, driven by `AGENT_COMPACT_PROMPTS`
+(default on). Compact mode serialises embedded models without indentation,
+drops None/default fields (empty anomaly lists, blank summaries), rounds floats
+to two places and shortens the verbose schema keys below. Event lines lose
+their boilerplate, and the weaver gets calm windows as a single line. The
+verbose form is kept for debugging prompts by eye.
+
+Only agent *inputs* are affected; output schemas and prompts are unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+# Long schema keys → the short names the LLM sees in compact mode.
+_SHORT_KEYS = {
+    "time_range_start": "start",
+    "time_range_end": "end",
+    "timestamp_start": "start",
+    "timestamp_end": "end",
+    "overall_visual_state": "state",
+    "overall_vocal_state": "state",
+    "overall_verbal_state": "state",
+    "detected_anomalies": "anomalies",
+    "contradiction_context": "context",
+    "feature_type": "feature",
+    "behavioral_tag": "tag",
+    "intensity_score": "intensity",
+    "is_sustained": "sustained",
+    "raw_summary": "raw",
+    "what_happened": "what",
+    "why_it_matters": "why",
+    "interpretation": "meaning",
+}
+
+
+def _shorten(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {_SHORT_KEYS.get(k, k): _shorten(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_shorten(v) for v in value]
+    if isinstance(value, float):
+        return round(value, 2)
+    return value
+
+
+def dump_model(model: BaseModel, *, compact: bool, include: set[str] | None = None) -> str:
+    """JSON for a model embedded in a prompt (indented, or compact as above)."""
+    if not compact:
+        return model.model_dump_json(include=include, indent=2)
+    data = model.model_dump(mode="json", include=include, exclude_none=True, exclude_defaults=True)
+    return json.dumps(_shorten(data), ensure_ascii=False, separators=(",", ":"))
+
+
+def event_line(ev: Any, *, compact: bool) -> str:
+    """One anomaly event as a bullet line."""
+    if not compact:
+        return (
+            f"- [{ev.feature_type}] {ev.behavioral_tag} at "
+            f"{ev.timestamp_start:.2f}–{ev.timestamp_end:.2f}s, "
+            f"intensity={ev.intensity_score:.2f}, sustained={ev.is_sustained}"
+        )
+    sustained = " sustained" if ev.is_sustained else ""
+    return (
+        f"- {ev.feature_type} {ev.timestamp_start:.2f}–{ev.timestamp_end:.2f}s "
+        f"{ev.intensity_score:.1f}σ{sustained}"
+    )
+
+
+__all__ = ["dump_model", "event_line"]
@@ -3,13 +3,22 @@
 Used by the agent runners to build the structured input for each observer.
 Keeps the per-agent files thin and lets us unit-test the extraction logic
 without touching pydantic-ai.
+
+Each anomaly column is parsed once into flat per-row arrays (`_Column`);
+events and raw summaries are reductions over row intervals of those arrays.
+`extract_windows` does this for every window of a job in one pass over the
+master timeline (and one over the transcript), instead of re-walking the dict
+cells per window and per modality. The single-window helpers below are the
+same reductions over a whole `rows` frame.
 """
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from agents.schemas import (
@@ -17,6 +26,7 @@ from agents.schemas import (
     VisualAnomalyEvent,
     VocabularyAnomalyEvent,
 )
+from agents.windows import sort_by_time
 
 # Map master_df column → (event-feature label, event class).
 _VISUAL_COLUMNS = {
@@ -37,47 +47,107 @@ _VERBAL_COLUMNS = {
 }
 
 
-def _events_from(
-    rows: pd.DataFrame, column_map: Mapping[str, tuple[str, type]], default_tag: str
+@dataclass
+class _Column:
+    """One anomaly column parsed into per-row arrays (NaN / False where absent)."""
+
+    anomalous: np.ndarray  # is_anomalous
+    rz: np.ndarray  # |rz_score|
+    range_lo: np.ndarray  # min(part_of_anomalous_range)
+    range_hi: np.ndarray  # max(part_of_anomalous_range)
+    sustained: np.ndarray  # continuous_anomaly
+    value: np.ndarray  # the column's primary raw metric (see `_RAW_KEY`)
+    has_value: np.ndarray
+
+
+def _num(v: Any) -> float:
+    return float(v) if isinstance(v, (int, float)) else np.nan
+
+
+def _parse_column(cells: Sequence[Any], raw_key: str) -> _Column:
+    n = len(cells)
+    col = _Column(
+        anomalous=np.zeros(n, dtype=bool),
+        rz=np.full(n, np.nan),
+        range_lo=np.full(n, np.nan),
+        range_hi=np.full(n, np.nan),
+        sustained=np.zeros(n, dtype=bool),
+        value=np.full(n, np.nan),
+        has_value=np.zeros(n, dtype=bool),
+    )
+    for i, cell in enumerate(cells):
+        if not isinstance(cell, dict):
+            continue
+        col.anomalous[i] = bool(cell.get("is_anomalous"))
+        col.rz[i] = abs(_num(cell.get("rz_score")))
+        r = cell.get("part_of_anomalous_range")
+        if r:
+            col.range_lo[i], col.range_hi[i] = min(r), max(r)
+        col.sustained[i] = bool(cell.get("continuous_anomaly"))
+        v = cell.get(raw_key)
+        if isinstance(v, (int, float)):
+            col.value[i], col.has_value[i] = v, True
+    return col
+
+
+def _parse_columns(rows: pd.DataFrame) -> dict[str, _Column]:
+    return {
+        col: _parse_column(rows[col].to_numpy(), key)
+        for col, key in _RAW_KEY.items()
+        if col in rows.columns
+    }
+
+
+def _event_in(
+    col: _Column, lo: int, hi: int, feature_label: str, klass: type, default_tag: str
+) -> Any | None:
+    """One event for rows [lo, hi) of a column, spanning its anomalous ranges."""
+    anom = col.anomalous[lo:hi]
+    if not anom.any():
+        return None
+    starts = col.range_lo[lo:hi][anom]
+    has_range = ~np.isnan(starts)
+    if not has_range.any():
+        return None
+    return klass(
+        timestamp_start=float(starts[has_range].min()),
+        timestamp_end=float(col.range_hi[lo:hi][anom][has_range].max()),
+        feature_type=feature_label,
+        behavioral_tag=default_tag,
+        intensity_score=float(np.nan_to_num(col.rz[lo:hi][anom]).max()),
+        is_sustained=bool(col.sustained[lo:hi][anom].any()),
+    )
+
+
+def _events_in(
+    columns: Mapping[str, _Column],
+    lo: int,
+    hi: int,
+    column_map: Mapping[str, tuple[str, type]],
+    default_tag: str,
 ) -> list:
-    """Walk one anomaly-column family and emit one event per anomalous range cluster."""
+    """One event per column with anomalous rows in [lo, hi)."""
     out: list[Any] = []
     for col, (feature_label, klass) in column_map.items():
-        if col not in rows.columns:
-            continue
-        anom_rows = []
-        for _, cell in rows[col].items():
-            if not isinstance(cell, dict):
-                continue
-            if not cell.get("is_anomalous"):
-                continue
-            anom_rows.append(cell)
-        if not anom_rows:
-            continue
-        # One event per column, using min/max rz_score across the window.
-        rz_scores = [abs(c.get("rz_score", 0.0)) for c in anom_rows]
-        starts = [
-            min(c["part_of_anomalous_range"]) for c in anom_rows if c.get("part_of_anomalous_range")
-        ]
-        ends = [
-            max(c["part_of_anomalous_range"]) for c in anom_rows if c.get("part_of_anomalous_range")
-        ]
-        if not starts or not ends:
-            continue
-        sustained = any(c.get("continuous_anomaly") for c in anom_rows)
-        out.append(
-            klass(
-                timestamp_start=float(min(starts)),
-                timestamp_end=float(max(ends)),
-                feature_type=feature_label,
-                behavioral_tag=default_tag,
-                intensity_score=float(max(rz_scores)) if rz_scores else 0.0,
-                is_sustained=bool(sustained),
-            )
-        )
+        if col in columns:
+            event = _event_in(columns[col], lo, hi, feature_label, klass, default_tag)
+            if event is not None:
+                out.append(event)
     return out
 
 
+def _events_from(
+    rows: pd.DataFrame, column_map: Mapping[str, tuple[str, type]], default_tag: str
+) -> list:
+    """Walk one anomaly-column family and emit one event per anomalous range cluster."""
+    columns = {
+        col: _parse_column(rows[col].to_numpy(), _RAW_KEY[col])
+        for col in column_map
+        if col in rows.columns
+    }
+    return _events_in(columns, 0, len(rows), column_map, default_tag)
+
+
 def extract_visual_events(rows: pd.DataFrame) -> list[VisualAnomalyEvent]:
     return _events_from(rows, _VISUAL_COLUMNS, default_tag="Visual anomaly")
 
@@ -113,35 +183,48 @@ _VERBAL_RAW = {
 }
 
 
-def _summarize_raw(rows: pd.DataFrame, raw_map: Mapping[str, tuple[str, str]]) -> str:
-    """One compact line: per-metric mean + anomaly count + peak deviation."""
+# Column → primary raw key, across all three families.
+_RAW_KEY = {col: key for m in (_VISUAL_RAW, _AUDIO_RAW, _VERBAL_RAW) for col, (_, key) in m.items()}
+
+
+def _summary_in(
+    columns: Mapping[str, _Column], lo: int, hi: int, raw_map: Mapping[str, tuple[str, str]]
+) -> str:
+    """One compact line for rows [lo, hi): per-metric mean + anomaly count + peak deviation."""
     parts: list[str] = []
-    for col, (label, key) in raw_map.items():
-        if col not in rows.columns:
+    for col, (label, _key) in raw_map.items():
+        if col not in columns:
             continue
-        vals: list[float] = []
-        n_anom = 0
-        peak_rz = 0.0
-        for cell in rows[col]:
-            if not isinstance(cell, dict):
-                continue
-            v = cell.get(key)
-            if isinstance(v, (int, float)):
-                vals.append(float(v))
-            if cell.get("is_anomalous"):
-                n_anom += 1
-            rz = cell.get("rz_score")
-            if isinstance(rz, (int, float)):
-                peak_rz = max(peak_rz, abs(float(rz)))
-        if not vals and n_anom == 0:
+        c = columns[col]
+        has_value = c.has_value[lo:hi]
+        n_anom = int(c.anomalous[lo:hi].sum())
+        if not has_value.any() and n_anom == 0:
             continue
-        seg = f"{label} avg={sum(vals) / len(vals):.2f}" if vals else label
+        seg = f"{label} avg={c.value[lo:hi][has_value].mean():.2f}" if has_value.any() else label
         if n_anom:
+            peak_rz = float(np.nan_to_num(c.rz[lo:hi]).max(initial=0.0))
             seg += f" [{n_anom} anomalous, peak {peak_rz:.1f}σ]"
         parts.append(seg)
     return "; ".join(parts) if parts else "all signals at baseline"
 
 
+def _anomalies_in(
+    columns: Mapping[str, _Column], lo: int, hi: int, raw_map: Mapping[str, tuple[str, str]]
+) -> int:
+    """Anomalous samples in rows [lo, hi) across one modality's metrics."""
+    return sum(int(columns[col].anomalous[lo:hi].sum()) for col in raw_map if col in columns)
+
+
+def _summarize_raw(rows: pd.DataFrame, raw_map: Mapping[str, tuple[str, str]]) -> str:
+    """One compact line: per-metric mean + anomaly count + peak deviation."""
+    columns = {
+        col: _parse_column(rows[col].to_numpy(), key)
+        for col, (_label, key) in raw_map.items()
+        if col in rows.columns
+    }
+    return _summary_in(columns, 0, len(rows), raw_map)
+
+
 def summarize_visual_raw(rows: pd.DataFrame) -> str:
     return _summarize_raw(rows, _VISUAL_RAW)
 
@@ -179,11 +262,102 @@ def extract_transcript_slice(
     return " ".join(str(t) for t in selected["text"].tolist())
 
 
+def _transcript_spans(
+    transcript_df: pd.DataFrame | None,
+    spans: Sequence[tuple[float, float]],
+    speaker_label: str | None,
+) -> list[str]:
+    """`extract_transcript_slice` for many spans: one filter + sort, then bisection.
+
+    Utterances are sorted by start; an utterance overlaps [s, e] iff it starts
+    by `e` and ends at/after `s`. The running max of `end` is monotonic, so
+    `searchsorted` on it skips every utterance that ends before `s`; the few
+    survivors in between are masked directly.
+    """
+    if transcript_df is None or transcript_df.empty:
+        return [""] * len(spans)
+    df = transcript_df
+    if speaker_label is not None and "speaker" in df.columns:
+        df = df.loc[df["speaker"] == speaker_label]
+    df = df.sort_values("start", kind="stable")
+    starts = df["start"].to_numpy(dtype=float)
+    ends = df["end"].to_numpy(dtype=float)
+    reach = np.maximum.accumulate(ends) if len(ends) else ends
+    texts = [str(t) for t in df["text"].tolist()]
+    out: list[str] = []
+    for s, e in spans:
+        lo = int(np.searchsorted(reach, s, side="left"))
+        hi = int(np.searchsorted(starts, e, side="right"))
+        hits = np.flatnonzero(ends[lo:hi] >= s) + lo if hi > lo else ()
+        out.append(" ".join(texts[i] for i in hits))
+    return out
+
+
+@dataclass
+class WindowExtract:
+    """Everything the agents read about one window, from `extract_windows`."""
+
+    visual_events: list[VisualAnomalyEvent]
+    audio_events: list[AudioAnomalyEvent]
+    vocab_events: list[VocabularyAnomalyEvent]
+    visual_raw: str
+    audio_raw: str
+    vocab_raw: str
+    # Anomalous samples per modality (what the raw summaries count, summed).
+    visual_anomalies: int
+    audio_anomalies: int
+    vocab_anomalies: int
+    transcript: str
+
+
+def extract_windows(
+    master_df: pd.DataFrame,
+    spans: Sequence[tuple[float, float]],
+    transcript_df: pd.DataFrame | None = None,
+    *,
+    speaker_label: str | None = None,
+) -> list[WindowExtract]:
+    """Events, raw summaries and transcript slice for each `(start, end)` span.
+
+    Rows are selected exactly as `windows.slice_rows` does (start ≤ Time ≤ end)
+    and the results equal the per-window `extract_*` / `summarize_*` helpers,
+    but every dict cell of the timeline is read once however many windows
+    there are.
+    """
+    if not spans:
+        return []
+    master_df = sort_by_time(master_df)
+    times = master_df["Time"].to_numpy()
+    columns = _parse_columns(master_df)
+    transcripts = _transcript_spans(transcript_df, spans, speaker_label)
+    out: list[WindowExtract] = []
+    for (start, end), transcript in zip(spans, transcripts, strict=True):
+        lo = int(np.searchsorted(times, start, side="left"))
+        hi = int(np.searchsorted(times, end, side="right"))
+        out.append(
+            WindowExtract(
+                visual_events=_events_in(columns, lo, hi, _VISUAL_COLUMNS, "Visual anomaly"),
+                audio_events=_events_in(columns, lo, hi, _AUDIO_COLUMNS, "Audio anomaly"),
+                vocab_events=_events_in(columns, lo, hi, _VERBAL_COLUMNS, "Verbal anomaly"),
+                visual_raw=_summary_in(columns, lo, hi, _VISUAL_RAW),
+                audio_raw=_summary_in(columns, lo, hi, _AUDIO_RAW),
+                vocab_raw=_summary_in(columns, lo, hi, _VERBAL_RAW),
+                visual_anomalies=_anomalies_in(columns, lo, hi, _VISUAL_RAW),
+                audio_anomalies=_anomalies_in(columns, lo, hi, _AUDIO_RAW),
+                vocab_anomalies=_anomalies_in(columns, lo, hi, _VERBAL_RAW),
+                transcript=transcript,
+            )
+        )
+    return out
+
+
 __all__ = [
+    "WindowExtract",
     "extract_audio_events",
     "extract_transcript_slice",
     "extract_visual_events",
     "extract_vocab_events",
+    "extract_windows",
     "summarize_audio_raw",
     "summarize_visual_raw",
     "summarize_vocab_raw",
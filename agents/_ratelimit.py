@@ -0,0 +1,147 @@
+"""Proactive request/token pacing for LLM calls.
+
+`_retry.with_retries` only reacts after a 429. This module paces calls before
+they are sent: every agent call reserves one request and its estimated tokens
+from a pair of token buckets (requests/min, tokens/min) keyed on the API key
+and model, and sleeps until the reservation is covered. The buckets live at
+module level, so every window of every job in the process — including the
+worker's shared agent loop and concurrent background jobs on their own loops —
+draws from the same quota instead of each assuming it owns the key.
+
+Reservations may drive a bucket negative; the caller then waits for the debt to
+refill. That keeps callers in arrival order without a polling loop, and works
+across event loops because the state is guarded by a thread lock, not an
+asyncio primitive. Once a call finishes, `settle` replaces the token estimate
+with the provider-reported usage.
+
+Limits come from `LLM_RPM` / `LLM_TPM` or the per-model `LLM_RATE_LIMITS`;
+both default to 0 (no pacing).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+
+from agents._settings import AgentSettings
+
+_log = logging.getLogger(__name__)
+
+# Rough chars-per-token for English prompts; `settle` corrects the estimate.
+_CHARS_PER_TOKEN = 4
+# Reserved up front for the response, which we cannot measure before the call.
+_OUTPUT_TOKEN_ALLOWANCE = 1024
+
+
+def estimate_input_tokens(*texts: str) -> int:
+    """Prompt tokens for `texts`, without any allowance for the response."""
+    return sum(len(t) for t in texts) // _CHARS_PER_TOKEN
+
+
+def estimate_tokens(*texts: str) -> int:
+    return estimate_input_tokens(*texts) + _OUTPUT_TOKEN_ALLOWANCE
+
+
+class TokenBucket:
+    """Continuously refilling bucket of `per_minute` units, burst = one minute's worth."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self._level = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` now (possibly into debt); return seconds until it is covered."""
+        with self._lock:
+            self._refill()
+            # A single call larger than the bucket still runs — after a full refill.
+            self._level -= min(amount, self.capacity)
+            return 0.0 if self._level >= 0 else -self._level / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """Return (`amount` > 0) or additionally charge (< 0) units."""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level + amount)
+
+
+class RateLimiter:
+    """Requests/min and tokens/min buckets for one (API key, model) pair."""
+
+    def __init__(self, rpm: int, tpm: int) -> None:
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+
+    async def acquire(self, est_tokens: int) -> float:
+        """Wait until one request of ~`est_tokens` fits the quota; return the wait."""
+        wait = max(
+            self.requests.reserve(1) if self.requests else 0.0,
+            self.tokens.reserve(est_tokens) if self.tokens else 0.0,
+        )
+        if wait > 0:
+            _log.debug("Pacing LLM call: waiting %.2fs for quota", wait)
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.release(est_tokens)
+                raise
+        return wait
+
+    def release(self, est_tokens: int) -> None:
+        """Give back a reservation whose request was never sent."""
+        if self.requests:
+            self.requests.adjust(1)
+        if self.tokens:
+            self.tokens.adjust(est_tokens)
+
+    def settle(self, est_tokens: int, actual_tokens: int | None) -> None:
+        """Swap the up-front token estimate for the provider-reported total."""
+        if self.tokens and actual_tokens:
+            self.tokens.adjust(est_tokens - actual_tokens)
+
+
+_limiters: dict[tuple[str, str, int, int], RateLimiter] = {}
+_lock = threading.Lock()
+
+
+def _key_id(settings: AgentSettings) -> str:
+    keys = f"{settings.groq_api_key or ''}|{settings.gemini_api_key or ''}"
+    return hashlib.sha256(keys.encode()).hexdigest()[:16]
+
+
+def get_rate_limiter(settings: AgentSettings) -> RateLimiter | None:
+    """The process-wide limiter for this key + model, or None when unpaced."""
+    limit = settings.rate_limit()
+    if limit.rpm <= 0 and limit.tpm <= 0:
+        return None
+    key = (_key_id(settings), settings.llm_model, limit.rpm, limit.tpm)
+    with _lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(limit.rpm, limit.tpm)
+        return _limiters[key]
+
+
+def reset_rate_limiters() -> None:
+    """Test hook: forget all buckets."""
+    with _lock:
+        _limiters.clear()
+
+
+__all__ = [
+    "RateLimiter",
+    "TokenBucket",
+    "estimate_input_tokens",
+    "estimate_tokens",
+    "get_rate_limiter",
+    "reset_rate_limiters",
+]
@@ -1,14 +1,28 @@
-"""Tiny exponential-backoff wrapper for agent calls.
+"""Backoff wrapper for agent calls, plus the per-run adaptive concurrency limit.
 
-Per spec §9.4: each agent call gets 3 retries with exponential backoff.
-On final failure the orchestrator marks the window errored and continues.
+Per spec §9.4: each agent call gets 3 retries with backoff. On final failure
+the orchestrator marks the window errored and continues.
+
+Waits honour the provider's retry hint (Retry-After header, Gemini's
+`retryDelay`, Groq's "try again in 7.5s") when there is one, and otherwise use
+decorrelated jitter so concurrent windows do not retry in lockstep. Every
+rate-limit error and every success is also reported to the run's
+`AdaptiveSemaphore` (AIMD), which halves the number of windows in flight on
+429s and grows it back by one per `limit` successes.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import logging
+import math
+import random
+import re
+import time
 from collections.abc import Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from types import TracebackType
 
 _log = logging.getLogger(__name__)
 
@@ -25,6 +39,16 @@ _RATE_LIMIT_MARKERS = (
 _RATE_LIMIT_ATTEMPTS = 6
 _RATE_LIMIT_MIN_DELAY = 8.0
 _MAX_DELAY = 30.0
+# A server hint is trusted further than our own guess, but not indefinitely.
+_MAX_HINT_DELAY = 90.0
+# Spread callers that got the same hint over this many extra seconds.
+_HINT_JITTER = 2.0
+# Ignore further 429s for this long after shrinking, so one burst halves once.
+_AIMD_COOLDOWN_SEC = 5.0
+
+# "retryDelay": "37s" (Gemini RetryInfo), "try again in 1m7.5s" / "in 750ms" (Groq).
+_RETRY_DELAY_RE = re.compile(r"retry_?delay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", re.IGNORECASE)
+_TRY_AGAIN_RE = re.compile(r"try again in\s+(?:(\d+)m)?(\d+(?:\.\d+)?)(ms|s)\b", re.IGNORECASE)
 
 # Daily-quota exhaustion is NOT recoverable within a run (it resets ~24h later),
 # so we must fail fast instead of backing off — unlike a per-minute rate limit.
@@ -57,27 +81,154 @@ def _is_daily_quota(exc: BaseException) -> bool:
     return any(m in s or m.replace(" ", "") in s.replace(" ", "") for m in _DAILY_QUOTA_MARKERS)
 
 
+def is_transient(exc: BaseException) -> bool:
+    """A timeout, dropped connection or 5xx anywhere on the cause chain.
+
+    Such a call may well succeed if simply re-sent, unlike a reply that failed
+    output validation.
+    """
+    seen: BaseException | None = exc
+    while seen is not None:
+        if isinstance(seen, (TimeoutError, ConnectionError)):
+            return True
+        name = type(seen).__name__
+        if "Timeout" in name or "Connect" in name or "Transport" in name:
+            return True
+        status = getattr(seen, "status_code", None)
+        if isinstance(status, int) and status >= 500:
+            return True
+        seen = seen.__cause__ or seen.__context__
+    return False
+
+
+def _header_delay(value: str) -> float | None:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds the provider asked us to wait, if the error (or its cause) says.
+
+    pydantic-ai wraps SDK/HTTP errors, so the whole `__cause__` chain is checked
+    for a `Retry-After` header before falling back to hints in the message.
+    """
+    seen: BaseException | None = exc
+    while seen is not None:
+        headers = getattr(getattr(seen, "response", None), "headers", None)
+        if headers is not None and (value := headers.get("retry-after")) is not None:
+            if (delay := _header_delay(str(value))) is not None:
+                return delay
+        seen = seen.__cause__ or seen.__context__
+    text = f"{exc} {getattr(exc, 'body', '') or ''}"
+    if m := _RETRY_DELAY_RE.search(text):
+        return float(m.group(1))
+    if m := _TRY_AGAIN_RE.search(text):
+        minutes, amount, unit = m.groups()
+        seconds = float(amount) / (1000.0 if unit == "ms" else 1.0)
+        return seconds + 60.0 * int(minutes or 0)
+    return None
+
+
+class AdaptiveSemaphore:
+    """Async semaphore whose limit follows AIMD on rate-limit feedback.
+
+    Starts at `max_limit`; `on_rate_limit` halves it (at most once per
+    cooldown), `on_success` adds `1/limit`, i.e. +1 after a full round of
+    successes. Holders are never revoked — a shrink only delays new entrants.
+    """
+
+    def __init__(self, max_limit: int, *, min_limit: int = 1) -> None:
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(self.max_limit)
+        self._active = 0
+        self._cond = asyncio.Condition()
+        self._last_decrease = -math.inf
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < int(self.limit))
+            self._active += 1
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def on_rate_limit(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < _AIMD_COOLDOWN_SEC:
+            return
+        self._last_decrease = now
+        old = int(self.limit)
+        self.limit = max(float(self.min_limit), self.limit / 2)
+        if int(self.limit) != old:
+            _log.info("Rate limited — concurrency %d -> %d", old, int(self.limit))
+
+    def on_success(self) -> None:
+        if self.limit < self.max_limit:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+
+_current_limit: contextvars.ContextVar[AdaptiveSemaphore | None] = contextvars.ContextVar(
+    "mmr_adaptive_limit", default=None
+)
+
+
+def use_adaptive_limit(sem: AdaptiveSemaphore) -> contextvars.Token[AdaptiveSemaphore | None]:
+    """Route this context's retry feedback to `sem` (tasks created after inherit it)."""
+    return _current_limit.set(sem)
+
+
+def reset_adaptive_limit(token: contextvars.Token[AdaptiveSemaphore | None]) -> None:
+    _current_limit.reset(token)
+
+
+def _backoff(prev: float, floor: float) -> float:
+    """Decorrelated jitter: uniform between the floor and 3x the previous wait."""
+    return min(_MAX_DELAY, random.uniform(floor, max(floor, prev * 3)))
+
+
 async def with_retries[T](
     fn: Callable[[], Awaitable[T]],
     *,
     max_attempts: int = 3,
     base_delay: float = 1.0,
     label: str = "agent",
+    retry_if: Callable[[BaseException], bool] | None = None,
 ) -> T:
-    """Call `fn` with exponential backoff.
+    """Call `fn`, retrying with jittered backoff.
 
     Generic failures get `max_attempts` tries. Rate-limit / quota errors get
-    more tries and a longer minimum wait, so a free-tier key has a real chance
-    to finish instead of every window silently failing. Re-raises the last
-    exception if all attempts fail — the orchestrator catches it per-window.
+    more tries and a longer minimum wait (or exactly the server's retry hint,
+    plus jitter), so a free-tier key has a real chance to finish instead of
+    every window silently failing. Re-raises the last exception if all
+    attempts fail — the orchestrator catches it per-window. With `retry_if`,
+    other failures are re-raised at once unless `retry_if(exc)` holds.
     """
     delay = base_delay
     last_exc: BaseException | None = None
     attempt = 0
+    adaptive = _current_limit.get()
     while True:
         attempt += 1
         try:
-            return await fn()
+            result = await fn()
         except Exception as e:
             last_exc = e
             # A daily quota won't recover mid-run — don't waste minutes retrying.
@@ -85,11 +236,19 @@ async def with_retries[T](
                 _log.error("%s hit the daily quota — failing fast (no retry): %s", label, e)
                 raise
             rate_limited = _is_rate_limit(e)
+            if rate_limited and adaptive is not None:
+                adaptive.on_rate_limit()
+            if not rate_limited and retry_if is not None and not retry_if(e):
+                raise
             cap = max(max_attempts, _RATE_LIMIT_ATTEMPTS) if rate_limited else max_attempts
             if attempt >= cap:
                 _log.error("%s failed after %d attempts: %s", label, attempt, e)
                 raise
-            wait = min(max(delay, _RATE_LIMIT_MIN_DELAY) if rate_limited else delay, _MAX_DELAY)
+            hint = retry_after(e) if rate_limited else None
+            if hint is not None:
+                wait = min(hint, _MAX_HINT_DELAY) + random.uniform(0, _HINT_JITTER)
+            else:
+                wait = _backoff(delay, _RATE_LIMIT_MIN_DELAY if rate_limited else base_delay)
             _log.warning(
                 "%s attempt %d/%d failed (%s) — retrying in %.1fs",
                 label,
@@ -99,8 +258,22 @@ async def with_retries[T](
                 wait,
             )
             await asyncio.sleep(wait)
-            delay *= 2
+            delay = wait
+        else:
+            if adaptive is not None:
+                adaptive.on_success()
+            return result
     raise last_exc  # type: ignore[misc]  # unreachable, but appeases the type checker
 
 
-__all__ = ["DAILY_QUOTA_MESSAGE", "RATE_LIMIT_MESSAGE", "RateLimitedError", "with_retries"]
+__all__ = [
+    "DAILY_QUOTA_MESSAGE",
+    "RATE_LIMIT_MESSAGE",
+    "AdaptiveSemaphore",
+    "RateLimitedError",
+    "is_transient",
+    "reset_adaptive_limit",
+    "retry_after",
+    "use_adaptive_limit",
+    "with_retries",
+]
@@ -0,0 +1,153 @@
+"""Skip or share observer calls whose input carries nothing new.
+
+Many observer calls are for a modality that is simply at baseline in that
+window — no events, no anomalous samples — and the LLM answers them all the
+same way. `ObserverMemo` (one per `build_report` run) cuts those out:
+
+* a modality with no events and no anomalous samples (the count
+  `extract_windows` reports next to its raw summary) gets a deterministic
+  local observation instead of an LLM call;
+* otherwise the input is normalised (event times relative to the window start,
+  intensities rounded) and identical inputs within the run share one call,
+  including calls still in flight. The shared result is re-pinned to each
+  window's time range and events. A call that fails is forgotten, so the next
+  identical input tries again instead of replaying the error.
+
+Shared calls are owned by the memo, not by any one window: `build_report`
+calls `cancel()` on the way out so an aborted run stops spending quota.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Literal
+
+from agents.schemas import (
+    AudioAnomalyEvent,
+    AudioObservation,
+    VisualAnomalyEvent,
+    VisualObservation,
+    VocabObservation,
+    VocabularyAnomalyEvent,
+)
+
+_log = logging.getLogger(__name__)
+
+type ObserverKind = Literal["visual", "audio", "vocab"]
+type Observation = VisualObservation | AudioObservation | VocabObservation
+type AnomalyEvent = VisualAnomalyEvent | AudioAnomalyEvent | VocabularyAnomalyEvent
+
+
+def is_baseline(events: Sequence[AnomalyEvent], anomalous: int) -> bool:
+    return not events and anomalous == 0
+
+
+def baseline_observation(
+    kind: ObserverKind, start: float, end: float, raw_summary: str
+) -> Observation:
+    """The observation an observer gives a modality that stayed at baseline."""
+    if kind == "visual":
+        return VisualObservation(
+            time_range_start=start,
+            time_range_end=end,
+            overall_visual_state="Baseline",
+            raw_summary=raw_summary,
+            contradiction_context="No facial anomalies; blink, gaze, jaw and smile at baseline.",
+        )
+    if kind == "audio":
+        return AudioObservation(
+            time_range_start=start,
+            time_range_end=end,
+            overall_vocal_state="Baseline_Calm",
+            raw_summary=raw_summary,
+            contradiction_context="No vocal anomalies; loudness, pitch and range at baseline.",
+        )
+    return VocabObservation(
+        time_range_start=start,
+        time_range_end=end,
+        overall_verbal_state="Baseline_Fluent",
+        raw_summary=raw_summary,
+        contradiction_context="No verbal anomalies; pace, fillers and pauses at baseline.",
+    )
+
+
+def _memo_key(
+    kind: ObserverKind, start: float, end: float, events: Sequence[AnomalyEvent], raw_summary: str
+) -> tuple[object, ...]:
+    normalized = sorted(
+        (
+            ev.feature_type,
+            ev.behavioral_tag,
+            round(ev.intensity_score, 1),
+            ev.is_sustained,
+            round(ev.timestamp_start - start, 1),
+            round(ev.timestamp_end - start, 1),
+        )
+        for ev in events
+    )
+    return kind, round(end - start, 1), raw_summary, tuple(normalized)
+
+
+class ObserverMemo:
+    """Per-run observer short-circuit + memoization (see module docstring)."""
+
+    def __init__(self) -> None:
+        self._calls: dict[tuple[object, ...], asyncio.Future[Observation]] = {}
+        self.baseline_skips = 0
+        self.memo_hits = 0
+        self.llm_calls = 0
+
+    async def observe[T: Observation](
+        self,
+        kind: ObserverKind,
+        start: float,
+        end: float,
+        events: Sequence[AnomalyEvent],
+        raw_summary: str,
+        run: Callable[[], Awaitable[T]],
+        *,
+        anomalous: int,
+    ) -> T:
+        if is_baseline(events, anomalous):
+            self.baseline_skips += 1
+            return baseline_observation(kind, start, end, raw_summary)  # type: ignore[return-value]
+        key = _memo_key(kind, start, end, events, raw_summary)
+        shared = self._calls.get(key)
+        if shared is None:
+            self.llm_calls += 1
+            shared = self._calls[key] = asyncio.ensure_future(run())
+            shared.add_done_callback(lambda fut: self._forget_failed(key, fut))
+        else:
+            self.memo_hits += 1
+        # Shielded: one sharer being cancelled must not cancel the others' result.
+        obs = await asyncio.shield(shared)
+        return obs.model_copy(  # type: ignore[return-value]
+            update={
+                "time_range_start": start,
+                "time_range_end": end,
+                "detected_anomalies": list(events),
+            }
+        )
+
+    def _forget_failed(self, key: tuple[object, ...], fut: asyncio.Future[Observation]) -> None:
+        if (fut.cancelled() or fut.exception() is not None) and self._calls.get(key) is fut:
+            del self._calls[key]
+
+    def cancel(self) -> None:
+        """Cancel shared observer calls still in flight."""
+        for fut in self._calls.values():
+            fut.cancel()
+
+    def log_summary(self) -> None:
+        if self.baseline_skips or self.memo_hits:
+            _log.info(
+                "Observers: %d LLM call(s), %d baseline short-circuit(s), %d memo hit(s)",
+                self.llm_calls,
+                self.baseline_skips,
+                self.memo_hits,
+            )
+
+
+__all__ = ["ObserverMemo", "baseline_observation", "is_baseline"]
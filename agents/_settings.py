@@ -8,9 +8,17 @@ from __future__ import annotations
 
 from typing import Literal
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class RateLimit(BaseModel):
+    """Provider quota for one model; 0 disables that dimension."""
+
+    rpm: int = 0
+    tpm: int = 0
+
+
 class AgentSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -21,10 +29,38 @@ class AgentSettings(BaseSettings):
     groq_api_key: str | None = None
     gemini_api_key: str | None = None
     agent_max_concurrency: int = 4
+    # Free tier packs up to this many consecutive windows into one request,
+    # within a per-request token budget; 1 = one request per window.
+    agent_batch_max_windows: int = 8
+    agent_batch_token_budget: int = 16_000
+    # >0: weave the journal incrementally in chunks of this many windows as
+    # they finish (one extra weaver call per chunk); 0 = one pass at the end.
+    agent_weaver_chunk_windows: int = 0
+    # Render agent inputs compactly (agents/_compact.py); false = indented JSON.
+    agent_compact_prompts: bool = True
+    # Per-job budget for the window plan (agents/planner.py); 0 = unlimited.
+    agent_job_token_budget: int = 0
+    agent_job_request_budget: int = 0
+    # Persistent response cache (see agents/_cache.py); disable to force fresh calls.
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "data/llm_cache.db"
+    llm_cache_ttl_sec: float = 30 * 24 * 3600
+    llm_cache_max_entries: int = 20_000
+    # Proactive pacing (see agents/_ratelimit.py), shared by every job in the
+    # process. `llm_rate_limits` overrides the defaults per LLM_MODEL, e.g.
+    # LLM_RATE_LIMITS='{"google-gla:gemini-2.5-flash": {"rpm": 10, "tpm": 250000}}'.
+    llm_rpm: int = 0
+    llm_tpm: int = 0
+    llm_rate_limits: dict[str, RateLimit] = {}
+
+    def rate_limit(self) -> RateLimit:
+        return self.llm_rate_limits.get(self.llm_model) or RateLimit(
+            rpm=self.llm_rpm, tpm=self.llm_tpm
+        )
 
 
 def get_agent_settings() -> AgentSettings:
     return AgentSettings()
 
 
-__all__ = ["AgentSettings", "get_agent_settings"]
+__all__ = ["AgentSettings", "RateLimit", "get_agent_settings"]
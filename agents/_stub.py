@@ -209,6 +209,27 @@ def stub_pattern_weaver(analyses: list[WindowAnalysis]) -> WeaverDraft:
     )
 
 
+def stub_pattern_weaver_merge(prior: WeaverDraft, analyses: list[WindowAnalysis]) -> WeaverDraft:
+    """Incremental stub: fold the next chunk's stub draft into the prior one."""
+    new = stub_pattern_weaver(analyses)
+    threads = {t.title: t for t in prior.threads}
+    for t in new.threads:
+        if t.title in threads:
+            old = threads[t.title]
+            t = old.model_copy(update={"occurrences": sorted(old.occurrences + t.occurrences)})
+        threads[t.title] = t
+    highlights = (prior.highlights + new.highlights)[:10]
+    return WeaverDraft(
+        headline=(
+            f"Stub synthesis (incremental): {len(highlights)} highlight(s), "
+            f"{len(threads)} recurring thread(s)."
+        ),
+        arc_notes=new.arc_notes,
+        highlights=highlights,
+        threads=list(threads.values()),
+    )
+
+
 def stub_narrative_editor(draft: WeaverDraft) -> FinalReport:
     return FinalReport(
         headline=draft.headline,
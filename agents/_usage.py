@@ -5,6 +5,14 @@ many tokens it spent without changing every runner's return signature. Each
 agent runner calls `record_run_usage(result)`; a caller wraps the run in
 `capture_usage()` to read the totals afterwards.
 
+Besides the run-wide totals, every call is also attributed to its agent role
+(`by_role`, e.g. "visual_observer", "pattern_weaver") and — inside a
+`usage_window(...)` block — to the window it served (`by_window`), together
+with the wall time spent waiting on the provider. Calls that raise (or whose
+output is rejected) are counted in `failures` via `record_run_failure`, with
+their latency, so retries show up in the breakdown. `format_usage` renders the
+breakdown for the job log.
+
 Implementation note: the accumulator is a *mutable* object stored in a
 ContextVar. `capture_usage()` is entered in the synchronous caller before
 `asyncio.run(...)`; the event loop and its child tasks copy the context but all
@@ -18,7 +26,7 @@ import contextvars
 import logging
 from collections.abc import Iterator
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 _log = logging.getLogger(__name__)
@@ -29,15 +37,30 @@ class UsageTotals:
     input_tokens: int = 0
     output_tokens: int = 0
     requests: int = 0
+    latency_sec: float = 0.0
+    failures: int = 0
+    by_role: dict[str, UsageTotals] = field(default_factory=dict)
+    by_window: dict[str, UsageTotals] = field(default_factory=dict)
 
     @property
     def total_tokens(self) -> int:
         return self.input_tokens + self.output_tokens
 
+    def add(self, other: UsageTotals) -> None:
+        """Add `other`'s counters (not its breakdowns) to this one."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.requests += other.requests
+        self.latency_sec += other.latency_sec
+        self.failures += other.failures
+
 
 _current: contextvars.ContextVar[UsageTotals | None] = contextvars.ContextVar(
     "mmr_usage_totals", default=None
 )
+_window: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "mmr_usage_window", default=None
+)
 
 
 @contextmanager
@@ -51,19 +74,81 @@ def capture_usage() -> Iterator[UsageTotals]:
         _current.reset(token)
 
 
-def record_run_usage(result: Any) -> None:
-    """Add one pydantic-ai run result's usage to the active accumulator (if any)."""
-    totals = _current.get()
-    if totals is None:
-        return
+@contextmanager
+def usage_window(label: str) -> Iterator[None]:
+    """Attribute agent runs inside the block (and tasks it spawns) to window `label`."""
+    token = _window.set(label)
+    try:
+        yield
+    finally:
+        _window.reset(token)
+
+
+def run_usage(result: Any) -> UsageTotals | None:
+    """One pydantic-ai run result's usage, or None if it cannot be read."""
     try:
         usage = result.usage()
     except Exception:  # never let accounting break a run
         _log.debug("Could not read usage from run result", exc_info=True)
+        return None
+    return UsageTotals(
+        input_tokens=int(getattr(usage, "input_tokens", 0) or 0),
+        output_tokens=int(getattr(usage, "output_tokens", 0) or 0),
+        requests=int(getattr(usage, "requests", 0) or 0),
+    )
+
+
+def _record(usage: UsageTotals, role: str) -> None:
+    totals = _current.get()
+    if totals is None:
         return
-    totals.input_tokens += int(getattr(usage, "input_tokens", 0) or 0)
-    totals.output_tokens += int(getattr(usage, "output_tokens", 0) or 0)
-    totals.requests += int(getattr(usage, "requests", 0) or 0)
+    totals.add(usage)
+    if role:
+        totals.by_role.setdefault(role, UsageTotals()).add(usage)
+    window = _window.get()
+    if window is not None:
+        totals.by_window.setdefault(window, UsageTotals()).add(usage)
 
 
-__all__ = ["UsageTotals", "capture_usage", "record_run_usage"]
+def record_run_usage(result: Any, *, role: str = "", latency_sec: float = 0.0) -> None:
+    """Add one pydantic-ai run result's usage to the active accumulator (if any)."""
+    if _current.get() is None:
+        return
+    usage = run_usage(result) or UsageTotals()
+    usage.latency_sec = latency_sec
+    _record(usage, role)
+
+
+def record_run_failure(*, role: str = "", latency_sec: float = 0.0) -> None:
+    """Count one failed agent call (and the time it took) in the active accumulator."""
+    _record(UsageTotals(latency_sec=latency_sec, failures=1), role)
+
+
+def format_usage(totals: UsageTotals) -> str:
+    """Multi-line per-role / per-window breakdown, heaviest input first."""
+
+    def line(name: str, u: UsageTotals) -> str:
+        return (
+            f"  {name}: in={u.input_tokens} out={u.output_tokens} "
+            f"requests={u.requests} latency={u.latency_sec:.1f}s"
+            + (f" failures={u.failures}" if u.failures else "")
+        )
+
+    lines = ["By role:"]
+    for name, u in sorted(totals.by_role.items(), key=lambda kv: -kv[1].input_tokens):
+        lines.append(line(name, u))
+    if totals.by_window:
+        lines.append("By window:")
+        lines.extend(line(name, u) for name, u in totals.by_window.items())
+    return "\n".join(lines)
+
+
+__all__ = [
+    "UsageTotals",
+    "capture_usage",
+    "format_usage",
+    "record_run_failure",
+    "record_run_usage",
+    "run_usage",
+    "usage_window",
+]
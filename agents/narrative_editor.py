@@ -8,22 +8,23 @@ highlights, recurring threads, and coaching notes).
 from __future__ import annotations
 
 from agents import _stub
+from agents._cache import cached_run
+from agents._compact import dump_model
 from agents._provider import make_agent
 from agents._retry import with_retries
 from agents._settings import AgentSettings, get_agent_settings
-from agents._usage import record_run_usage
 from agents.prompts import NARRATIVE_EDITOR_PROMPT
 from agents.schemas import FinalReport, WeaverDraft
 
 
-def _format_input(draft: WeaverDraft) -> str:
+def _format_input(draft: WeaverDraft, *, compact: bool = False) -> str:
     return (
         f"# Headline\n{draft.headline}\n\n"
         f"# Arc notes\n{draft.arc_notes}\n\n"
         f"# Candidate highlights ({len(draft.highlights)})\n"
-        f"{draft.model_dump_json(include={'highlights'}, indent=2)}\n\n"
+        f"{dump_model(draft, compact=compact, include={'highlights'})}\n\n"
         f"# Threads ({len(draft.threads)})\n"
-        f"{draft.model_dump_json(include={'threads'}, indent=2)}\n"
+        f"{dump_model(draft, compact=compact, include={'threads'})}\n"
     )
 
 
@@ -39,12 +40,17 @@ async def run_narrative_editor(
     agent = make_agent(
         system_prompt=NARRATIVE_EDITOR_PROMPT, output_type=FinalReport, settings=settings
     )
-    user_msg = _format_input(draft)
+    user_msg = _format_input(draft, compact=settings.agent_compact_prompts)
 
     async def _call() -> FinalReport:
-        result = await agent.run(user_msg)
-        record_run_usage(result)
-        return result.output  # type: ignore[return-value]
+        return await cached_run(
+            agent,
+            user_msg,
+            system_prompt=NARRATIVE_EDITOR_PROMPT,
+            output_type=FinalReport,
+            settings=settings,
+            role="narrative_editor",
+        )
 
     return await with_retries(_call, label="narrative_editor")
 
@@ -7,15 +7,17 @@ Flow:
       -> per window (bounded concurrency):
             visual / audio / vocab observers (parallel)  ->  Window Analyst
                 -> WindowAnalysis          # always produced; never dropped
+         (free tier: one single-pass call per batch of consecutive windows)
       -> journal = all WindowAnalyses, chronological
       -> Pattern Weaver(journal)           -> WeaverDraft
+         (or, with AGENT_WEAVER_CHUNK_WINDOWS, folded chunk by chunk as windows finish)
       -> Narrative Editor(draft)           -> FinalReport
 
 Public surface:
 
     async def build_report(
         master_df, speaker_label="B", transcript_df=None,
-        *, model=None, on_window_done=None,
+        *, model=None, on_window_done=None, on_draft=None,
     ) -> tuple[list[WindowAnalysis], FinalReport]
 """
 
@@ -23,35 +25,38 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 
 import pandas as pd
 
-from agents._extract import (
-    extract_audio_events,
-    extract_transcript_slice,
-    extract_visual_events,
-    extract_vocab_events,
-    summarize_audio_raw,
-    summarize_visual_raw,
-    summarize_vocab_raw,
-)
+from agents._extract import extract_windows
 from agents._retry import (
     DAILY_QUOTA_MESSAGE,
     RATE_LIMIT_MESSAGE,
+    AdaptiveSemaphore,
     RateLimitedError,
     _is_daily_quota,
     _is_rate_limit,
+    reset_adaptive_limit,
+    use_adaptive_limit,
 )
+from agents._reuse import ObserverMemo
 from agents._settings import AgentSettings, get_agent_settings
+from agents._usage import usage_window
 from agents.audio_agent import run_audio_observer
 from agents.narrative_editor import run_narrative_editor
 from agents.pattern_weaver import run_pattern_weaver
-from agents.schemas import FinalReport, WindowAnalysis
+from agents.planner import plan_windows
+from agents.schemas import FinalReport, WeaverDraft, WindowAnalysis
 from agents.visual_agent import run_visual_observer
 from agents.vocab_agent import run_vocab_observer
-from agents.window_analyst import run_window_analyst, run_window_analyst_solo
-from agents.windows import AnalysisWindow, select_windows
+from agents.window_analyst import (
+    SoloWindowInput,
+    plan_batches,
+    run_window_analyst,
+    run_window_analyst_batch,
+)
+from agents.windows import AnalysisWindow, select_windows, sort_by_time
 
 _log = logging.getLogger(__name__)
 
@@ -61,68 +66,194 @@ _log = logging.getLogger(__name__)
 _FREE_CONCURRENCY = 2
 
 
-async def _process_window(
-    window: AnalysisWindow,
+def _window_inputs(
+    master_df: pd.DataFrame,
+    windows: list[AnalysisWindow],
     transcript_df: pd.DataFrame | None,
     speaker_label: str,
+) -> list[SoloWindowInput]:
+    """Agent inputs for every window, from one pass over the timeline."""
+    extracts = extract_windows(
+        master_df,
+        [(w.start, w.end) for w in windows],
+        transcript_df,
+        speaker_label=speaker_label,
+    )
+    return [
+        SoloWindowInput(
+            window=w,
+            visual_events=x.visual_events,
+            audio_events=x.audio_events,
+            vocab_events=x.vocab_events,
+            visual_raw=x.visual_raw,
+            audio_raw=x.audio_raw,
+            vocab_raw=x.vocab_raw,
+            transcript=x.transcript,
+            visual_anomalies=x.visual_anomalies,
+            audio_anomalies=x.audio_anomalies,
+            vocab_anomalies=x.vocab_anomalies,
+        )
+        for w, x in zip(windows, extracts, strict=True)
+    ]
+
+
+def _window_input(
+    window: AnalysisWindow, transcript_df: pd.DataFrame | None, speaker_label: str
+) -> SoloWindowInput:
+    return _window_inputs(window.rows, [window], transcript_df, speaker_label)[0]
+
+
+async def _process_window(
+    inp: SoloWindowInput,
     settings: AgentSettings,
-    sem: asyncio.Semaphore,
+    sem: AdaptiveSemaphore,
     tier: str = "paid",
+    memo: ObserverMemo | None = None,
 ) -> WindowAnalysis | Exception:
     """One window → one WindowAnalysis. `tier` selects the full observers→analyst
     path ("paid") or the lean single-call path ("free").
 
     On failure returns the exception (the window is skipped) so the caller can
-    tell a rate-limit wipeout apart from a genuinely calm interview.
+    tell a rate-limit wipeout apart from a genuinely calm interview. Observer
+    calls go through `memo`, which answers baseline modalities locally and
+    shares identical inputs across the run's windows.
     """
+    memo = memo or ObserverMemo()
+    window = inp.window
     async with sem:
         try:
-            visual_events = extract_visual_events(window.rows)
-            audio_events = extract_audio_events(window.rows)
-            vocab_events = extract_vocab_events(window.rows)
-            visual_raw = summarize_visual_raw(window.rows)
-            audio_raw = summarize_audio_raw(window.rows)
-            vocab_raw = summarize_vocab_raw(window.rows)
-            transcript = extract_transcript_slice(
-                transcript_df, window.start, window.end, speaker_label=speaker_label
-            )
-
             if tier == "free":
-                return await run_window_analyst_solo(
-                    window,
-                    visual_events,
-                    audio_events,
-                    vocab_events,
-                    visual_raw=visual_raw,
-                    audio_raw=audio_raw,
-                    vocab_raw=vocab_raw,
-                    transcript=transcript,
-                    settings=settings,
-                )
+                return await inp.run_solo(settings)
 
+            start, end = window.start, window.end
             visual, audio, vocab = await asyncio.gather(
-                run_visual_observer(
-                    window.start,
-                    window.end,
-                    visual_events,
-                    raw_summary=visual_raw,
-                    settings=settings,
+                memo.observe(
+                    "visual",
+                    start,
+                    end,
+                    inp.visual_events,
+                    inp.visual_raw,
+                    lambda: run_visual_observer(
+                        start, end, inp.visual_events, raw_summary=inp.visual_raw, settings=settings
+                    ),
+                    anomalous=inp.visual_anomalies,
                 ),
-                run_audio_observer(
-                    window.start, window.end, audio_events, raw_summary=audio_raw, settings=settings
+                memo.observe(
+                    "audio",
+                    start,
+                    end,
+                    inp.audio_events,
+                    inp.audio_raw,
+                    lambda: run_audio_observer(
+                        start, end, inp.audio_events, raw_summary=inp.audio_raw, settings=settings
+                    ),
+                    anomalous=inp.audio_anomalies,
                 ),
-                run_vocab_observer(
-                    window.start, window.end, vocab_events, raw_summary=vocab_raw, settings=settings
+                memo.observe(
+                    "vocab",
+                    start,
+                    end,
+                    inp.vocab_events,
+                    inp.vocab_raw,
+                    lambda: run_vocab_observer(
+                        start, end, inp.vocab_events, raw_summary=inp.vocab_raw, settings=settings
+                    ),
+                    anomalous=inp.vocab_anomalies,
                 ),
             )
             return await run_window_analyst(
-                window, visual, audio, vocab, transcript, settings=settings
+                window, visual, audio, vocab, inp.transcript, settings=settings
             )
         except Exception as e:
             _log.exception("Window %.2f–%.2fs failed — skipping", window.start, window.end)
             return e
 
 
+async def _process_batch(
+    batch: list[SoloWindowInput], settings: AgentSettings, sem: AdaptiveSemaphore
+) -> list[WindowAnalysis | Exception]:
+    """Free tier, batched: consecutive windows → one request. A failure skips all of them."""
+    async with sem:
+        try:
+            return list(await run_window_analyst_batch(batch, settings=settings))
+        except Exception as e:
+            _log.exception(
+                "Windows %.2f–%.2fs failed — skipping %d",
+                batch[0].window.start,
+                batch[-1].window.end,
+                len(batch),
+            )
+            return [e] * len(batch)
+
+
+type _WindowResult = WindowAnalysis | Exception
+
+
+def _span_label(first: AnalysisWindow, last: AnalysisWindow) -> str:
+    return f"{first.start:.2f}–{last.end:.2f}s"
+
+
+async def _indexed(
+    indices: list[int], work: Awaitable[list[_WindowResult]]
+) -> tuple[list[int], list[_WindowResult]]:
+    return indices, await work
+
+
+async def _single(work: Awaitable[_WindowResult]) -> list[_WindowResult]:
+    return [await work]
+
+
+class _IncrementalWeaver:
+    """Folds finished windows into a running `WeaverDraft`, one chronological chunk
+    at a time, so the weaver works while the slowest windows are still running.
+
+    A chunk is folded once all of its windows have finished (succeeded or not);
+    `finish` folds whatever remains, so only that last chunk is synthesised after
+    the final window lands.
+    """
+
+    def __init__(
+        self,
+        chunk: int,
+        settings: AgentSettings,
+        on_draft: Callable[[WeaverDraft], None] | None,
+    ) -> None:
+        self.chunk = chunk
+        self.settings = settings
+        self.on_draft = on_draft
+        self.draft: WeaverDraft | None = None
+        self.folded = 0  # windows [0, folded) are in `draft`
+
+    async def advance(self, results: list[_WindowResult | None]) -> None:
+        while self.folded + self.chunk <= len(results):
+            chunk = results[self.folded : self.folded + self.chunk]
+            if any(r is None for r in chunk):
+                return
+            await self._fold(chunk)
+            self.folded += self.chunk
+
+    async def finish(self, results: list[_WindowResult | None]) -> WeaverDraft:
+        await self._fold(results[self.folded :])
+        self.folded = len(results)
+        if self.draft is None:  # no window produced a note
+            self.draft = await run_pattern_weaver([], settings=self.settings)
+        return self.draft
+
+    async def _fold(self, chunk: list[_WindowResult | None]) -> None:
+        notes = sorted(
+            (r for r in chunk if isinstance(r, WindowAnalysis)), key=lambda n: n.time_start
+        )
+        if not notes:
+            return
+        self.draft = await run_pattern_weaver(notes, prior=self.draft, settings=self.settings)
+        _log.info("Weaver folded windows up to %.1fs", notes[-1].time_end)
+        if self.on_draft is not None:
+            try:
+                self.on_draft(self.draft)
+            except Exception:
+                _log.exception("on_draft callback raised")
+
+
 async def build_report(
     master_df: pd.DataFrame,
     speaker_label: str = "B",
@@ -130,6 +261,7 @@ async def build_report(
     *,
     model: str | None = None,
     on_window_done: Callable[[WindowAnalysis], None] | None = None,
+    on_draft: Callable[[WeaverDraft], None] | None = None,
     settings: AgentSettings | None = None,
     tier: str = "paid",
 ) -> tuple[list[WindowAnalysis], FinalReport]:
@@ -140,20 +272,37 @@ async def build_report(
     the env-derived settings for this call only — used to inject a per-request
     API key (BYOK). `model` (when provided) overrides `LLM_MODEL`. `tier` selects
     the full ("paid") or lean single-call-per-window ("free") analysis path.
+
+    `on_window_done` fires as each note completes. With incremental weaving
+    (`agent_weaver_chunk_windows` > 0), `on_draft` receives every provisional
+    `WeaverDraft` so a caller can publish a partial report early.
     """
     settings = settings or get_agent_settings()
     if model is not None:
         settings = settings.model_copy(update={"llm_model": model})
 
     # Free tier makes one call/window and runs at lower concurrency to stay under
-    # free-tier rate limits; paid tier uses the configured concurrency.
+    # free-tier rate limits; paid tier uses the configured concurrency. Either is
+    # the ceiling: 429s shrink the live limit and successes grow it back (AIMD).
     concurrency = (
         min(_FREE_CONCURRENCY, settings.agent_max_concurrency)
         if tier == "free"
         else settings.agent_max_concurrency
     )
 
+    # One Time-sorted frame for selection, extraction and planning alike.
+    master_df = sort_by_time(master_df)
     windows = select_windows(master_df)
+    inputs = _window_inputs(master_df, windows, transcript_df, speaker_label)
+    if settings.agent_job_token_budget > 0 or settings.agent_job_request_budget > 0:
+        inputs = plan_windows(
+            master_df,
+            inputs,
+            lambda w: _window_input(w, transcript_df, speaker_label),
+            settings=settings,
+            tier=tier,
+        ).inputs
+        windows = [inp.window for inp in inputs]
     _log.info(
         "Agent chain: %d windows, tier=%s, provider=%s, model=%s, concurrency=%d",
         len(windows),
@@ -164,24 +313,69 @@ async def build_report(
     )
 
     journal: list[WindowAnalysis] = []
+    weaver = (
+        _IncrementalWeaver(settings.agent_weaver_chunk_windows, settings, on_draft)
+        if settings.agent_weaver_chunk_windows > 0
+        else None
+    )
+    results: list[_WindowResult | None] = [None] * len(windows)
     if windows:
-        sem = asyncio.Semaphore(concurrency)
-        tasks = [
-            _process_window(w, transcript_df, speaker_label, settings, sem, tier) for w in windows
-        ]
-        results = await asyncio.gather(*tasks)
+        sem = AdaptiveSemaphore(concurrency)
+        memo = ObserverMemo()
+        token = use_adaptive_limit(sem)
+        # (usage label, work) per request unit; see `_usage.usage_window`.
+        units: list[tuple[str, Awaitable[tuple[list[int], list[_WindowResult]]]]] = []
+        if tier == "free" and settings.agent_batch_max_windows > 1:
+            batches = plan_batches(
+                inputs,
+                max_windows=settings.agent_batch_max_windows,
+                token_budget=settings.agent_batch_token_budget,
+                compact=settings.agent_compact_prompts,
+            )
+            _log.info("Free tier: %d windows in %d request(s)", len(windows), len(batches))
+            start = 0
+            for b in batches:
+                indices = list(range(start, start + len(b)))
+                label = _span_label(b[0].window, b[-1].window)
+                units.append((label, _indexed(indices, _process_batch(b, settings, sem))))
+                start += len(b)
+        else:
+            units = [
+                (
+                    _span_label(inp.window, inp.window),
+                    _indexed([i], _single(_process_window(inp, settings, sem, tier, memo=memo))),
+                )
+                for i, inp in enumerate(inputs)
+            ]
+        # Tasks are created while the adaptive limit and their usage label are
+        # current, so they (and the observer tasks they spawn) inherit both.
+        tasks = []
+        for label, unit in units:
+            with usage_window(label):
+                tasks.append(asyncio.ensure_future(unit))
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                indices, outs = await next_done
+                for i, note in zip(indices, outs, strict=True):
+                    results[i] = note
+                    if isinstance(note, WindowAnalysis) and on_window_done is not None:
+                        try:
+                            on_window_done(note)
+                        except Exception:
+                            _log.exception("on_window_done callback raised")
+                if weaver is not None:
+                    await weaver.advance(results)
+        finally:
+            reset_adaptive_limit(token)
+            for t in tasks:
+                t.cancel()
+            memo.cancel()
+
+        memo.log_summary()
         failures = [r for r in results if isinstance(r, Exception)]
-        for note in results:
-            if not isinstance(note, WindowAnalysis):
-                continue
-            journal.append(note)
-            if on_window_done is not None:
-                try:
-                    on_window_done(note)
-                except Exception:
-                    _log.exception("on_window_done callback raised")
-
-        journal.sort(key=lambda r: r.time_start)
+        journal = sorted(
+            (r for r in results if isinstance(r, WindowAnalysis)), key=lambda r: r.time_start
+        )
 
         # If rate limiting wiped out every window, fail honestly with an explicit
         # message rather than emitting a misleading "no usable signal" report.
@@ -197,7 +391,10 @@ async def build_report(
                 )
                 raise RateLimitedError(RATE_LIMIT_MESSAGE)
 
-    draft = await run_pattern_weaver(journal, settings=settings)
+    if weaver is not None:
+        draft = await weaver.finish(results)
+    else:
+        draft = await run_pattern_weaver(journal, settings=settings)
     final_report = await run_narrative_editor(draft, settings=settings)
     _log.info(
         "Agent chain complete: %d window notes, %d highlight(s), %d thread(s)",
@@ -4,23 +4,75 @@ Reads the full chronological journal of `WindowAnalysis` notes and finds the
 cross-window story: recurring threads, the behavioral arc, and the handful of
 timestamped highlights worth re-watching. Emits a structured `WeaverDraft` that
 the Narrative Editor turns into prose.
+
+In incremental mode the orchestrator feeds the journal in chronological chunks
+as windows finish; each call gets the `prior` draft plus the next chunk and
+returns the updated draft, so only the last chunk waits on the slowest window.
 """
 
 from __future__ import annotations
 
 from agents import _stub
+from agents._cache import cached_run
+from agents._compact import dump_model
 from agents._provider import make_agent
 from agents._retry import with_retries
 from agents._settings import AgentSettings, get_agent_settings
-from agents._usage import record_run_usage
-from agents.prompts import PATTERN_WEAVER_PROMPT
+from agents.prompts import PATTERN_WEAVER_PROMPT, PATTERN_WEAVER_UPDATE_PROMPT
 from agents.schemas import WeaverDraft, WindowAnalysis
 
 
-def _format_input(analyses: list[WindowAnalysis]) -> str:
+def _format_update_input(
+    prior: WeaverDraft, analyses: list[WindowAnalysis], *, compact: bool = False
+) -> str:
+    return (
+        f"# Your draft so far\n{dump_model(prior, compact=compact)}\n\n"
+        f"# Next chunk\n{_format_input(analyses, compact=compact)}"
+    )
+
+
+def _format_compact_window(i: int, n: int, a: WindowAnalysis) -> list[str]:
+    header = (
+        f"## W{i}/{n} {a.time_start:.1f}–{a.time_end:.1f}s {a.phase} "
+        f"~{a.position_pct * 100:.0f}% {a.window_interest}"
+    )
+    # Calm, signal-free windows only anchor the arc: one line is enough.
+    if a.window_interest == "Low" and not a.signals:
+        return [f"{header}: {a.narrative}"]
+    lines = [header]
+    if a.spoken_excerpt:
+        lines.append(f'Said: "{a.spoken_excerpt}"')
+    reads = [
+        f"{label}: {read}"
+        for label, read in (("V", a.visual_read), ("A", a.audio_read), ("S", a.verbal_read))
+        if read
+    ]
+    if reads:
+        lines.append(" | ".join(reads))
+    lines.append(a.narrative)
+    for s in a.signals:
+        # Window-wide signals omit the (repeated) time range.
+        span = (
+            ""
+            if (s.timestamp_start, s.timestamp_end) == (a.time_start, a.time_end)
+            else f" {s.timestamp_start:.1f}–{s.timestamp_end:.1f}s"
+        )
+        lines.append(
+            f"• {s.kind}/{s.relation}/{s.significance}{span} ({','.join(s.modalities)}) "
+            f"{s.headline} — {s.interpretation}"
+        )
+    return lines
+
+
+def _format_input(analyses: list[WindowAnalysis], *, compact: bool = False) -> str:
     if not analyses:
         return "The interview produced no analysis windows (no usable signal)."
     n = len(analyses)
+    if compact:
+        lines = [f"Interview journal — {n} window(s), in order (V/A/S = face/voice/speech):"]
+        for i, a in enumerate(analyses, 1):
+            lines.extend(_format_compact_window(i, n, a))
+        return "\n".join(lines)
     lines = [f"Interview journal — {n} window(s), in order:\n"]
     for i, a in enumerate(analyses, 1):
         lines.append(
@@ -46,21 +98,33 @@ def _format_input(analyses: list[WindowAnalysis]) -> str:
 async def run_pattern_weaver(
     analyses: list[WindowAnalysis],
     *,
+    prior: WeaverDraft | None = None,
     settings: AgentSettings | None = None,
 ) -> WeaverDraft:
+    """Weave `analyses` into a draft; with `prior`, update that draft with them."""
     settings = settings or get_agent_settings()
     if settings.llm_provider == "stub":
+        if prior is not None:
+            return _stub.stub_pattern_weaver_merge(prior, analyses)
         return _stub.stub_pattern_weaver(analyses)
 
-    agent = make_agent(
-        system_prompt=PATTERN_WEAVER_PROMPT, output_type=WeaverDraft, settings=settings
-    )
-    user_msg = _format_input(analyses)
+    if prior is None:
+        prompt = PATTERN_WEAVER_PROMPT
+        user_msg = _format_input(analyses, compact=settings.agent_compact_prompts)
+    else:
+        prompt = PATTERN_WEAVER_UPDATE_PROMPT
+        user_msg = _format_update_input(prior, analyses, compact=settings.agent_compact_prompts)
+    agent = make_agent(system_prompt=prompt, output_type=WeaverDraft, settings=settings)
 
     async def _call() -> WeaverDraft:
-        result = await agent.run(user_msg)
-        record_run_usage(result)
-        return result.output  # type: ignore[return-value]
+        return await cached_run(
+            agent,
+            user_msg,
+            system_prompt=prompt,
+            output_type=WeaverDraft,
+            settings=settings,
+            role="pattern_weaver",
+        )
 
     return await with_retries(_call, label="pattern_weaver")
 
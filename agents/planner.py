@@ -0,0 +1,242 @@
+"""Fit a job's analysis windows to a token and request budget.
+
+`select_windows` caps the window count (`MAX_WINDOWS`) whatever the windows
+cost. This planner prices each window from its formatted input for the tier
+that will run it, then keeps the most informative windows that fit
+`AGENT_JOB_TOKEN_BUDGET` / `AGENT_JOB_REQUEST_BUDGET` (0 = unlimited):
+
+1. When over the request budget, close neighbouring active windows are merged
+   first — one slightly longer window costs the same requests as a short one.
+2. Active windows are ranked by `window_intensity` (modalities involved, then
+   peak |rz_score|); baseline windows follow, spread across the interview so
+   the arc keeps its anchors.
+3. Windows are admitted in rank order while the running estimate fits, with
+   a fixed allowance reserved for the weaver + editor synthesis calls.
+
+Estimates use the same chars-per-token heuristic as the rate limiter; they are
+for capacity planning, not billing.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import pandas as pd
+
+from agents._ratelimit import estimate_tokens
+from agents._reuse import is_baseline
+from agents._settings import AgentSettings
+from agents.window_analyst import SoloWindowInput
+from agents.windows import (
+    AnalysisWindow,
+    assign_temporal_context,
+    slice_rows,
+    sort_by_time,
+    window_intensity,
+)
+
+_log = logging.getLogger(__name__)
+
+# Weaver + editor: two requests, each reading ~a journal entry per window.
+_SYNTHESIS_REQUESTS = 2
+_SYNTHESIS_TOKENS_PER_WINDOW = 400
+# Merge neighbouring active windows only when they are this close and the
+# result stays short enough to read as one moment.
+_MAX_MERGE_GAP = 5.0
+_MAX_MERGED_LEN = 30.0
+
+
+@dataclass
+class WindowCost:
+    requests: float
+    tokens: int
+
+
+@dataclass
+class BudgetPlan:
+    inputs: list[SoloWindowInput]
+    requests: int
+    tokens: int
+    dropped: int
+    merged: int
+
+
+def estimate_window_cost(
+    inp: SoloWindowInput, *, tier: str, batch_size: int = 1, compact: bool = False
+) -> WindowCost:
+    """Requests and tokens one window will cost on `tier`.
+
+    Paid tier: one call per non-baseline observer (baseline modalities are
+    answered locally) plus the analyst, which reads roughly the solo input
+    again per observer. Free tier: one single-pass input, sharing a request
+    with up to `batch_size - 1` neighbours.
+    """
+    solo = estimate_tokens(inp.render(compact=compact))
+    if tier == "free":
+        return WindowCost(requests=1 / max(1, batch_size), tokens=solo)
+    observers = sum(
+        not is_baseline(events, anomalous)
+        for events, anomalous in (
+            (inp.visual_events, inp.visual_anomalies),
+            (inp.audio_events, inp.audio_anomalies),
+            (inp.vocab_events, inp.vocab_anomalies),
+        )
+    )
+    return WindowCost(requests=1 + observers, tokens=solo * (1 + observers))
+
+
+def _fits(requests: float, tokens: int, settings: AgentSettings) -> bool:
+    req_cap, tok_cap = settings.agent_job_request_budget, settings.agent_job_token_budget
+    return (req_cap <= 0 or math.ceil(requests) <= req_cap) and (tok_cap <= 0 or tokens <= tok_cap)
+
+
+def _merge_close_active(
+    master_df: pd.DataFrame,
+    inputs: list[SoloWindowInput],
+    make_input: Callable[[AnalysisWindow], SoloWindowInput],
+    excess: float,
+    cost: Callable[[SoloWindowInput], WindowCost],
+) -> tuple[list[SoloWindowInput], int]:
+    """Merge the closest active neighbours until `excess` requests are saved."""
+    merged = 0
+    inputs = sorted(inputs, key=lambda i: i.window.start)
+    while excess > 0:
+        best: int | None = None
+        for k in range(len(inputs) - 1):
+            a, b = inputs[k].window, inputs[k + 1].window
+            if a.is_baseline or b.is_baseline:
+                continue
+            gap = b.start - a.end
+            if gap > _MAX_MERGE_GAP or b.end - a.start > _MAX_MERGED_LEN:
+                continue
+            if best is None or gap < inputs[best + 1].window.start - inputs[best].window.end:
+                best = k
+        if best is None:
+            break
+        a_inp, b_inp = inputs[best], inputs[best + 1]
+        a, b = a_inp.window, b_inp.window
+        combined = make_input(
+            AnalysisWindow(
+                start=a.start,
+                end=b.end,
+                rows=slice_rows(master_df, a.start, b.end),
+                modalities_with_anomalies=a.modalities_with_anomalies | b.modalities_with_anomalies,
+                peak_rz=max(a.peak_rz, b.peak_rz),
+            )
+        )
+        excess -= cost(a_inp).requests + cost(b_inp).requests - cost(combined).requests
+        inputs[best : best + 2] = [combined]
+        merged += 1
+    return inputs, merged
+
+
+def _spread(items: list[SoloWindowInput]) -> list[SoloWindowInput]:
+    """Order so that any prefix is spread across the interview (bisection order)."""
+    out: list[SoloWindowInput] = []
+    spans = [(0, len(items))]
+    while spans:
+        lo, hi = spans.pop(0)
+        if lo >= hi:
+            continue
+        mid = (lo + hi) // 2
+        out.append(items[mid])
+        spans += [(lo, mid), (mid + 1, hi)]
+    return out
+
+
+def plan_windows(
+    master_df: pd.DataFrame,
+    inputs: list[SoloWindowInput],
+    make_input: Callable[[AnalysisWindow], SoloWindowInput],
+    *,
+    settings: AgentSettings,
+    tier: str = "paid",
+) -> BudgetPlan:
+    """Select (and if needed merge) windows to fit the per-job budget."""
+    master_df = sort_by_time(master_df)
+    batch = settings.agent_batch_max_windows if tier == "free" else 1
+
+    # Each input is rendered and priced once. Entries keep their input alive so
+    # an `id` is never reused by a merged window created later.
+    priced: dict[int, tuple[SoloWindowInput, WindowCost]] = {}
+
+    def cost(inp: SoloWindowInput) -> WindowCost:
+        if id(inp) not in priced:
+            priced[id(inp)] = (
+                inp,
+                estimate_window_cost(
+                    inp, tier=tier, batch_size=batch, compact=settings.agent_compact_prompts
+                ),
+            )
+        return priced[id(inp)][1]
+
+    base = (float(_SYNTHESIS_REQUESTS), _SYNTHESIS_REQUESTS * estimate_tokens())
+
+    def add(acc: tuple[float, int], inp: SoloWindowInput) -> tuple[float, int]:
+        c = cost(inp)
+        return acc[0] + c.requests, acc[1] + c.tokens + _SYNTHESIS_TOKENS_PER_WINDOW
+
+    def total(sel: list[SoloWindowInput]) -> tuple[float, int]:
+        acc = base
+        for inp in sel:
+            acc = add(acc, inp)
+        return acc
+
+    requests, tokens = total(inputs)
+    merged = 0
+    req_cap = settings.agent_job_request_budget
+    if req_cap > 0 and math.ceil(requests) > req_cap:
+        inputs, merged = _merge_close_active(
+            master_df, inputs, make_input, math.ceil(requests) - req_cap, cost
+        )
+
+    selected = list(inputs)
+    if not _fits(*total(selected), settings):
+        active = sorted(
+            (i for i in inputs if not i.window.is_baseline),
+            key=lambda i: window_intensity(i.window),
+            reverse=True,
+        )
+        baseline = _spread(
+            sorted((i for i in inputs if i.window.is_baseline), key=lambda i: i.window.start)
+        )
+        ranked = active + baseline
+        selected = []
+        running = base
+        for inp in ranked:
+            candidate = add(running, inp)
+            if _fits(*candidate, settings):
+                selected.append(inp)
+                running = candidate
+        if not selected and ranked:
+            _log.warning("Job budget is below the cost of one window — analysing just one")
+            selected = ranked[:1]
+
+    duration = float(master_df["Time"].max()) if not master_df.empty else 0.0
+    windows = assign_temporal_context([i.window for i in selected], duration)
+    by_window = {id(i.window): i for i in selected}
+    selected = [by_window[id(w)] for w in windows]
+    requests, tokens = total(selected)
+    plan = BudgetPlan(
+        inputs=selected,
+        requests=math.ceil(requests),
+        tokens=tokens,
+        dropped=len(inputs) - len(selected),
+        merged=merged,
+    )
+    _log.info(
+        "Budget plan (%s): %d window(s), ~%d request(s), ~%d tokens; merged %d, dropped %d",
+        tier,
+        len(selected),
+        plan.requests,
+        plan.tokens,
+        plan.merged,
+        plan.dropped,
+    )
+    return plan
+
+
+__all__ = ["BudgetPlan", "WindowCost", "estimate_window_cost", "plan_windows"]
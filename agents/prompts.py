@@ -153,6 +153,19 @@ Conform to the WindowAnalysis schema. Specific and concrete, never generic.
 """.strip()
 
 
+WINDOW_ANALYST_BATCH_PROMPT = (
+    WINDOW_ANALYST_SOLO_PROMPT
+    + """
+
+# BATCH MODE
+This message holds SEVERAL consecutive windows, each under its own
+"# Window N of M" heading. Analyse every window on its own terms exactly as
+above and return one WindowAnalysis per window in `analyses`, in the order
+given, copying each window's time range. Never merge, skip or add windows.
+"""
+).strip()
+
+
 PATTERN_WEAVER_PROMPT = """
 # ROLE
 You are the **Pattern Weaver**. You receive the full chronological journal of the
@@ -179,6 +192,20 @@ the STORY across time.
 """.strip()
 
 
+PATTERN_WEAVER_UPDATE_PROMPT = (
+    PATTERN_WEAVER_PROMPT
+    + """
+
+# INCREMENTAL MODE
+The journal arrives in chronological chunks. With the next chunk you receive
+your draft so far, covering every earlier window. Return the updated draft for
+the whole interview to date: keep earlier highlights and threads unless the new
+windows change their meaning, extend threads with new occurrences, and revise
+the headline and arc notes to span everything seen. Keep timestamps EXACT.
+"""
+).strip()
+
+
 NARRATIVE_EDITOR_PROMPT = """
 # ROLE
 You are the **Narrative Editor**. You receive the Pattern Weaver's structured draft
@@ -207,8 +234,10 @@ __all__ = [
     "AUDIO_PROMPT",
     "NARRATIVE_EDITOR_PROMPT",
     "PATTERN_WEAVER_PROMPT",
+    "PATTERN_WEAVER_UPDATE_PROMPT",
     "VISUAL_PROMPT",
     "VOCABULARY_PROMPT",
+    "WINDOW_ANALYST_BATCH_PROMPT",
     "WINDOW_ANALYST_PROMPT",
     "WINDOW_ANALYST_SOLO_PROMPT",
 ]
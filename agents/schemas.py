@@ -218,6 +218,12 @@ class WindowAnalysis(BaseModel):
     signals: list[Signal] = Field(default_factory=list)
 
 
+class WindowAnalysisBatch(BaseModel):
+    """Batched free-tier output: one `WindowAnalysis` per input window, in order."""
+
+    analyses: list[WindowAnalysis] = Field(default_factory=list)
+
+
 # --------------------------------------------------------------------------
 # Final report (public output) + synthesis hand-off.
 # --------------------------------------------------------------------------
@@ -297,4 +303,5 @@ __all__ = [
     "VocabularyAnomalyEvent",
     "WeaverDraft",
     "WindowAnalysis",
+    "WindowAnalysisBatch",
 ]
@@ -9,10 +9,11 @@ from __future__ import annotations
 import logging
 
 from agents import _stub
+from agents._cache import cached_run
+from agents._compact import event_line
 from agents._provider import make_agent
 from agents._retry import with_retries
 from agents._settings import AgentSettings, get_agent_settings
-from agents._usage import record_run_usage
 from agents.prompts import VISUAL_PROMPT
 from agents.schemas import VisualAnomalyEvent, VisualObservation
 
@@ -20,18 +21,18 @@ _log = logging.getLogger(__name__)
 
 
 def _format_input(
-    start: float, end: float, events: list[VisualAnomalyEvent], raw_summary: str
+    start: float,
+    end: float,
+    events: list[VisualAnomalyEvent],
+    raw_summary: str,
+    *,
+    compact: bool = False,
 ) -> str:
     lines = [f"Time range: {start:.2f}–{end:.2f}s.", f"Raw signals: {raw_summary or 'n/a'}"]
     if not events:
         lines.append("No visual anomalies detected.")
         return "\n".join(lines)
-    for ev in events:
-        lines.append(
-            f"- [{ev.feature_type}] {ev.behavioral_tag} at "
-            f"{ev.timestamp_start:.2f}–{ev.timestamp_end:.2f}s, "
-            f"intensity={ev.intensity_score:.2f}, sustained={ev.is_sustained}"
-        )
+    lines.extend(event_line(ev, compact=compact) for ev in events)
     return "\n".join(lines)
 
 
@@ -50,14 +51,19 @@ async def run_visual_observer(
     agent = make_agent(
         system_prompt=VISUAL_PROMPT, output_type=VisualObservation, settings=settings
     )
-    user_msg = _format_input(start, end, events, raw_summary)
+    user_msg = _format_input(
+        start, end, events, raw_summary, compact=settings.agent_compact_prompts
+    )
 
     async def _call() -> VisualObservation:
-        result = await agent.run(user_msg)
-        record_run_usage(result)
-        # pydantic-ai's generic typing of `output` is `str` by default;
-        # we know the agent was bound to VisualObservation in make_agent.
-        return result.output  # type: ignore[return-value]
+        return await cached_run(
+            agent,
+            user_msg,
+            system_prompt=VISUAL_PROMPT,
+            output_type=VisualObservation,
+            settings=settings,
+            role="visual_observer",
+        )
 
     return await with_retries(_call, label="visual_observer")
 
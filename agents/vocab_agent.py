@@ -3,27 +3,28 @@
 from __future__ import annotations
 
 from agents import _stub
+from agents._cache import cached_run
+from agents._compact import event_line
 from agents._provider import make_agent
 from agents._retry import with_retries
 from agents._settings import AgentSettings, get_agent_settings
-from agents._usage import record_run_usage
 from agents.prompts import VOCABULARY_PROMPT
 from agents.schemas import VocabObservation, VocabularyAnomalyEvent
 
 
 def _format_input(
-    start: float, end: float, events: list[VocabularyAnomalyEvent], raw_summary: str
+    start: float,
+    end: float,
+    events: list[VocabularyAnomalyEvent],
+    raw_summary: str,
+    *,
+    compact: bool = False,
 ) -> str:
     lines = [f"Time range: {start:.2f}–{end:.2f}s.", f"Raw signals: {raw_summary or 'n/a'}"]
     if not events:
         lines.append("No verbal anomalies detected.")
         return "\n".join(lines)
-    for ev in events:
-        lines.append(
-            f"- [{ev.feature_type}] {ev.behavioral_tag} at "
-            f"{ev.timestamp_start:.2f}–{ev.timestamp_end:.2f}s, "
-            f"intensity={ev.intensity_score:.2f}, sustained={ev.is_sustained}"
-        )
+    lines.extend(event_line(ev, compact=compact) for ev in events)
     return "\n".join(lines)
 
 
@@ -42,12 +43,19 @@ async def run_vocab_observer(
     agent = make_agent(
         system_prompt=VOCABULARY_PROMPT, output_type=VocabObservation, settings=settings
     )
-    user_msg = _format_input(start, end, events, raw_summary)
+    user_msg = _format_input(
+        start, end, events, raw_summary, compact=settings.agent_compact_prompts
+    )
 
     async def _call() -> VocabObservation:
-        result = await agent.run(user_msg)
-        record_run_usage(result)
-        return result.output  # type: ignore[return-value]
+        return await cached_run(
+            agent,
+            user_msg,
+            system_prompt=VOCABULARY_PROMPT,
+            output_type=VocabObservation,
+            settings=settings,
+            role="vocab_observer",
+        )
 
     return await with_retries(_call, label="vocab_observer")
 
@@ -5,16 +5,29 @@ temporal context, and produces one `WindowAnalysis`: a free-form narrative plus
 0..n discrete `Signal`s. Unlike the old Pattern Detector there is NO empty-drop
 gate — every analysed window yields a note, and single-modality / "interesting"
 findings are welcome.
+
+The free tier skips the observers (`run_window_analyst_solo`) and, with
+`run_window_analyst_batch`, packs several consecutive windows into a single
+request — request count, not tokens, is what a free key runs out of.
 """
 
 from __future__ import annotations
 
+import logging
+from dataclasses import dataclass
+
 from agents import _stub
+from agents._cache import cached_run
+from agents._compact import dump_model, event_line
 from agents._provider import make_agent
-from agents._retry import with_retries
+from agents._ratelimit import estimate_input_tokens
+from agents._retry import _is_daily_quota, _is_rate_limit, is_transient, with_retries
 from agents._settings import AgentSettings, get_agent_settings
-from agents._usage import record_run_usage
-from agents.prompts import WINDOW_ANALYST_PROMPT, WINDOW_ANALYST_SOLO_PROMPT
+from agents.prompts import (
+    WINDOW_ANALYST_BATCH_PROMPT,
+    WINDOW_ANALYST_PROMPT,
+    WINDOW_ANALYST_SOLO_PROMPT,
+)
 from agents.schemas import (
     AudioAnomalyEvent,
     AudioObservation,
@@ -23,9 +36,35 @@ from agents.schemas import (
     VocabObservation,
     VocabularyAnomalyEvent,
     WindowAnalysis,
+    WindowAnalysisBatch,
 )
 from agents.windows import AnalysisWindow
 
+_log = logging.getLogger(__name__)
+
+# Reply tokens reserved per window in a batch: the request must return one
+# `WindowAnalysis` for every window it carries.
+_NOTE_TOKEN_ALLOWANCE = 1024
+
+
+def _pin(out: WindowAnalysis, window: AnalysisWindow) -> WindowAnalysis:
+    # The LLM may not echo temporal context perfectly; pin it to the truth.
+    out.time_start = window.start
+    out.time_end = window.end
+    out.phase = window.phase  # type: ignore[assignment]
+    out.position_pct = window.position_pct
+    return out
+
+
+def _format_header(window: AnalysisWindow) -> str:
+    pos = f"{window.position_pct * 100:.0f}%"
+    kind = "baseline/calm" if window.is_baseline else "active (anomalies present)"
+    return (
+        f"# Window {window.index + 1} of {window.total} — {kind}\n"
+        f"Time range: {window.start:.2f}–{window.end:.2f}s.\n"
+        f"Interview phase: {window.phase} (~{pos} through the interview)."
+    )
+
 
 def _format_input(
     window: AnalysisWindow,
@@ -33,16 +72,14 @@ def _format_input(
     audio: AudioObservation,
     vocab: VocabObservation,
     transcript: str,
+    *,
+    compact: bool = False,
 ) -> str:
-    pos = f"{window.position_pct * 100:.0f}%"
-    kind = "baseline/calm" if window.is_baseline else "active (anomalies present)"
     return (
-        f"# Window {window.index + 1} of {window.total} — {kind}\n"
-        f"Time range: {window.start:.2f}–{window.end:.2f}s.\n"
-        f"Interview phase: {window.phase} (~{pos} through the interview).\n\n"
-        f"# Visual observer\n{visual.model_dump_json(indent=2)}\n\n"
-        f"# Audio observer\n{audio.model_dump_json(indent=2)}\n\n"
-        f"# Vocab observer\n{vocab.model_dump_json(indent=2)}\n\n"
+        f"{_format_header(window)}\n\n"
+        f"# Visual observer\n{dump_model(visual, compact=compact)}\n\n"
+        f"# Audio observer\n{dump_model(audio, compact=compact)}\n\n"
+        f"# Vocab observer\n{dump_model(vocab, compact=compact)}\n\n"
         f"# Transcript (what they were saying)\n{transcript or '[no transcript available]'}\n"
     )
 
@@ -72,33 +109,28 @@ async def run_window_analyst(
     agent = make_agent(
         system_prompt=WINDOW_ANALYST_PROMPT, output_type=WindowAnalysis, settings=settings
     )
-    user_msg = _format_input(window, visual, audio, vocab, transcript)
+    user_msg = _format_input(
+        window, visual, audio, vocab, transcript, compact=settings.agent_compact_prompts
+    )
 
     async def _call() -> WindowAnalysis:
-        result = await agent.run(user_msg)
-        record_run_usage(result)
-        out: WindowAnalysis = result.output  # type: ignore[assignment]
-        # The LLM may not echo temporal context perfectly; pin it to the truth.
-        out.time_start = window.start
-        out.time_end = window.end
-        out.phase = window.phase  # type: ignore[assignment]
-        out.position_pct = window.position_pct
-        return out
+        out = await cached_run(
+            agent,
+            user_msg,
+            system_prompt=WINDOW_ANALYST_PROMPT,
+            output_type=WindowAnalysis,
+            settings=settings,
+            role="window_analyst",
+        )
+        return _pin(out, window)
 
     return await with_retries(_call, label="window_analyst")
 
 
-def _format_events(title: str, events: list, empty: str) -> str:
+def _format_events(title: str, events: list, empty: str, *, compact: bool = False) -> str:
     if not events:
         return f"# {title}\n{empty}"
-    lines = [f"# {title}"]
-    for ev in events:
-        lines.append(
-            f"- [{ev.feature_type}] {ev.behavioral_tag} at "
-            f"{ev.timestamp_start:.2f}–{ev.timestamp_end:.2f}s, "
-            f"intensity={ev.intensity_score:.2f}, sustained={ev.is_sustained}"
-        )
-    return "\n".join(lines)
+    return "\n".join([f"# {title}", *(event_line(ev, compact=compact) for ev in events)])
 
 
 def _format_solo_input(
@@ -110,20 +142,33 @@ def _format_solo_input(
     audio_raw: str,
     vocab_raw: str,
     transcript: str,
+    *,
+    compact: bool = False,
 ) -> str:
-    pos = f"{window.position_pct * 100:.0f}%"
-    kind = "baseline/calm" if window.is_baseline else "active (anomalies present)"
+    if compact:
+        # Calm channels are already described by their raw summary line.
+        events = "".join(
+            f"{_format_events(title, evs, '', compact=True)}\n\n"
+            for title, evs in (
+                ("Face anomalies", visual_events),
+                ("Voice anomalies", audio_events),
+                ("Speech anomalies", vocab_events),
+            )
+            if evs
+        )
+    else:
+        events = (
+            f"{_format_events('Face anomalies', visual_events, 'None — face at baseline.')}\n\n"
+            f"{_format_events('Voice anomalies', audio_events, 'None — voice at baseline.')}\n\n"
+            f"{_format_events('Speech anomalies', vocab_events, 'None — speech fluent.')}\n\n"
+        )
     return (
-        f"# Window {window.index + 1} of {window.total} — {kind}\n"
-        f"Time range: {window.start:.2f}–{window.end:.2f}s.\n"
-        f"Interview phase: {window.phase} (~{pos} through the interview).\n\n"
+        f"{_format_header(window)}\n\n"
         f"## Raw signal summaries\n"
         f"- Face: {visual_raw or 'n/a'}\n"
         f"- Voice: {audio_raw or 'n/a'}\n"
         f"- Speech: {vocab_raw or 'n/a'}\n\n"
-        f"{_format_events('Face anomalies', visual_events, 'None — face at baseline.')}\n\n"
-        f"{_format_events('Voice anomalies', audio_events, 'None — voice at baseline.')}\n\n"
-        f"{_format_events('Speech anomalies', vocab_events, 'None — speech fluent.')}\n\n"
+        f"{events}"
         f"# Transcript (what they were saying)\n{transcript or '[no transcript available]'}\n"
     )
 
@@ -171,19 +216,158 @@ async def run_window_analyst_solo(
         audio_raw,
         vocab_raw,
         transcript,
+        compact=settings.agent_compact_prompts,
     )
 
     async def _call() -> WindowAnalysis:
-        result = await agent.run(user_msg)
-        record_run_usage(result)
-        out: WindowAnalysis = result.output  # type: ignore[assignment]
-        out.time_start = window.start
-        out.time_end = window.end
-        out.phase = window.phase  # type: ignore[assignment]
-        out.position_pct = window.position_pct
-        return out
+        out = await cached_run(
+            agent,
+            user_msg,
+            system_prompt=WINDOW_ANALYST_SOLO_PROMPT,
+            output_type=WindowAnalysis,
+            settings=settings,
+            role="window_analyst_solo",
+        )
+        return _pin(out, window)
 
     return await with_retries(_call, label="window_analyst_solo")
 
 
-__all__ = ["run_window_analyst", "run_window_analyst_solo"]
+@dataclass
+class SoloWindowInput:
+    """Everything the single-pass analyst reads for one window."""
+
+    window: AnalysisWindow
+    visual_events: list[VisualAnomalyEvent]
+    audio_events: list[AudioAnomalyEvent]
+    vocab_events: list[VocabularyAnomalyEvent]
+    visual_raw: str = ""
+    audio_raw: str = ""
+    vocab_raw: str = ""
+    transcript: str = ""
+    # Anomalous samples per modality; a modality with none and no events is at baseline.
+    visual_anomalies: int = 0
+    audio_anomalies: int = 0
+    vocab_anomalies: int = 0
+
+    def render(self, *, compact: bool = False) -> str:
+        return _format_solo_input(
+            self.window,
+            self.visual_events,
+            self.audio_events,
+            self.vocab_events,
+            self.visual_raw,
+            self.audio_raw,
+            self.vocab_raw,
+            self.transcript,
+            compact=compact,
+        )
+
+    async def run_solo(self, settings: AgentSettings) -> WindowAnalysis:
+        return await run_window_analyst_solo(
+            self.window,
+            self.visual_events,
+            self.audio_events,
+            self.vocab_events,
+            visual_raw=self.visual_raw,
+            audio_raw=self.audio_raw,
+            vocab_raw=self.vocab_raw,
+            transcript=self.transcript,
+            settings=settings,
+        )
+
+
+def plan_batches(
+    inputs: list[SoloWindowInput],
+    *,
+    max_windows: int,
+    token_budget: int,
+    compact: bool = False,
+) -> list[list[SoloWindowInput]]:
+    """Group consecutive windows so each request stays within `token_budget`.
+
+    A window's cost is its rendered input plus `_NOTE_TOKEN_ALLOWANCE` for the
+    note it adds to the reply; a window that alone exceeds the budget still gets
+    a batch of its own.
+    """
+    batches: list[list[SoloWindowInput]] = []
+    current: list[SoloWindowInput] = []
+    used = 0
+    for inp in inputs:
+        cost = estimate_input_tokens(inp.render(compact=compact)) + _NOTE_TOKEN_ALLOWANCE
+        if current and (len(current) >= max_windows or used + cost > token_budget):
+            batches.append(current)
+            current, used = [], 0
+        current.append(inp)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def run_window_analyst_batch(
+    inputs: list[SoloWindowInput],
+    *,
+    settings: AgentSettings | None = None,
+) -> list[WindowAnalysis]:
+    """Free-tier path, batched: one LLM call for several consecutive windows.
+
+    If the reply fails validation or does not hold exactly one note per window,
+    the batch is split in half at once (never re-sent as-is, and never cached)
+    and each half retried, down to single-window `run_window_analyst_solo`
+    calls. Only transient errors are retried whole. Rate-limit errors are
+    re-raised instead — splitting would only multiply the requests that are
+    being refused.
+    """
+    settings = settings or get_agent_settings()
+    if len(inputs) == 1 or settings.llm_provider == "stub":
+        return [await inp.run_solo(settings) for inp in inputs]
+
+    agent = make_agent(
+        system_prompt=WINDOW_ANALYST_BATCH_PROMPT,
+        output_type=WindowAnalysisBatch,
+        settings=settings,
+    )
+    user_msg = "\n\n".join(inp.render(compact=settings.agent_compact_prompts) for inp in inputs)
+
+    def _one_note_per_window(batch: WindowAnalysisBatch) -> None:
+        if len(batch.analyses) != len(inputs):
+            raise ValueError(f"expected {len(inputs)} window notes, got {len(batch.analyses)}")
+
+    async def _call() -> WindowAnalysisBatch:
+        return await cached_run(
+            agent,
+            user_msg,
+            system_prompt=WINDOW_ANALYST_BATCH_PROMPT,
+            output_type=WindowAnalysisBatch,
+            settings=settings,
+            role="window_analyst_batch",
+            validate=_one_note_per_window,
+        )
+
+    try:
+        # Only transient failures are re-sent as-is; a bad reply is split at once.
+        batch = await with_retries(_call, label="window_analyst_batch", retry_if=is_transient)
+    except Exception as e:
+        if _is_rate_limit(e) or _is_daily_quota(e):
+            raise
+        mid = len(inputs) // 2
+        _log.warning(
+            "Batch of %d windows failed (%s) — splitting into %d + %d",
+            len(inputs),
+            e,
+            mid,
+            len(inputs) - mid,
+        )
+        first = await run_window_analyst_batch(inputs[:mid], settings=settings)
+        return first + await run_window_analyst_batch(inputs[mid:], settings=settings)
+    return [_pin(out, inp.window) for out, inp in zip(batch.analyses, inputs, strict=True)]
+
+
+__all__ = [
+    "SoloWindowInput",
+    "plan_batches",
+    "run_window_analyst",
+    "run_window_analyst_batch",
+    "run_window_analyst_solo",
+]
@@ -11,15 +11,23 @@ Two kinds of window are produced:
 Every window carries temporal context (`phase`, `position_pct`, `index`,
 `total`) so the Window Analyst knows *where in the interview* it sits. The
 total number of windows is capped (`MAX_WINDOWS`) to bound LLM cost; baseline
-windows are dropped first and any truncation is logged (never silent).
+windows are dropped first, then the least intense active windows (see
+`window_intensity`), and any truncation is logged (never silent). The finer,
+per-job token/request budget is applied afterwards by `agents.planner`.
+
+Selection works on flat arrays: range bounds (and each range's peak |rz_score|)
+are pulled out of the dict cells once per column, merged with a sort +
+cumulative-max sweep, and window rows are `searchsorted` slices (views) of the
+time-sorted master frame.
 """
 
 from __future__ import annotations
 
 import logging
+import math
 from dataclasses import dataclass, field
-from typing import Any
 
+import numpy as np
 import pandas as pd
 
 _log = logging.getLogger(__name__)
@@ -45,6 +53,10 @@ _ANOMALY_COLUMNS = (
     "pauses_taken",
 )
 
+# Modality labels exposed to agents; a range's modality is stored as an index
+# into this tuple (and merged spans as a bitmask over it).
+_MODALITIES = ("Visual", "Audio", "Verbal")
+
 # Lookup of (column name in master_df) → (modality label exposed to agents).
 _MODALITY_BY_COLUMN = {
     "blinking_data": "Visual",
@@ -69,6 +81,8 @@ class AnalysisWindow:
     rows: pd.DataFrame  # slice of master_df covering [start, end]
     modalities_with_anomalies: set[str] = field(default_factory=set)
     is_baseline: bool = False
+    # Peak |rz_score| over the anomalous cells whose ranges formed the window.
+    peak_rz: float = 0.0
     # Temporal context (filled in once the full window list is known).
     phase: str = "Opening"
     position_pct: float = 0.0
@@ -80,6 +94,11 @@ class AnalysisWindow:
         return self.end - self.start
 
 
+def window_intensity(window: AnalysisWindow) -> tuple[int, float]:
+    """Rank key for active windows: modalities involved, then peak |rz_score|."""
+    return len(window.modalities_with_anomalies), window.peak_rz
+
+
 def _phase_for(pct: float) -> str:
     if pct < 0.10:
         return "Opening"
@@ -92,51 +111,99 @@ def _phase_for(pct: float) -> str:
     return "Closing"
 
 
-def _extract_ranges(master_df: pd.DataFrame) -> list[tuple[float, float, str]]:
-    """Return (start, end, modality) tuples for every distinct anomalous range."""
-    ranges: list[tuple[float, float, str]] = []
+def _abs_rz(cell: dict) -> float:
+    """|rz_score| of an anomalous cell, else 0."""
+    rz = cell.get("rz_score")
+    if not cell.get("is_anomalous") or not isinstance(rz, (int, float)) or math.isnan(rz):
+        return 0.0
+    return abs(float(rz))
+
 
+def _range_bounds(cells: np.ndarray) -> np.ndarray:
+    """(n, 3) array of [min, max, |rz|] for each cell's `part_of_anomalous_range`."""
+    bounds = [
+        (min(r), max(r), _abs_rz(cell))
+        for cell in cells
+        if isinstance(cell, dict)
+        and isinstance(r := cell.get("part_of_anomalous_range"), list)
+        and r
+    ]
+    return np.asarray(bounds, dtype=float).reshape(-1, 3)
+
+
+def _extract_ranges(
+    master_df: pd.DataFrame,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return (starts, ends, peak |rz|, modality codes) for every anomalous range.
+
+    Bounds are rounded to 0.01s; duplicates are left in, the merge absorbs them.
+    """
+    starts, ends, peaks, codes = [], [], [], []
     for col in _ANOMALY_COLUMNS:
         if col not in master_df.columns:
             continue
-        modality = _MODALITY_BY_COLUMN[col]
-        for cell in master_df[col]:
-            if not isinstance(cell, dict):
-                continue
-            r: Any = cell.get("part_of_anomalous_range")
-            if not r or not isinstance(r, list) or len(r) < 1:
-                continue
-            ranges.append((float(min(r)), float(max(r)), modality))
-
-    # de-dup exact duplicates
-    return list({(round(s, 2), round(e, 2), m) for s, e, m in ranges})
+        bounds = _range_bounds(master_df[col].to_numpy())
+        starts.append(np.round(bounds[:, 0], 2))
+        ends.append(np.round(bounds[:, 1], 2))
+        peaks.append(bounds[:, 2])
+        codes.append(np.full(len(bounds), _MODALITIES.index(_MODALITY_BY_COLUMN[col])))
+    if not starts:
+        return np.empty(0), np.empty(0), np.empty(0), np.empty(0, dtype=int)
+    return (
+        np.concatenate(starts),
+        np.concatenate(ends),
+        np.concatenate(peaks),
+        np.concatenate(codes),
+    )
 
 
 def _merge_overlapping(
-    ranges: list[tuple[float, float, str]], gap: float = 1.0
-) -> list[tuple[float, float, set[str]]]:
+    starts: np.ndarray, ends: np.ndarray, peaks: np.ndarray, codes: np.ndarray, gap: float = 1.0
+) -> list[tuple[float, float, set[str], float]]:
     """Merge overlapping/adjacent (gap ≤ `gap`) ranges into a single span,
-    tracking which modalities contributed."""
-    if not ranges:
+    tracking which modalities contributed and the span's peak |rz|.
+
+    Sorted by start, a range opens a new span exactly when it begins more than
+    `gap` after the furthest end seen so far (a cumulative max).
+    """
+    if starts.size == 0:
         return []
-    sorted_ranges = sorted(ranges, key=lambda r: (r[0], r[1]))
-    merged: list[tuple[float, float, set[str]]] = []
-    cur_s, cur_e, cur_mods = sorted_ranges[0][0], sorted_ranges[0][1], {sorted_ranges[0][2]}
+    order = np.lexsort((ends, starts))
+    s, e, p, m = starts[order], ends[order], peaks[order], codes[order]
+    opens = np.empty(s.size, dtype=bool)
+    opens[0] = True
+    opens[1:] = s[1:] > np.maximum.accumulate(e)[:-1] + gap
+    first = np.flatnonzero(opens)
+    span_ends = np.maximum.reduceat(e, first)
+    span_peaks = np.maximum.reduceat(p, first)
+    span_mods = np.bitwise_or.reduceat(np.left_shift(1, m), first)
+    return [
+        (
+            float(s[i]),
+            float(end),
+            {lbl for k, lbl in enumerate(_MODALITIES) if mask >> k & 1},
+            float(peak),
+        )
+        for i, end, mask, peak in zip(first, span_ends, span_mods.tolist(), span_peaks, strict=True)
+    ]
+
 
-    for s, e, m in sorted_ranges[1:]:
-        if s <= cur_e + gap:
-            cur_e = max(cur_e, e)
-            cur_mods.add(m)
-        else:
-            merged.append((cur_s, cur_e, cur_mods))
-            cur_s, cur_e, cur_mods = s, e, {m}
-    merged.append((cur_s, cur_e, cur_mods))
-    return merged
+def sort_by_time(master_df: pd.DataFrame) -> pd.DataFrame:
+    """`master_df` sorted by Time (the frame itself when it already is)."""
+    if "Time" not in master_df.columns or master_df["Time"].is_monotonic_increasing:
+        return master_df
+    return master_df.sort_values("Time", kind="stable")
 
 
-def _slice_rows(master_df: pd.DataFrame, start: float, end: float) -> pd.DataFrame:
-    mask = (master_df["Time"] >= start) & (master_df["Time"] <= end)
-    return master_df.loc[mask].copy().reset_index(drop=True)
+def slice_rows(master_df: pd.DataFrame, start: float, end: float) -> pd.DataFrame:
+    """Rows with start ≤ Time ≤ end, as a positional slice (a view — do not mutate).
+
+    `master_df` must be sorted by Time (see `sort_by_time`).
+    """
+    times = master_df["Time"].to_numpy()
+    lo = int(np.searchsorted(times, start, side="left"))
+    hi = int(np.searchsorted(times, end, side="right"))
+    return master_df.iloc[lo:hi]
 
 
 def _overlaps_any(start: float, end: float, spans: list[tuple[float, float]]) -> bool:
@@ -162,7 +229,7 @@ def _sample_baseline_windows(
             continue
         if _overlaps_any(start, end, taken):
             continue
-        rows = _slice_rows(master_df, start, end)
+        rows = slice_rows(master_df, start, end)
         if rows.empty:
             continue
         windows.append(
@@ -188,6 +255,17 @@ def _evenly_subsample(items: list[AnalysisWindow], k: int) -> list[AnalysisWindo
     return [items[int(i * step)] for i in range(k)]
 
 
+def assign_temporal_context(windows: list[AnalysisWindow], duration: float) -> list[AnalysisWindow]:
+    """Sort chronologically and (re)fill `index`, `total`, `position_pct`, `phase`."""
+    windows = sorted(windows, key=lambda w: w.start)
+    for i, w in enumerate(windows):
+        w.index = i
+        w.total = len(windows)
+        w.position_pct = round(w.start / duration, 4) if duration > 0 else 0.0
+        w.phase = _phase_for(w.position_pct)
+    return windows
+
+
 def select_windows(master_df: pd.DataFrame, *, gap: float = 1.0) -> list[AnalysisWindow]:
     """Return the analysis windows for the agent chain (active + baseline).
 
@@ -197,19 +275,21 @@ def select_windows(master_df: pd.DataFrame, *, gap: float = 1.0) -> list[Analysi
     if master_df.empty or "Time" not in master_df.columns:
         return []
 
+    master_df = sort_by_time(master_df)
     duration = float(master_df["Time"].max())
 
     # 1. Active (anomaly) windows.
-    merged = _merge_overlapping(_extract_ranges(master_df), gap=gap)
+    merged = _merge_overlapping(*_extract_ranges(master_df), gap=gap)
     active: list[AnalysisWindow] = [
         AnalysisWindow(
             start=start,
             end=end,
-            rows=_slice_rows(master_df, start, end),
+            rows=slice_rows(master_df, start, end),
             modalities_with_anomalies=mods,
             is_baseline=False,
+            peak_rz=peak,
         )
-        for start, end, mods in merged
+        for start, end, mods, peak in merged
     ]
     active_spans = [(w.start, w.end) for w in active]
 
@@ -223,11 +303,11 @@ def select_windows(master_df: pd.DataFrame, *, gap: float = 1.0) -> list[Analysi
         baseline = _evenly_subsample(baseline, keep_baseline)
         if len(active) > MAX_WINDOWS:
             _log.warning(
-                "Capping windows: %d active exceeds MAX_WINDOWS=%d — subsampling active.",
+                "Capping windows: %d active exceeds MAX_WINDOWS=%d — keeping the most intense.",
                 len(active),
                 MAX_WINDOWS,
             )
-            active = _evenly_subsample(sorted(active, key=lambda w: w.start), MAX_WINDOWS)
+            active = sorted(active, key=window_intensity, reverse=True)[:MAX_WINDOWS]
             baseline = []
         elif dropped > 0:
             _log.warning(
@@ -237,13 +317,8 @@ def select_windows(master_df: pd.DataFrame, *, gap: float = 1.0) -> list[Analysi
             )
 
     # 4. Sort + assign temporal context.
-    windows = sorted(active + baseline, key=lambda w: w.start)
+    windows = assign_temporal_context(active + baseline, duration)
     total = len(windows)
-    for i, w in enumerate(windows):
-        w.index = i
-        w.total = total
-        w.position_pct = round(w.start / duration, 4) if duration > 0 else 0.0
-        w.phase = _phase_for(w.position_pct)
 
     _log.info(
         "Selected %d analysis windows (%d active, %d baseline) from %d rows",
@@ -255,4 +330,12 @@ def select_windows(master_df: pd.DataFrame, *, gap: float = 1.0) -> list[Analysi
     return windows
 
 
-__all__ = ["MAX_WINDOWS", "AnalysisWindow", "select_windows"]
+__all__ = [
+    "MAX_WINDOWS",
+    "AnalysisWindow",
+    "assign_temporal_context",
+    "select_windows",
+    "slice_rows",
+    "sort_by_time",
+    "window_intensity",
+]
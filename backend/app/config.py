@@ -43,6 +43,25 @@ class Settings(BaseSettings):
     face_landmarker_path: Path = Path("models/face_landmarker.task")
     whisper_model_size: str = "small"
     whisper_device: str = "cpu"
+    intermediate_format: Literal["parquet", "arrow"] = "parquet"
+
+    # Job execution: "background" runs jobs inside the API process
+    # (FastAPI BackgroundTasks); "worker" only queues them for
+    # `python -m backend.worker` processes to claim.
+    job_executor: Literal["background", "worker"] = "background"
+    # Pipeline processes per worker; 0 = one per CPU core.
+    worker_concurrency: int = 0
+    worker_poll_interval_sec: float = 2.0
+    worker_heartbeat_sec: float = 15.0
+    # A running job whose heartbeat is older than this is re-queued
+    # (or failed once it has been attempted `worker_max_attempts` times).
+    worker_stale_after_sec: float = 120.0
+    worker_max_attempts: int = 3
+
+    # Admission control (per process): pipelines are CPU/RAM-bound, agent
+    # phases wait on the LLM. Waiting jobs are admitted paid tier first.
+    max_concurrent_pipelines: int = 1
+    max_concurrent_agent_phases: int = 4
 
     # Agents
     agent_max_concurrency: int = 4
@@ -22,6 +22,9 @@ _ADDITIVE_COLUMNS: dict[str, list[tuple[str, str]]] = {
         ("output_tokens", "INTEGER"),
         ("total_tokens", "INTEGER"),
         ("tier", "TEXT"),
+        ("worker_id", "TEXT"),
+        ("heartbeat_at", "DATETIME"),
+        ("attempts", "INTEGER"),
     ],
 }
 
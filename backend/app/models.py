@@ -34,6 +34,12 @@ class Job(SQLModel, table=True):
     started_at: datetime | None = Field(default=None)
     finished_at: datetime | None = Field(default=None)
 
+    # Set while a `backend.worker` process owns the job; a running job whose
+    # heartbeat goes stale is re-queued. Unset for in-process (BackgroundTasks) runs.
+    worker_id: str | None = Field(default=None)
+    heartbeat_at: datetime | None = Field(default=None)
+    attempts: int | None = Field(default=None)
+
     # LLM token usage for the agent chain (counts only — never any key/content).
     input_tokens: int | None = Field(default=None)
     output_tokens: int | None = Field(default=None)
@@ -26,19 +26,20 @@ from backend.app.config import Settings, get_settings
 from backend.app.deps import get_session_dep
 from backend.app.models import Job
 from backend.app.schemas import JobListOut, JobOut
-from backend.app.services.job_runner import run_job_blocking
+from backend.app.services.job_runner import run_job
 from backend.app.services.key_validation import (
     KeyValidationError,
     validate_assemblyai_key,
     validate_gemini_key,
 )
+from backend.app.services.scheduler import queue_positions
 from backend.app.services.storage import remove_job_artefacts, save_upload
 
 _log = logging.getLogger(__name__)
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
-def _to_out(job: Job) -> JobOut:
+def _to_out(job: Job, queue_position: int | None = None) -> JobOut:
     return JobOut(
         id=job.id,
         filename=job.filename,
@@ -50,6 +51,7 @@ def _to_out(job: Job) -> JobOut:
         updated_at=job.updated_at,
         duration_sec=job.duration_sec,
         tier=job.tier,
+        queue_position=queue_position,
         input_tokens=job.input_tokens,
         output_tokens=job.output_tokens,
         total_tokens=job.total_tokens,
@@ -134,6 +136,13 @@ async def create_job(
     tier = tier.strip().lower()
     if tier not in ("free", "paid"):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="tier must be 'free' or 'paid'.")
+    if settings.job_executor == "worker" and (gemini_api_key or assemblyai_api_key):
+        # Keys are never persisted, so they can't be handed to a separate worker.
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail="This server runs analyses on shared workers and uses its own API keys; "
+            "leave the key fields empty.",
+        )
 
     # Read into memory once to size-check; for very large uploads we stream
     # via SpooledTemporaryFile under the hood. 500 MB is the configured cap.
@@ -171,17 +180,19 @@ async def create_job(
     session.commit()
     session.refresh(job)
 
-    # Per-request keys (BYOK) are passed straight to the worker and never
-    # persisted — not on the Job row, not in logs.
-    background_tasks.add_task(
-        run_job_blocking,
-        job_id,
-        settings,
-        (gemini_api_key or None),
-        (assemblyai_api_key or None),
-    )
+    # With JOB_EXECUTOR=worker the queued row is all a `backend.worker` needs.
+    if settings.job_executor == "background":
+        # Per-request keys (BYOK) are passed straight to the runner and never
+        # persisted — not on the Job row, not in logs.
+        background_tasks.add_task(
+            run_job,
+            job_id,
+            settings,
+            (gemini_api_key or None),
+            (assemblyai_api_key or None),
+        )
     _log.info("Queued job %s (filename=%s, test_input=%s)", job_id, job.filename, is_test_input)
-    return _to_out(job)
+    return _to_out(job, queue_positions(session).get(job_id))
 
 
 @router.get("", response_model=JobListOut)
@@ -198,7 +209,8 @@ def list_jobs(
     rows = session.exec(
         base.order_by(Job.created_at.desc()).offset(offset).limit(limit)  # type: ignore[attr-defined]
     ).all()
-    return JobListOut(items=[_to_out(j) for j in rows], total=int(total))
+    positions = queue_positions(session)
+    return JobListOut(items=[_to_out(j, positions.get(j.id)) for j in rows], total=int(total))
 
 
 @router.get("/{job_id}", response_model=JobOut)
@@ -206,7 +218,8 @@ def get_job(job_id: str, session: Session = Depends(get_session_dep)) -> JobOut:
     job = session.get(Job, job_id)
     if job is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="job not found")
-    return _to_out(job)
+    position = queue_positions(session).get(job_id) if job.status == "queued" else None
+    return _to_out(job, position)
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -6,6 +6,7 @@ import json
 import logging
 from pathlib import Path
 
+import pyarrow as pa
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import ValidationError
@@ -85,9 +86,15 @@ def get_report(
 def get_master_df(
     job_id: str,
     format: str = Query(default="parquet", pattern="^(json|parquet)$"),
+    start: float | None = Query(default=None, description="JSON only: first Time to include"),
+    end: float | None = Query(default=None, description="JSON only: last Time to include"),
+    columns: list[str] | None = Query(default=None, description="JSON only: columns besides Time"),
     settings: Settings = Depends(get_settings),
     session: Session = Depends(get_session_dep),
 ) -> JSONResponse | FileResponse:
+    """Download master_df. `format=json` accepts a `start`/`end` time range and
+    a `columns` subset, both pushed down into the parquet read so a narrow
+    view only decodes the row groups and columns it returns."""
     _require_job(job_id, session)
     paths = job_paths(settings.processed_dir, job_id)
     master_path: Path = paths.master_parquet
@@ -95,7 +102,17 @@ def get_master_df(
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="master_df not yet produced")
     if format == "parquet":
         return FileResponse(master_path, media_type="application/octet-stream")
-    df = load_df_parquet_safe(master_path)
+    time_range = None
+    if start is not None or end is not None:
+        time_range = (
+            start if start is not None else float("-inf"),
+            end if end is not None else float("inf"),
+        )
+    selected = ["Time", *columns] if columns else None
+    try:
+        df = load_df_parquet_safe(master_path, columns=selected, time_range=time_range)
+    except pa.ArrowInvalid as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(exc)) from None
     return JSONResponse(json.loads(df.to_json(orient="records")))
 
 
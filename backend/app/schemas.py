@@ -29,6 +29,8 @@ class JobOut(BaseModel):
     updated_at: datetime
     duration_sec: float | None
     tier: str | None = None
+    # 1 = next to be admitted; None once the job has left the queue.
+    queue_position: int | None = None
     input_tokens: int | None = None
     output_tokens: int | None = None
     total_tokens: int | None = None
@@ -0,0 +1,155 @@
+"""Database-backed job queue for `backend.worker` processes.
+
+The `Job` table is the queue: the API inserts `queued` rows, workers claim
+them in `queue_order()` (paid tier first) with a compare-and-set
+`queued → running` update (only one worker's UPDATE can match), then heartbeat while the job runs. A `running` job whose
+heartbeat is older than `worker_stale_after_sec` belonged to a worker that
+died; it is re-queued so another worker can pick it up, and the pipeline's
+stage checkpoints make the retry resume rather than start over.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, update
+from sqlmodel import col, select
+
+from backend.app.config import Settings
+from backend.app.db import session_scope
+from backend.app.models import Job
+from backend.app.services.scheduler import queue_order
+
+_log = logging.getLogger(__name__)
+
+STALE_ERROR = "The analysis worker stopped responding too many times. Please try again."
+
+
+def claim_next_job(settings: Settings, worker_id: str) -> str | None:
+    """Atomically move the next queued job (paid tier first, then oldest) to
+    `running` for `worker_id`.
+
+    Returns the claimed job id, or None when the queue is empty.
+    """
+    with session_scope(settings) as session:
+        while True:
+            job_id = session.exec(
+                select(Job.id).where(Job.status == "queued").order_by(*queue_order()).limit(1)
+            ).first()
+            if job_id is None:
+                return None
+            now = datetime.now(UTC)
+            claimed = session.exec(  # type: ignore[call-overload]
+                update(Job)
+                .where(col(Job.id) == job_id, col(Job.status) == "queued")
+                .values(
+                    status="running",
+                    worker_id=worker_id,
+                    heartbeat_at=now,
+                    updated_at=now,
+                    attempts=func.coalesce(Job.attempts, 0) + 1,
+                )
+            )
+            session.commit()
+            if claimed.rowcount == 1:
+                _log.info("Worker %s claimed job %s", worker_id, job_id)
+                return job_id
+            # Another worker won the race for this row; try the next one.
+
+
+def heartbeat(settings: Settings, worker_id: str, job_ids: list[str]) -> None:
+    """Refresh `heartbeat_at` on the jobs this worker still owns."""
+    if not job_ids:
+        return
+    now = datetime.now(UTC)
+    with session_scope(settings) as session:
+        session.exec(  # type: ignore[call-overload]
+            update(Job)
+            .where(
+                col(Job.id).in_(job_ids),
+                col(Job.worker_id) == worker_id,
+                col(Job.status) == "running",
+            )
+            .values(heartbeat_at=now)
+        )
+        session.commit()
+
+
+def requeue_stale_jobs(settings: Settings) -> list[str]:
+    """Re-queue worker-owned running jobs with a stale heartbeat.
+
+    Jobs that have already been attempted `worker_max_attempts` times are
+    failed instead, so a job that crashes its worker can't loop forever.
+    Returns the ids that were re-queued.
+    """
+    cutoff = datetime.now(UTC) - timedelta(seconds=settings.worker_stale_after_sec)
+    requeued: list[str] = []
+    with session_scope(settings) as session:
+        stale = session.exec(
+            select(Job).where(
+                Job.status == "running",
+                col(Job.worker_id).is_not(None),
+                col(Job.heartbeat_at) < cutoff,
+            )
+        ).all()
+        for job in stale:
+            now = datetime.now(UTC)
+            values: dict[str, object]
+            if (job.attempts or 0) >= settings.worker_max_attempts:
+                values = {"status": "failed", "error": STALE_ERROR, "finished_at": now}
+                _log.warning("Job %s failed: worker %s went stale", job.id, job.worker_id)
+            else:
+                values = {"status": "queued", "current_stage": None}
+                requeued.append(job.id)
+                _log.warning("Re-queueing job %s: worker %s went stale", job.id, job.worker_id)
+            # Re-check staleness in the UPDATE so a worker that heartbeated since
+            # the SELECT keeps its job.
+            session.exec(  # type: ignore[call-overload]
+                update(Job)
+                .where(
+                    col(Job.id) == job.id,
+                    col(Job.worker_id) == job.worker_id,
+                    col(Job.status) == "running",
+                    col(Job.heartbeat_at) < cutoff,
+                )
+                .values(worker_id=None, heartbeat_at=None, updated_at=now, **values)
+                # Staleness is decided in SQL; loaded rows carry tz-naive datetimes.
+                .execution_options(synchronize_session=False)
+            )
+        session.commit()
+    return requeued
+
+
+def requeue_job(settings: Settings, worker_id: str, job_id: str) -> bool:
+    """Hand a job this worker was running back to the queue after its executor died.
+
+    The next `claim_next_job` counts the retry in `attempts`. Returns False,
+    leaving the job untouched, once it has been attempted `worker_max_attempts`
+    times — the caller fails it then.
+    """
+    with session_scope(settings) as session:
+        requeued = session.exec(  # type: ignore[call-overload]
+            update(Job)
+            .where(
+                col(Job.id) == job_id,
+                col(Job.worker_id) == worker_id,
+                col(Job.status) == "running",
+                func.coalesce(Job.attempts, 0) < settings.worker_max_attempts,
+            )
+            .values(
+                status="queued",
+                current_stage=None,
+                worker_id=None,
+                heartbeat_at=None,
+                updated_at=datetime.now(UTC),
+            )
+        )
+        session.commit()
+    if requeued.rowcount == 1:
+        _log.warning("Re-queueing job %s: its executor crashed", job_id)
+        return True
+    return False
+
+
+__all__ = ["STALE_ERROR", "claim_next_job", "heartbeat", "requeue_job", "requeue_stale_jobs"]
@@ -1,16 +1,21 @@
-"""Glue between FastAPI's BackgroundTasks queue and the pipeline + agent chain.
+"""Glue between the job executor and the pipeline + agent chain.
 
-Designed so the executor can be swapped to Celery/RQ/Arq later without
-touching the routers. `run_job_blocking` is fully synchronous and only uses
-`asyncio.run` for the agent chain step.
+`run_job` is scheduled by FastAPI's BackgroundTasks (`JOB_EXECUTOR=background`):
+it waits for its scheduler slots on the event loop and only then runs each
+phase in a worker thread. `run_job_blocking` is the fully synchronous
+equivalent; a `backend.worker` process that claimed the job from the database
+(`JOB_EXECUTOR=worker`) drives the two phases itself.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import json
 import logging
 import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -24,20 +29,28 @@ from agents._retry import (
     _is_daily_quota,
 )
 from agents._settings import AgentSettings, get_agent_settings
-from agents._usage import UsageTotals, capture_usage
+from agents._usage import UsageTotals, capture_usage, format_usage
 from agents.orchestrator import build_report
 from agents.schemas import FinalReport, WindowAnalysis
 from backend.app.config import Settings
 from backend.app.db import session_scope
 from backend.app.models import Job
+from backend.app.services.scheduler import get_scheduler
 from backend.app.services.storage import job_paths
 from pipeline._logging import configure_logging
 from pipeline.features.linguistic import detect_interviewee
+from pipeline.io.ipc import load_frame
 from pipeline.io.parquet import load_df_parquet_safe, save_df_parquet_safe
-from pipeline.orchestrator import PipelineConfig, run_pipeline
+from pipeline.io.paths import PipelinePaths
+from pipeline.orchestrator import MASTER_ROW_GROUP_SIZE, PipelineConfig, run_pipeline
 
 _log = logging.getLogger(__name__)
 
+# Job whose agent phase the current task belongs to (see `_job_log`).
+_current_job: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "mmr_current_job", default=None
+)
+
 # Backend-side stage list — pipeline (9) + agentic (2) per spec §7.
 _ALL_STAGES = (
     "extracting_frames",
@@ -179,7 +192,7 @@ def _friendly_error(exc: Exception) -> str:
     )
 
 
-def _run_agents_sync(
+async def _run_agents(
     master_df: pd.DataFrame,
     speaker_label: str,
     transcript_df: pd.DataFrame | None,
@@ -187,21 +200,19 @@ def _run_agents_sync(
     agent_settings: AgentSettings | None = None,
     tier: str = "paid",
 ) -> tuple[list[WindowAnalysis], FinalReport, UsageTotals]:
-    """Wrap the async build_report so BackgroundTasks can call it synchronously.
+    """Run build_report and capture its token usage.
 
     `agent_settings` carries any per-request overrides (e.g. a user-supplied
-    Gemini key). `tier` picks the full vs lean analysis path. Token usage is
-    captured for the whole chain and returned.
+    Gemini key). `tier` picks the full vs lean analysis path. The usage
+    accumulator is context-local, so concurrent jobs on one loop stay separate.
     """
     with capture_usage() as usage:
-        reports, final = asyncio.run(
-            build_report(
-                master_df,
-                speaker_label=speaker_label,
-                transcript_df=transcript_df,
-                settings=agent_settings,
-                tier=tier,
-            )
+        reports, final = await build_report(
+            master_df,
+            speaker_label=speaker_label,
+            transcript_df=transcript_df,
+            settings=agent_settings,
+            tier=tier,
         )
     return reports, final, usage
 
@@ -215,147 +226,327 @@ def _build_agent_settings(user_gemini_key: str | None) -> AgentSettings:
     return settings
 
 
+def _pipeline_phase(
+    job_id: str,
+    settings: Settings,
+    paths: PipelinePaths,
+    *,
+    upload_path: Path,
+    speaker_label: str,
+    is_test_input: bool,
+    assemblyai_api_key: str | None,
+) -> str:
+    """Stages 1-9: produce `paths.master_parquet`. Returns the speaker label
+    (the pipeline resolves "auto"; the test-input path passes it through)."""
+    if is_test_input:
+        # Test-mode path: skip stages 1-9, load the pre-computed master parquet.
+        _log.info("Test-mode upload: skipping pipeline, loading %s", upload_path)
+        save_df_parquet_safe(
+            load_df_parquet_safe(upload_path),
+            paths.master_parquet,
+            sort_by="Time",
+            row_group_size=MASTER_ROW_GROUP_SIZE,
+        )
+        return speaker_label
+
+    # Real pipeline path: run stages 1-9 with progress callback.
+    def _progress_cb(stage: str, frac: float) -> None:
+        with session_scope(settings) as session:
+            # Reserve the last ~22% for the agent chain.
+            _set_stage(session, job_id, stage, frac * 0.78)
+
+    pipeline_cfg = PipelineConfig(
+        job_id=job_id,
+        data_root=settings.processed_dir,
+        speaker_label=speaker_label,
+        face_model_path=settings.face_landmarker_path,
+        assemblyai_api_key=assemblyai_api_key or settings.assemblyai_api_key,
+        whisper_model_size=settings.whisper_model_size,
+        whisper_device=settings.whisper_device,
+        intermediate_format=settings.intermediate_format,
+    )
+    # Resume from checkpoints so a retried job skips stages that already finished.
+    result = run_pipeline(upload_path, pipeline_cfg, progress_cb=_progress_cb, resume=True)
+    # The pipeline resolves "auto" → the detected interviewee label; keep
+    # the agents (and the persisted record) in sync with that decision.
+    return result.speaker_label
+
+
+async def _agent_phase(
+    job_id: str,
+    settings: Settings,
+    paths: PipelinePaths,
+    *,
+    speaker_label: str,
+    tier: str,
+    gemini_api_key: str | None,
+) -> None:
+    """Stages 10-11: agent chain over `paths.master_parquet`, then persist the report."""
+    master_df = load_df_parquet_safe(paths.master_parquet)
+
+    # Load the transcript so the agents know *what was said* (utterances
+    # preferred — it carries speaker labels; whisper is the fallback).
+    transcript_df: pd.DataFrame | None = None
+    if paths.utterances_parquet.exists():
+        transcript_df = load_frame(paths.utterances_parquet)
+    elif paths.whisper_parquet.exists():
+        _log.warning("No utterances.parquet — falling back to whisper (no speaker labels).")
+        transcript_df = load_frame(paths.whisper_parquet)
+    else:
+        _log.warning("No transcript parquet found — agents run without spoken context.")
+
+    # The real pipeline already resolved "auto"; the test-input path skips it,
+    # so detect here from the loaded transcript. Persist the resolved label so
+    # the record reflects which speaker was actually analyzed.
+    if speaker_label.strip().lower() == "auto":
+        speaker_label = detect_interviewee(transcript_df) if transcript_df is not None else "B"
+        _log.info("Resolved interviewee label (test-input path): %s", speaker_label)
+    with session_scope(settings) as session:
+        job = session.exec(select(Job).where(Job.id == job_id)).first()
+        if job is not None:
+            job.speaker_label = speaker_label
+            session.add(job)
+            session.commit()
+
+    # Stage 10: agents
+    with session_scope(settings) as session:
+        _set_stage(session, job_id, "running_agents", 0.80)
+    reports, final, usage = await _run_agents(
+        master_df,
+        speaker_label,
+        transcript_df,
+        agent_settings=_build_agent_settings(gemini_api_key),
+        tier=tier,
+    )
+
+    # Stage 11: final report persistence
+    with session_scope(settings) as session:
+        _set_stage(session, job_id, "generating_final_report", 0.95)
+
+    segments_path = paths.job_dir / "segments.json"
+    report_path = paths.job_dir / "report.json"
+    markdown_path = paths.job_dir / "report.md"
+    _save_segments_and_report(reports, final, segments_path=segments_path, report_path=report_path)
+    markdown_path.write_text(_build_markdown(final))
+
+    with session_scope(settings) as session:
+        job = session.exec(select(Job).where(Job.id == job_id)).first()
+        if job is not None:
+            job.input_tokens = usage.input_tokens
+            job.output_tokens = usage.output_tokens
+            job.total_tokens = usage.total_tokens
+            session.add(job)
+            session.commit()
+        _set_status(session, job_id, status="succeeded", finished=True)
+    _log.info(
+        "Job %s succeeded (tokens in=%d out=%d total=%d).",
+        job_id,
+        usage.input_tokens,
+        usage.output_tokens,
+        usage.total_tokens,
+    )
+    if usage.by_role:
+        _log.info("Job %s token usage\n%s", job_id, format_usage(usage))
+
+
+@contextmanager
+def _job_log(log_file: Path, job_id: str) -> Iterator[None]:
+    """Tee this job's records into its log file while other jobs share the process.
+
+    Records are matched on a context variable, so tasks spawned inside the
+    block (the agent chain's fan-out) are attributed to the right job, and
+    concurrent jobs — pipeline or agent phase — never write into each other's
+    `job.log`. The root logger itself is never re-pointed at a job file.
+    """
+    token = _current_job.set(job_id)
+    root = logging.getLogger()
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    handler.addFilter(lambda _record: _current_job.get() == job_id)
+    root.addHandler(handler)
+    try:
+        yield
+    finally:
+        root.removeHandler(handler)
+        handler.close()
+        _current_job.reset(token)
+
+
+def _fail_job(
+    job_id: str, settings: Settings, paths: PipelinePaths, exc: Exception, *secrets: str | None
+) -> None:
+    _log.error("Job %s failed", job_id, exc_info=exc)
+    # Full traceback goes to the job log (ops/debugging only — never shown to
+    # the user). Belt-and-suspenders: redact the user's API keys in case any
+    # library echoed them into an exception message.
+    try:
+        tb = "".join(traceback.format_exception(exc))
+        for secret in secrets:
+            if secret:
+                tb = tb.replace(secret, "***REDACTED***")
+        with paths.log_file.open("a", encoding="utf-8") as f:
+            f.write("\n=== FAILURE TRACEBACK ===\n")
+            f.write(tb)
+    except Exception:
+        pass
+    with session_scope(settings) as session:
+        _set_status(session, job_id, status="failed", error=_friendly_error(exc), finished=True)
+
+
+def _load_job(settings: Settings, job_id: str) -> Job | None:
+    with session_scope(settings) as session:
+        job = session.exec(select(Job).where(Job.id == job_id)).first()
+        if job is not None:
+            session.expunge(job)
+        return job
+
+
+def run_pipeline_phase(
+    job_id: str, settings: Settings, assemblyai_api_key: str | None = None
+) -> str | None:
+    """CPU phase on its own: stages 1-9 into `master.parquet`.
+
+    Module-level and picklable so `backend.worker` can run it in a process
+    pool. Returns the speaker label to hand to `run_agent_phase`, or None if
+    the job is missing or failed (already marked in the DB).
+    """
+    paths = job_paths(settings.processed_dir, job_id, settings.intermediate_format)
+    paths.ensure_dirs()
+    with _job_log(paths.log_file, job_id):
+        try:
+            job = _load_job(settings, job_id)
+            if job is None:
+                _log.error("job_runner: job %s not found", job_id)
+                return None
+            with session_scope(settings) as session:
+                _set_status(session, job_id, status="running")
+            return _pipeline_phase(
+                job_id,
+                settings,
+                paths,
+                upload_path=Path(job.upload_path),
+                speaker_label=job.speaker_label,
+                is_test_input=job.is_test_input,
+                assemblyai_api_key=assemblyai_api_key,
+            )
+        except Exception as e:
+            _fail_job(job_id, settings, paths, e, assemblyai_api_key)
+            return None
+
+
+def run_pipeline_phase_in_child(
+    job_id: str, settings: Settings, assemblyai_api_key: str | None = None
+) -> str | None:
+    """Process-pool entrypoint for `run_pipeline_phase`.
+
+    A pool child is reused across jobs, so its root logger is reset here (console
+    only); the job's own file is attached by `run_pipeline_phase` as usual.
+    """
+    configure_logging(level=logging.INFO, force=True)
+    return run_pipeline_phase(job_id, settings, assemblyai_api_key)
+
+
+async def run_agent_phase(
+    job_id: str,
+    settings: Settings,
+    speaker_label: str,
+    gemini_api_key: str | None = None,
+) -> None:
+    """I/O phase on its own: agent chain over the job's `master.parquet`.
+
+    Safe to run many of these concurrently on one event loop; each job's log
+    records still land in its own `job.log`.
+    """
+    paths = job_paths(settings.processed_dir, job_id, settings.intermediate_format)
+    with _job_log(paths.log_file, job_id):
+        try:
+            job = _load_job(settings, job_id)
+            if job is None:
+                _log.error("job_runner: job %s not found", job_id)
+                return
+            await _agent_phase(
+                job_id,
+                settings,
+                paths,
+                speaker_label=speaker_label,
+                tier=job.tier or "paid",
+                gemini_api_key=gemini_api_key,
+            )
+        except Exception as e:
+            _fail_job(job_id, settings, paths, e, gemini_api_key)
+
+
 def run_job_blocking(
     job_id: str,
     settings: Settings,
     gemini_api_key: str | None = None,
     assemblyai_api_key: str | None = None,
 ) -> None:
-    """Top-level worker entrypoint.
+    """Synchronous in-process entrypoint (BackgroundTasks use `run_job`).
 
     Reads the job row, runs the pipeline + agent chain, updates status as it
     goes, persists artefacts. Catches all exceptions and marks the job failed.
 
+    Each phase waits for a slot from the process's `JobScheduler` (paid tier
+    first); the job stays `queued` until its pipeline slot is granted.
+
     `gemini_api_key` / `assemblyai_api_key` are optional per-request keys (BYOK).
     They are used in-memory only — never written to the DB, the job log, or
     error messages — and fall back to the server's env values when absent.
     """
-    paths = job_paths(settings.processed_dir, job_id)
-    paths.ensure_dirs()
+    job = _load_job(settings, job_id)
+    if job is None:
+        _log.error("job_runner: job %s not found", job_id)
+        return
+    tier = job.tier or "paid"
+    scheduler = get_scheduler(settings)
 
-    # Re-configure logging so per-job logs land in paths.log_file.
-    configure_logging(level=logging.INFO, log_file=paths.log_file, force=True)
+    # The test-input path does no pipeline work, so it doesn't need a slot.
+    with nullcontext() if job.is_test_input else scheduler.pipeline_slot(tier):
+        speaker_label = run_pipeline_phase(job_id, settings, assemblyai_api_key)
+    if speaker_label is None:
+        return
+    with scheduler.agent_slot(tier):
+        asyncio.run(run_agent_phase(job_id, settings, speaker_label, gemini_api_key))
 
-    try:
-        with session_scope(settings) as session:
-            job = session.exec(select(Job).where(Job.id == job_id)).first()
-            if job is None:
-                _log.error("job_runner: job %s not found", job_id)
-                return
-            upload_path = Path(job.upload_path)
-            speaker_label = job.speaker_label
-            is_test_input = job.is_test_input
-            tier = job.tier or "paid"
-            _set_status(session, job_id, status="running")
-
-        if is_test_input:
-            # Test-mode path: skip stages 1-9, load the pre-computed master parquet.
-            _log.info("Test-mode upload: skipping pipeline, loading %s", upload_path)
-            master_df = load_df_parquet_safe(upload_path)
-            save_df_parquet_safe(master_df, paths.master_parquet)
-        else:
-            # Real pipeline path: run stages 1-9 with progress callback.
-            def _progress_cb(stage: str, frac: float) -> None:
-                with session_scope(settings) as session:
-                    # Reserve the last ~22% for the agent chain.
-                    _set_stage(session, job_id, stage, frac * 0.78)
-
-            pipeline_cfg = PipelineConfig(
-                job_id=job_id,
-                data_root=settings.processed_dir,
-                speaker_label=speaker_label,
-                face_model_path=settings.face_landmarker_path,
-                assemblyai_api_key=assemblyai_api_key or settings.assemblyai_api_key,
-                whisper_model_size=settings.whisper_model_size,
-                whisper_device=settings.whisper_device,
-            )
-            result = run_pipeline(upload_path, pipeline_cfg, progress_cb=_progress_cb)
-            # The pipeline resolves "auto" → the detected interviewee label; keep
-            # the agents (and the persisted record) in sync with that decision.
-            speaker_label = result.speaker_label
-            master_df = load_df_parquet_safe(paths.master_parquet)
-
-        # Load the transcript so the agents know *what was said* (utterances
-        # preferred — it carries speaker labels; whisper is the fallback).
-        transcript_df: pd.DataFrame | None = None
-        if paths.utterances_parquet.exists():
-            transcript_df = load_df_parquet_safe(paths.utterances_parquet)
-        elif paths.whisper_parquet.exists():
-            _log.warning("No utterances.parquet — falling back to whisper (no speaker labels).")
-            transcript_df = load_df_parquet_safe(paths.whisper_parquet)
-        else:
-            _log.warning("No transcript parquet found — agents run without spoken context.")
-
-        # The real pipeline already resolved "auto"; the test-input path skips it,
-        # so detect here from the loaded transcript. Persist the resolved label so
-        # the record reflects which speaker was actually analyzed.
-        if speaker_label.strip().lower() == "auto":
-            speaker_label = detect_interviewee(transcript_df) if transcript_df is not None else "B"
-            _log.info("Resolved interviewee label (test-input path): %s", speaker_label)
-        with session_scope(settings) as session:
-            job = session.exec(select(Job).where(Job.id == job_id)).first()
-            if job is not None:
-                job.speaker_label = speaker_label
-                session.add(job)
-                session.commit()
 
-        # Stage 10: agents
-        with session_scope(settings) as session:
-            _set_stage(session, job_id, "running_agents", 0.80)
-        reports, final, usage = _run_agents_sync(
-            master_df,
-            speaker_label,
-            transcript_df,
-            agent_settings=_build_agent_settings(gemini_api_key),
-            tier=tier,
-        )
+async def run_job(
+    job_id: str,
+    settings: Settings,
+    gemini_api_key: str | None = None,
+    assemblyai_api_key: str | None = None,
+) -> None:
+    """BackgroundTasks entrypoint: `run_job_blocking` without a thread per queued job.
 
-        # Stage 11: final report persistence
-        with session_scope(settings) as session:
-            _set_stage(session, job_id, "generating_final_report", 0.95)
+    Slots are awaited on the event loop, so a burst of uploads waits without
+    holding the threadpool the API's sync endpoints run on; each phase gets a
+    thread only once admitted.
+    """
+    job = await asyncio.to_thread(_load_job, settings, job_id)
+    if job is None:
+        _log.error("job_runner: job %s not found", job_id)
+        return
+    tier = job.tier or "paid"
+    scheduler = get_scheduler(settings)
 
-        segments_path = paths.job_dir / "segments.json"
-        report_path = paths.job_dir / "report.json"
-        markdown_path = paths.job_dir / "report.md"
-        _save_segments_and_report(
-            reports, final, segments_path=segments_path, report_path=report_path
+    async with nullcontext() if job.is_test_input else scheduler.pipeline_slot_async(tier):
+        speaker_label = await asyncio.to_thread(
+            run_pipeline_phase, job_id, settings, assemblyai_api_key
         )
-        markdown_path.write_text(_build_markdown(final))
-
-        with session_scope(settings) as session:
-            job = session.exec(select(Job).where(Job.id == job_id)).first()
-            if job is not None:
-                job.input_tokens = usage.input_tokens
-                job.output_tokens = usage.output_tokens
-                job.total_tokens = usage.total_tokens
-                session.add(job)
-                session.commit()
-            _set_status(session, job_id, status="succeeded", finished=True)
-        _log.info(
-            "Job %s succeeded (tokens in=%d out=%d total=%d).",
-            job_id,
-            usage.input_tokens,
-            usage.output_tokens,
-            usage.total_tokens,
+    if speaker_label is None:
+        return
+    async with scheduler.agent_slot_async(tier):
+        await asyncio.to_thread(
+            lambda: asyncio.run(run_agent_phase(job_id, settings, speaker_label, gemini_api_key))
         )
 
-    except Exception as e:
-        _log.exception("Job %s failed", job_id)
-        # Full traceback goes to the job log (ops/debugging only — never shown to
-        # the user). Belt-and-suspenders: redact the user's API keys in case any
-        # library echoed them into an exception message.
-        try:
-            tb = traceback.format_exc()
-            for secret in (gemini_api_key, assemblyai_api_key):
-                if secret:
-                    tb = tb.replace(secret, "***REDACTED***")
-            with paths.log_file.open("a", encoding="utf-8") as f:
-                f.write("\n=== FAILURE TRACEBACK ===\n")
-                f.write(tb)
-        except Exception:
-            pass
-        with session_scope(settings) as session:
-            _set_status(session, job_id, status="failed", error=_friendly_error(e), finished=True)
-
 
-__all__ = ["_ALL_STAGES", "run_job_blocking"]
+__all__ = [
+    "_ALL_STAGES",
+    "run_agent_phase",
+    "run_job",
+    "run_job_blocking",
+    "run_pipeline_phase",
+    "run_pipeline_phase_in_child",
+]
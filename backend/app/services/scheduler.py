@@ -0,0 +1,185 @@
+"""In-process admission control for job phases.
+
+A job has two phases with opposite resource profiles: the CPU/RAM-heavy
+pipeline and the network-bound agent chain. Each phase draws from its own
+bounded slot pool (`MAX_CONCURRENT_PIPELINES`, `MAX_CONCURRENT_AGENT_PHASES`),
+and waiting jobs are admitted by tier priority (paid before free) and then in
+arrival order, so a burst of uploads queues up instead of thrashing the box.
+Background jobs wait for their slot on the event loop (`slot_async`), so a
+queued job holds no threadpool thread the API's sync endpoints need.
+
+The database mirrors the same order: `queue_order()` sorts queued rows the
+way slots are granted, and `queue_positions()` feeds `JobOut.queue_position`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from sqlalchemy import case
+from sqlmodel import Session, col, select
+
+from backend.app.config import Settings
+from backend.app.models import Job
+
+_log = logging.getLogger(__name__)
+
+# Lower runs first; unknown tiers queue with free.
+TIER_PRIORITY: dict[str, int] = {"paid": 0, "free": 1}
+
+
+def tier_priority(tier: str | None) -> int:
+    return TIER_PRIORITY.get(tier or "paid", max(TIER_PRIORITY.values()))
+
+
+def _resolve(fut: asyncio.Future[None]) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class PrioritySlots:
+    """Counting semaphore that hands free slots to the best-priority waiter.
+
+    Threads wait with `slot()`, coroutines with `slot_async()`; both share one
+    queue. A released slot is handed straight to the head waiter.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._active = 0
+        # (priority, arrival, wake-up callback); the sequence number keeps the
+        # callback out of heap comparisons.
+        self._waiting: list[tuple[int, int, Callable[[], object]]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def _enqueue(self, entry: tuple[int, int, Callable[[], object]]) -> None:
+        with self._lock:
+            heapq.heappush(self._waiting, entry)
+            self._grant()
+
+    def _grant(self) -> None:
+        # Caller holds `_lock`.
+        while self._waiting and self._active < self.limit:
+            *_, wake = heapq.heappop(self._waiting)
+            self._active += 1
+            wake()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._grant()
+
+    @contextmanager
+    def slot(self, priority: int = 0) -> Iterator[None]:
+        granted = threading.Event()
+        self._enqueue((priority, next(self._seq), granted.set))
+        granted.wait()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def slot_async(self, priority: int = 0) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        granted: asyncio.Future[None] = loop.create_future()
+        entry = (priority, next(self._seq), lambda: loop.call_soon_threadsafe(_resolve, granted))
+        self._enqueue(entry)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                if entry in self._waiting:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    raise
+            self._release()  # granted just as we were cancelled
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+
+class JobScheduler:
+    """Per-process slot pools for the pipeline and agent phases."""
+
+    def __init__(self, max_pipelines: int, max_agent_phases: int) -> None:
+        self.pipelines = PrioritySlots(max_pipelines)
+        self.agent_phases = PrioritySlots(max_agent_phases)
+
+    def pipeline_slot(self, tier: str | None) -> Any:
+        return self.pipelines.slot(tier_priority(tier))
+
+    def agent_slot(self, tier: str | None) -> Any:
+        return self.agent_phases.slot(tier_priority(tier))
+
+    def pipeline_slot_async(self, tier: str | None) -> Any:
+        return self.pipelines.slot_async(tier_priority(tier))
+
+    def agent_slot_async(self, tier: str | None) -> Any:
+        return self.agent_phases.slot_async(tier_priority(tier))
+
+
+_schedulers: dict[tuple[int, int], JobScheduler] = {}
+_lock = threading.Lock()
+
+
+def get_scheduler(settings: Settings) -> JobScheduler:
+    """Process-wide scheduler for the configured limits."""
+    key = (settings.max_concurrent_pipelines, settings.max_concurrent_agent_phases)
+    with _lock:
+        if key not in _schedulers:
+            _schedulers[key] = JobScheduler(*key)
+        return _schedulers[key]
+
+
+def reset_scheduler() -> None:
+    """Test hook: drop cached schedulers."""
+    with _lock:
+        _schedulers.clear()
+
+
+def queue_order() -> tuple[Any, ...]:
+    """ORDER BY for queued jobs: tier priority, then arrival."""
+    priority = case(
+        # Rows from before tiers existed have NULL tier and ran as paid.
+        (col(Job.tier).is_(None), TIER_PRIORITY["paid"]),
+        *((col(Job.tier) == tier, rank) for tier, rank in TIER_PRIORITY.items()),
+        else_=max(TIER_PRIORITY.values()),
+    )
+    return priority, col(Job.created_at)
+
+
+def queue_positions(session: Session) -> dict[str, int]:
+    """1-based position of every queued job (1 = admitted next)."""
+    ids = session.exec(select(Job.id).where(Job.status == "queued").order_by(*queue_order())).all()
+    return {job_id: i for i, job_id in enumerate(ids, start=1)}
+
+
+__all__ = [
+    "TIER_PRIORITY",
+    "JobScheduler",
+    "PrioritySlots",
+    "get_scheduler",
+    "queue_order",
+    "queue_positions",
+    "reset_scheduler",
+    "tier_priority",
+]
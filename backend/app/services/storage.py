@@ -4,12 +4,19 @@ from __future__ import annotations
 
 import shutil
 from pathlib import Path
+from typing import Literal
 
 from pipeline.io.paths import PipelinePaths
 
 
-def job_paths(processed_root: Path, job_id: str) -> PipelinePaths:
-    return PipelinePaths(root=processed_root, job_id=job_id)
+def job_paths(
+    processed_root: Path,
+    job_id: str,
+    intermediate_format: Literal["parquet", "arrow"] = "parquet",
+) -> PipelinePaths:
+    return PipelinePaths(
+        root=processed_root, job_id=job_id, intermediate_format=intermediate_format
+    )
 
 
 def save_upload(
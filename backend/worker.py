@@ -0,0 +1,223 @@
+"""Standalone job worker: claims queued jobs from the database and runs them.
+
+With `JOB_EXECUTOR=worker` the API only inserts `queued` Job rows; one or
+more of these processes (on the same host or any host sharing the DB and
+data volume) claim them and heartbeat the jobs they own. Jobs left
+`running` by a dead worker are re-queued once their heartbeat goes stale.
+
+Each job runs in two phases on executors matched to their resource profile:
+
+- the CPU-bound pipeline (`run_pipeline_phase`) in a process pool with
+  `WORKER_CONCURRENCY` slots (default: one per core);
+- the LLM-bound agent chain (`run_agent_phase`) on one long-lived asyncio
+  loop that multiplexes up to `MAX_CONCURRENT_AGENT_PHASES` jobs.
+
+The phases hand over through the job's `master.parquet`, so a pipeline slot
+is free for the next job as soon as stage 9 finishes.
+
+Usage:
+    python -m backend.worker [--concurrency N] [--drain]
+
+`--drain` exits once the queue is empty and all claimed jobs have finished.
+SIGINT/SIGTERM stop claiming new jobs and wait for the in-flight ones.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.app.config import Settings, get_settings
+from backend.app.db import get_engine, session_scope
+from backend.app.services.job_queue import (
+    claim_next_job,
+    heartbeat,
+    requeue_job,
+    requeue_stale_jobs,
+)
+from backend.app.services.job_runner import (
+    _friendly_error,
+    _set_status,
+    run_agent_phase,
+    run_pipeline_phase,
+    run_pipeline_phase_in_child,
+)
+from pipeline._logging import configure_logging
+
+_log = logging.getLogger(__name__)
+
+
+def _make_pool(concurrency: int) -> Executor:
+    # spawn, not fork: children must not inherit the parent's SQLite connections.
+    return ProcessPoolExecutor(
+        max_workers=concurrency, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+class AgentLoop:
+    """One asyncio loop on a background thread running agent phases concurrently."""
+
+    def __init__(self, max_concurrent: int) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._limit = asyncio.Semaphore(max(1, max_concurrent))
+        self._thread = threading.Thread(target=self._loop.run_forever, name="agent-loop")
+        self._thread.start()
+
+    def submit(self, job_id: str, settings: Settings, speaker_label: str) -> Future[None]:
+        return asyncio.run_coroutine_threadsafe(
+            self._run(job_id, settings, speaker_label), self._loop
+        )
+
+    async def _run(self, job_id: str, settings: Settings, speaker_label: str) -> None:
+        async with self._limit:
+            await run_agent_phase(job_id, settings, speaker_label)
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def _mark_crashed(settings: Settings, job_id: str, exc: BaseException) -> None:
+    # The phase functions handle their own errors; this is a crashed child/loop.
+    _log.error("Job %s crashed its executor: %r", job_id, exc)
+    with session_scope(settings) as session:
+        _set_status(
+            session,
+            job_id,
+            status="failed",
+            error=_friendly_error(exc if isinstance(exc, Exception) else RuntimeError(exc)),
+            finished=True,
+        )
+
+
+def run_worker(
+    settings: Settings,
+    *,
+    concurrency: int | None = None,
+    drain: bool = False,
+    stop: threading.Event | None = None,
+    executor: Executor | None = None,
+) -> int:
+    """Claim and run jobs until `stop` is set (or the queue is empty with `drain`).
+
+    Returns the number of jobs this worker finished. `executor` (pipeline
+    phases) defaults to a spawn-based process pool of `concurrency` slots;
+    tests pass a thread pool. Jobs lost to a crashed pool child are re-queued
+    until they reach `worker_max_attempts`.
+    """
+    concurrency = concurrency or settings.worker_concurrency or os.cpu_count() or 1
+    stop = stop or threading.Event()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    pool = executor or _make_pool(concurrency)
+    # Only our own pool's children may reset process-wide logging.
+    pipeline_phase = run_pipeline_phase if executor is not None else run_pipeline_phase_in_child
+    agents = AgentLoop(settings.max_concurrent_agent_phases)
+    pipelines: dict[Future[str | None], str] = {}
+    on_pool: set[Future[str | None]] = set()  # pipelines submitted to the current `pool`
+    agent_phases: dict[Future[None], str] = {}
+    done = 0
+    last_beat = float("-inf")
+    _log.info("Worker %s started (pipeline slots=%d)", worker_id, concurrency)
+
+    try:
+        while True:
+            for fut in [f for f in pipelines if f.done()]:
+                job_id = pipelines.pop(fut)
+                from_current_pool = fut in on_pool
+                on_pool.discard(fut)
+                exc = fut.exception()
+                if exc is not None:
+                    broken = isinstance(exc, BrokenProcessPool)
+                    if broken and executor is None and from_current_pool:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = _make_pool(concurrency)
+                        on_pool.clear()
+                    # A dead child takes every in-flight job down with it; only the
+                    # job that keeps crashing it should end up failed.
+                    if not (broken and requeue_job(settings, worker_id, job_id)):
+                        done += 1
+                        _mark_crashed(settings, job_id, exc)
+                elif (speaker_label := fut.result()) is None:
+                    done += 1  # failed; already recorded
+                else:
+                    agent_phases[agents.submit(job_id, settings, speaker_label)] = job_id
+            for fut in [f for f in agent_phases if f.done()]:
+                job_id = agent_phases.pop(fut)
+                done += 1
+                if (exc := fut.exception()) is not None:
+                    _mark_crashed(settings, job_id, exc)
+
+            now = time.monotonic()
+            if now - last_beat >= settings.worker_heartbeat_sec:
+                heartbeat(settings, worker_id, [*pipelines.values(), *agent_phases.values()])
+                requeue_stale_jobs(settings)
+                last_beat = now
+
+            claimed = False
+            while not stop.is_set() and len(pipelines) < concurrency:
+                job_id = claim_next_job(settings, worker_id)
+                if job_id is None:
+                    break
+                claimed = True
+                pending = pool.submit(pipeline_phase, job_id, settings)
+                pipelines[pending] = job_id
+                on_pool.add(pending)
+
+            in_flight = [*pipelines, *agent_phases]
+            if not in_flight and (stop.is_set() or (drain and not claimed)):
+                break
+            if in_flight:
+                wait(
+                    in_flight,
+                    timeout=settings.worker_poll_interval_sec,
+                    return_when=FIRST_COMPLETED,
+                )
+            else:
+                stop.wait(settings.worker_poll_interval_sec)
+    finally:
+        if executor is None:
+            pool.shutdown(wait=True)
+        agents.close()
+    _log.info("Worker %s exiting after %d job(s)", worker_id, done)
+    return done
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run queued analysis jobs")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--drain", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    configure_logging(level=logging.INFO)
+    settings = get_settings()
+    get_engine(settings)  # create tables / apply migrations before claiming
+
+    stop = threading.Event()
+
+    def _request_stop(signum: int, _frame: object) -> None:
+        _log.info("Received signal %d — finishing in-flight jobs", signum)
+        stop.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    run_worker(settings, concurrency=args.concurrency, drain=args.drain, stop=stop)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+
+__all__ = ["AgentLoop", "main", "run_worker"]
@@ -0,0 +1,4 @@
+"""Offline, CPU-only performance benchmarks for the pipeline and agent chain.
+
+See `benchmarks/README.md`; entry point is `python -m benchmarks.run`.
+"""
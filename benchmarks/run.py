@@ -0,0 +1,212 @@
+"""Time every pipeline stage plus the agent chain on synthetic interviews.
+
+Runs fully offline on CPU:
+
+- inputs come from `benchmarks.synth` (drawn face video, tone/noise audio);
+- the transcription stage returns the synthetic diarized utterances and
+  whisper word timings instead of calling AssemblyAI / loading whisper, so
+  it measures only the stage's save path;
+- face features use MediaPipe when `--face-model` exists, otherwise
+  synthetic blendshapes derived from the same motion signals (recorded as
+  `"face_features": "synthetic"` in the result);
+- `select_windows` and `build_report` run with the stub LLM provider.
+
+Usage:
+    python -m benchmarks.run [--minutes 5 30 90] [--out benchmarks/results/<ts>.json]
+        [--work-dir DIR] [--intermediate-format parquet|arrow] [--keep]
+
+The JSON result (`{"meta": ..., "runs": [...]}`) is meant to be diffed
+between commits; per-stage entries are `pipeline.metrics.StageMetrics`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import asdict
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from benchmarks.synth import INTERVIEWEE, synthesize_interview, synthetic_face_features
+from pipeline._logging import configure_logging
+
+_log = logging.getLogger(__name__)
+
+DEFAULT_MINUTES = (5.0, 30.0, 90.0)
+DEFAULT_FACE_MODEL = Path("models/face_landmarker.task")
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _meta(args: argparse.Namespace, face_features: str) -> dict[str, Any]:
+    return {
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "intermediate_format": args.intermediate_format,
+        "face_features": face_features,
+        "llm_provider": "stub",
+    }
+
+
+def bench_one(
+    minutes: float,
+    work_dir: Path,
+    *,
+    face_model: Path,
+    intermediate_format: str = "parquet",
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Synthesize one interview, run the pipeline + agent chain and return its timings."""
+    from agents._settings import AgentSettings
+    from agents.orchestrator import build_report
+    from agents.windows import select_windows
+    from pipeline import orchestrator
+    from pipeline.io.ipc import load_frame
+    from pipeline.orchestrator import PipelineConfig, run_pipeline
+
+    t0 = time.perf_counter()
+    interview = synthesize_interview(work_dir / "inputs", minutes, seed=seed)
+    synth_s = time.perf_counter() - t0
+
+    use_mediapipe = face_model.exists()
+    config = PipelineConfig(
+        job_id=f"bench_{minutes:g}m",
+        data_root=work_dir / "processed",
+        speaker_label=INTERVIEWEE,
+        assemblyai_api_key="offline",
+        intermediate_format=intermediate_format,  # type: ignore[arg-type]
+    )
+    patches = [
+        mock.patch.object(
+            orchestrator, "get_utterances_data", lambda *a, **k: interview.utterances_df
+        ),
+        mock.patch.object(orchestrator, "get_whisper_data", lambda *a, **k: interview.whisper_df),
+    ]
+    if use_mediapipe:
+        config.face_model_path = face_model
+    else:
+        # run_pipeline only checks that the model file exists before handing it
+        # to face_analysis_data, which is replaced here.
+        config.face_model_path = work_dir / "face_landmarker.placeholder"
+        config.face_model_path.touch()
+        face_df = synthetic_face_features(
+            interview.turns, interview.duration_s, fps=config.frames_per_second, seed=seed
+        )
+        patches.append(
+            mock.patch.object(orchestrator, "face_analysis_data", lambda *a, **k: face_df)
+        )
+
+    with ExitStack() as stack:
+        for patch in patches:
+            stack.enter_context(patch)
+        result = run_pipeline(interview.video_path, config)
+
+    master_df = load_frame(result.master_df_path)
+
+    t0 = time.perf_counter()
+    windows = select_windows(master_df)
+    select_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    journal, _ = asyncio.run(
+        build_report(
+            master_df,
+            result.speaker_label,
+            interview.utterances_df,
+            settings=AgentSettings(llm_provider="stub"),
+        )
+    )
+    report_s = time.perf_counter() - t0
+
+    return {
+        "minutes": minutes,
+        "duration_s": interview.duration_s,
+        "face_features": "mediapipe" if use_mediapipe else "synthetic",
+        "synthesize_s": round(synth_s, 4),
+        "master_rows": len(master_df),
+        "stages": [asdict(m) for m in result.metrics],
+        "pipeline_wall_s": round(sum(m.wall_s for m in result.metrics), 4),
+        "pipeline_cpu_s": round(sum(m.cpu_s for m in result.metrics), 4),
+        "select_windows_s": round(select_s, 4),
+        "n_windows": len(windows),
+        "build_report_s": round(report_s, 4),
+        "n_journal_entries": len(journal),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline pipeline + agent benchmarks")
+    parser.add_argument("--minutes", type=float, nargs="+", default=list(DEFAULT_MINUTES))
+    parser.add_argument("--out", type=Path, default=None)
+    parser.add_argument("--work-dir", type=Path, default=None)
+    parser.add_argument("--face-model", type=Path, default=DEFAULT_FACE_MODEL)
+    parser.add_argument("--intermediate-format", choices=("parquet", "arrow"), default="parquet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="keep synthesized inputs/outputs")
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    configure_logging(level=logging.INFO)
+    os.environ["LLM_PROVIDER"] = "stub"
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="mmr_bench_"))
+    out = args.out or Path("benchmarks/results") / (
+        datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ") + ".json"
+    )
+
+    runs = []
+    try:
+        for minutes in args.minutes:
+            _log.info("Benchmarking a %g-minute interview in %s", minutes, work_dir)
+            runs.append(
+                bench_one(
+                    minutes,
+                    work_dir,
+                    face_model=args.face_model,
+                    intermediate_format=args.intermediate_format,
+                    seed=args.seed,
+                )
+            )
+    finally:
+        if not args.keep and args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    face = "mediapipe" if args.face_model.exists() else "synthetic"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"meta": _meta(args, face), "runs": runs}, indent=2))
+    for run in runs:
+        sys.stdout.write(
+            f"{run['minutes']:>6g} min  pipeline {run['pipeline_wall_s']:8.2f}s  "
+            f"select_windows {run['select_windows_s']:6.3f}s  "
+            f"build_report {run['build_report_s']:7.2f}s\n"
+        )
+    sys.stdout.write(str(out) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+
+__all__ = ["DEFAULT_MINUTES", "bench_one", "main"]
@@ -0,0 +1,323 @@
+"""Synthetic interview inputs for offline benchmarks.
+
+Everything is generated from one seeded script of speaker turns, so the
+video, audio and transcripts agree with each other:
+
+- video: a drawn face (head drifts, eyes blink and glance, mouth opens while
+  the interviewee talks) at a low frame rate, muxed with
+- audio: voiced harmonic tones per speaker (different pitch), amplitude-
+  modulated at syllable rate, over a low noise floor with silent gaps;
+- transcripts: AssemblyAI-shaped diarized utterances and whisper-shaped
+  segments with per-word timings (including filler words).
+
+`synthetic_face_features` turns the same motion signals into MediaPipe
+blendshape rows, for machines without `models/face_landmarker.task`.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+_log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16_000
+VIDEO_FPS = 5
+FRAME_SIZE = (320, 240)  # (width, height)
+
+INTERVIEWER = "A"
+INTERVIEWEE = "B"
+_PITCH_HZ = {INTERVIEWER: 120.0, INTERVIEWEE: 210.0}
+
+_WORDS = (
+    "i think the main thing was that we had to ship the project quickly so "
+    "my role was to coordinate with the team and make sure the design held up "
+    "under load we measured everything and learned a lot about tradeoffs"
+).split()
+_FILLERS = ("um", "uh", "like")
+
+# MediaPipe FaceLandmarker blendshape categories (output order).
+BLENDSHAPES = (
+    "_neutral", "browDownLeft", "browDownRight", "browInnerUp", "browOuterUpLeft",
+    "browOuterUpRight", "cheekPuff", "cheekSquintLeft", "cheekSquintRight", "eyeBlinkLeft",
+    "eyeBlinkRight", "eyeLookDownLeft", "eyeLookDownRight", "eyeLookInLeft", "eyeLookInRight",
+    "eyeLookOutLeft", "eyeLookOutRight", "eyeLookUpLeft", "eyeLookUpRight", "eyeSquintLeft",
+    "eyeSquintRight", "eyeWideLeft", "eyeWideRight", "jawForward", "jawLeft", "jawOpen",
+    "jawRight", "mouthClose", "mouthDimpleLeft", "mouthDimpleRight", "mouthFrownLeft",
+    "mouthFrownRight", "mouthFunnel", "mouthLeft", "mouthLowerDownLeft", "mouthLowerDownRight",
+    "mouthPressLeft", "mouthPressRight", "mouthPucker", "mouthRight", "mouthRollLower",
+    "mouthRollUpper", "mouthShrugLower", "mouthShrugUpper", "mouthSmileLeft", "mouthSmileRight",
+    "mouthStretchLeft", "mouthStretchRight", "mouthUpperLeft", "mouthUpperRight",
+    "noseSneerLeft", "noseSneerRight",
+)  # fmt: skip
+
+
+@dataclass(frozen=True)
+class Turn:
+    """One diarized speaker turn with its word timings."""
+
+    speaker: str
+    start: float
+    end: float
+    words: list[dict]  # {"text", "start", "end", "confidence"} in seconds
+
+
+@dataclass
+class SyntheticInterview:
+    """Paths and frames produced by `synthesize_interview`."""
+
+    video_path: Path
+    duration_s: float
+    turns: list[Turn]
+    utterances_df: pd.DataFrame
+    whisper_df: pd.DataFrame
+
+
+def script_turns(duration_s: float, *, seed: int = 0) -> list[Turn]:
+    """Alternate short questions (A) and longer answers (B) until `duration_s`."""
+    rng = np.random.default_rng(seed)
+    turns: list[Turn] = []
+    t = 0.5
+    speaker = INTERVIEWER
+    while t < duration_s - 1.0:
+        length = rng.uniform(3, 8) if speaker == INTERVIEWER else rng.uniform(10, 40)
+        end = min(t + length, duration_s - 0.5)
+        words = []
+        w = t
+        while w < end - 0.2:
+            dur = rng.uniform(0.18, 0.35)
+            filler = speaker == INTERVIEWEE and rng.random() < 0.06
+            text = rng.choice(_FILLERS) if filler else _WORDS[len(words) % len(_WORDS)]
+            words.append(
+                {
+                    "text": str(text),
+                    "start": round(w, 3),
+                    "end": round(min(w + dur, end), 3),
+                    "confidence": round(float(rng.uniform(0.8, 1.0)), 3),
+                }
+            )
+            # Occasional longer pause inside an answer.
+            w += dur + (rng.uniform(0.6, 1.5) if rng.random() < 0.04 else rng.uniform(0.03, 0.12))
+        if words:
+            turns.append(Turn(speaker, round(t, 3), words[-1]["end"], words))
+        t = end + rng.uniform(0.3, 1.5)
+        speaker = INTERVIEWEE if speaker == INTERVIEWER else INTERVIEWER
+    return turns
+
+
+def _speaking(turns: list[Turn], times: np.ndarray, speaker: str) -> np.ndarray:
+    """Boolean mask: is `speaker` inside a turn at each time."""
+    mask = np.zeros(len(times), dtype=bool)
+    for turn in turns:
+        if turn.speaker == speaker:
+            mask |= (times >= turn.start) & (times < turn.end)
+    return mask
+
+
+def face_signals(turns: list[Turn], times: np.ndarray, *, seed: int = 0) -> dict[str, np.ndarray]:
+    """Per-time motion signals in [0, 1]: blink, gaze_x/gaze_y, mouth, smile, head_x/head_y.
+
+    The interviewee blinks every ~4 s (faster while answering), glances around
+    and moves their mouth at syllable rate while speaking.
+    """
+    rng = np.random.default_rng(seed + 1)
+    duration = float(times[-1]) + 1.0 if len(times) else 1.0
+    blinks = np.cumsum(rng.uniform(2.0, 6.0, size=int(duration / 2) + 2))
+    blink = np.zeros(len(times))
+    for b in blinks:
+        blink = np.maximum(blink, np.clip(1 - np.abs(times - b) / 0.15, 0, 1))
+    talking = _speaking(turns, times, INTERVIEWEE)
+    syllable = 0.5 + 0.5 * np.sin(2 * np.pi * 4.0 * times + rng.uniform(0, np.pi))
+    return {
+        "blink": blink,
+        "gaze_x": 0.5 + 0.25 * np.sin(2 * np.pi * times / 17.0) * np.sin(times / 3.1),
+        "gaze_y": 0.5 + 0.15 * np.sin(2 * np.pi * times / 23.0),
+        "mouth": np.where(talking, 0.2 + 0.6 * syllable, 0.05),
+        "smile": 0.2 + 0.2 * np.sin(2 * np.pi * times / 41.0) ** 2,
+        "head_x": np.sin(2 * np.pi * times / 29.0),
+        "head_y": np.sin(2 * np.pi * times / 37.0),
+    }
+
+
+def synthetic_face_features(
+    turns: list[Turn], duration_s: float, *, fps: int = 1, seed: int = 0
+) -> pd.DataFrame:
+    """Frame-rate rows shaped like `face_analysis_data` output, from `face_signals`."""
+    times = np.arange(0, duration_s, 1.0 / fps)
+    s = face_signals(turns, times, seed=seed)
+    rng = np.random.default_rng(seed + 2)
+    n = len(times)
+    df = pd.DataFrame({name: rng.uniform(0.0, 0.05, n) for name in BLENDSHAPES})
+    look_out = np.clip(s["gaze_x"] - 0.5, 0, None) * 2
+    look_in = np.clip(0.5 - s["gaze_x"], 0, None) * 2
+    for side in ("Left", "Right"):
+        df[f"eyeBlink{side}"] = s["blink"] * 0.9 + 0.05
+        df[f"eyeSquint{side}"] = s["smile"] * 0.5
+        df[f"eyeLookOut{side}"] = look_out
+        df[f"eyeLookIn{side}"] = look_in
+        df[f"eyeLookUp{side}"] = np.clip(0.5 - s["gaze_y"], 0, None) * 2
+        df[f"eyeLookDown{side}"] = np.clip(s["gaze_y"] - 0.5, 0, None) * 2
+        df[f"mouthSmile{side}"] = s["smile"]
+        df[f"mouthStretch{side}"] = s["mouth"] * 0.2
+        df[f"cheekSquint{side}"] = s["smile"] * 0.4
+    df["jawOpen"] = s["mouth"]
+    df["jawForward"] = s["mouth"] * 0.1
+    df["jawLeft"] = np.clip(-s["head_x"], 0, None) * 0.1
+    df["jawRight"] = np.clip(s["head_x"], 0, None) * 0.1
+    df.insert(0, "v_ratio", 0.4 + 0.2 * s["gaze_y"])
+    df.insert(0, "h_ratio", 0.35 + 0.3 * s["gaze_x"])
+    df.insert(0, "Time", times.astype(float))
+    return df
+
+
+def _write_video(path: Path, turns: list[Turn], duration_s: float, *, seed: int) -> None:
+    import cv2 as cv
+
+    width, height = FRAME_SIZE
+    n_frames = int(duration_s * VIDEO_FPS)
+    times = np.arange(n_frames) / VIDEO_FPS
+    s = face_signals(turns, times, seed=seed)
+    writer = cv.VideoWriter(str(path), cv.VideoWriter_fourcc(*"mp4v"), VIDEO_FPS, FRAME_SIZE)
+    if not writer.isOpened():
+        raise RuntimeError(f"OpenCV could not open a video writer for {path}")
+    background = np.full((height, width, 3), (60, 50, 40), dtype=np.uint8)
+    try:
+        for i in range(n_frames):
+            frame = background.copy()
+            cx = int(width / 2 + 20 * s["head_x"][i])
+            cy = int(height / 2 + 10 * s["head_y"][i])
+            cv.ellipse(frame, (cx, cy), (70, 95), 0, 0, 360, (140, 170, 215), -1)
+            eye_h = max(1, int(10 * (1 - s["blink"][i])))
+            pupil_dx = int(8 * (s["gaze_x"][i] - 0.5) * 2)
+            pupil_dy = int(4 * (s["gaze_y"][i] - 0.5) * 2)
+            for ex in (cx - 28, cx + 28):
+                cv.ellipse(frame, (ex, cy - 25), (16, eye_h), 0, 0, 360, (245, 245, 245), -1)
+                if eye_h > 3:
+                    cv.circle(frame, (ex + pupil_dx, cy - 25 + pupil_dy), 5, (40, 30, 20), -1)
+                cv.line(frame, (ex - 16, cy - 45), (ex + 16, cy - 47), (50, 60, 80), 3)
+            cv.line(frame, (cx, cy - 15), (cx - 6, cy + 15), (110, 130, 180), 2)
+            mouth_h = max(2, int(18 * s["mouth"][i]))
+            cv.ellipse(frame, (cx, cy + 45), (26, mouth_h), 0, 0, 360, (60, 60, 150), -1)
+            writer.write(frame)
+    finally:
+        writer.release()
+
+
+def _write_audio(path: Path, turns: list[Turn], duration_s: float, *, seed: int) -> None:
+    """16-bit mono WAV: harmonic voiced tones per word over a noise floor."""
+    rng = np.random.default_rng(seed + 3)
+    n = int(duration_s * SAMPLE_RATE)
+    audio = rng.normal(0.0, 0.003, n).astype(np.float32)
+    for turn in turns:
+        f0 = _PITCH_HZ[turn.speaker]
+        for word in turn.words:
+            a, b = int(word["start"] * SAMPLE_RATE), int(word["end"] * SAMPLE_RATE)
+            if b <= a:
+                continue
+            t = np.arange(b - a) / SAMPLE_RATE
+            # Per-word pitch contour, a few harmonics and a smooth envelope.
+            pitch = f0 * (1 + 0.08 * rng.standard_normal()) * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))
+            phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+            voiced = sum(np.sin(k * phase) / k for k in (1, 2, 3, 4))
+            env = np.sin(np.pi * t / t[-1]) if len(t) > 1 else np.ones(1)
+            loud = rng.uniform(0.15, 0.35)
+            audio[a:b] += (loud * env * voiced).astype(np.float32)
+    pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+
+
+def _mux(video: Path, audio: Path, out: Path) -> None:
+    """Combine silent video + WAV with the ffmpeg binary bundled by imageio-ffmpeg."""
+    import imageio_ffmpeg
+
+    cmd = [
+        imageio_ffmpeg.get_ffmpeg_exe(),
+        "-y",
+        "-loglevel",
+        "error",
+        "-i",
+        str(video),
+        "-i",
+        str(audio),
+        "-c:v",
+        "copy",
+        "-c:a",
+        "aac",
+        "-shortest",
+        str(out),
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def transcripts(turns: list[Turn]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(utterances_df, whisper_df) shaped like the AssemblyAI / whisper stage outputs."""
+    utterances = pd.DataFrame(
+        [
+            {
+                "text": " ".join(w["text"] for w in turn.words),
+                "start": turn.start,
+                "end": turn.end,
+                "confidence": float(np.mean([w["confidence"] for w in turn.words])),
+                "speaker": turn.speaker,
+                "channel": None,
+                "words": turn.words,
+                "translated_texts": None,
+            }
+            for turn in turns
+        ]
+    )
+    whisper = pd.DataFrame(
+        [
+            {
+                "start": turn.start,
+                "end": turn.end,
+                "text": " ".join(w["text"] for w in turn.words),
+                "words": [{k: w[k] for k in ("start", "end", "text")} for w in turn.words],
+            }
+            for turn in turns
+        ]
+    )
+    return utterances, whisper
+
+
+def synthesize_interview(out_dir: Path, minutes: float, *, seed: int = 0) -> SyntheticInterview:
+    """Write `<out_dir>/interview_<minutes>m.mp4` and return it with matching transcripts."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    duration_s = float(minutes) * 60.0
+    turns = script_turns(duration_s, seed=seed)
+    stem = f"interview_{minutes:g}m"
+    silent, wav = out_dir / f"{stem}.silent.mp4", out_dir / f"{stem}.wav"
+    video = out_dir / f"{stem}.mp4"
+    _write_video(silent, turns, duration_s, seed=seed)
+    _write_audio(wav, turns, duration_s, seed=seed)
+    _mux(silent, wav, video)
+    silent.unlink()
+    wav.unlink()
+    utterances_df, whisper_df = transcripts(turns)
+    _log.info("Synthesized %s (%.0fs, %d turns)", video, duration_s, len(turns))
+    return SyntheticInterview(video, duration_s, turns, utterances_df, whisper_df)
+
+
+__all__ = [
+    "BLENDSHAPES",
+    "INTERVIEWEE",
+    "INTERVIEWER",
+    "SyntheticInterview",
+    "Turn",
+    "face_signals",
+    "script_turns",
+    "synthesize_interview",
+    "synthetic_face_features",
+    "transcripts",
+]
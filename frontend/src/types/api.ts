@@ -14,6 +14,7 @@ export interface Job {
   updated_at: string;
   duration_sec: number | null;
   tier: Tier | null;
+  queue_position: number | null; // 1 = next to start; null once started
   input_tokens: number | null;
   output_tokens: number | null;
   total_tokens: number | null;
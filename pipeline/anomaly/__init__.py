@@ -1,21 +1,44 @@
-from pipeline.anomaly.ranges import get_anomalous_time_ranges
-from pipeline.anomaly.rrcf import adaptive_n_sigma, get_threshold_mad, run_rrcf
+from pipeline.anomaly.ranges import (
+    anomalous_runs,
+    anomalous_time_ranges,
+    get_anomalous_time_ranges,
+    runs_to_lists,
+)
+from pipeline.anomaly.rrcf import (
+    StreamingRRCF,
+    adaptive_n_sigma,
+    get_threshold_mad,
+    run_rrcf,
+    run_rrcf_joint,
+    shingle_features,
+)
 from pipeline.anomaly.smoothing import (
     AUDIO_SPANS,
     VISUAL_SPANS,
     robust_zscore,
+    smooth_and_rz,
     smooth_and_rz_audio,
     smooth_and_rz_visual,
 )
+from pipeline.anomaly.streaming import StreamEvent, StreamingDetector
 
 __all__ = [
     "AUDIO_SPANS",
     "VISUAL_SPANS",
+    "StreamEvent",
+    "StreamingDetector",
+    "StreamingRRCF",
     "adaptive_n_sigma",
+    "anomalous_runs",
+    "anomalous_time_ranges",
     "get_anomalous_time_ranges",
     "get_threshold_mad",
     "robust_zscore",
     "run_rrcf",
+    "run_rrcf_joint",
+    "runs_to_lists",
+    "shingle_features",
+    "smooth_and_rz",
     "smooth_and_rz_audio",
     "smooth_and_rz_visual",
 ]
@@ -1,11 +1,64 @@
 """Continuous anomalous-range grouping.
 
-Re-exports the canonical implementation that lives in `pipeline.anomaly.rrcf`.
-Kept as its own module because (1) the layout in the build brief separates rrcf
-from range-grouping, and (2) range-grouping has no rrcf dependency, so future
-work could swap detectors without touching range logic.
+Re-exports the canonical DataFrame implementation that lives in
+`pipeline.anomaly.rrcf`. Kept as its own module because (1) the layout in the
+build brief separates rrcf from range-grouping, and (2) range-grouping has no
+rrcf dependency, so future work could swap detectors without touching range
+logic.
+
+`anomalous_runs` is the array-native equivalent used by the orchestrator: it
+finds runs with one `np.diff` pass instead of walking a DataFrame row by row,
+under the same `min <= gap <= max` continuity rule.
 """
 
-from pipeline.anomaly.rrcf import get_anomalous_time_ranges
+from __future__ import annotations
+
+import numpy as np
+
+from pipeline.anomaly.rrcf import MAX, MIN, get_anomalous_time_ranges
+
+
+def anomalous_runs(
+    times: np.ndarray, min: float = MIN, max: float = MAX
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find continuous runs in sorted anomalous `times`.
+
+    Two consecutive times belong to the same run when their gap lies within
+    `[min, max]`. Returns `(starts, ends)` — inclusive index arrays into `times`,
+    one entry per run of two or more points. Like `get_anomalous_time_ranges`, a
+    single anomalous time on its own is reported as a one-point run.
+    """
+    times = np.asarray(times, dtype=float)
+    if len(times) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if len(times) == 1:
+        return np.zeros(1, dtype=np.intp), np.zeros(1, dtype=np.intp)
+
+    gaps = np.diff(times)
+    linked = (gaps >= min) & (gaps <= max)
+    edges = np.diff(np.concatenate(([0], linked.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts, ends
+
+
+def runs_to_lists(times: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> list[list[float]]:
+    """Legacy list-of-lists view: every time in each run, as Python floats."""
+    times = np.asarray(times, dtype=float)
+    return [times[s : e + 1].tolist() for s, e in zip(starts, ends, strict=True)]
+
+
+def anomalous_time_ranges(
+    times: np.ndarray, min: float = MIN, max: float = MAX
+) -> list[list[float]]:
+    """Array-native drop-in for `get_anomalous_time_ranges` (same output shape)."""
+    starts, ends = anomalous_runs(times, min=min, max=max)
+    return runs_to_lists(times, starts, ends)
+
 
-__all__ = ["get_anomalous_time_ranges"]
+__all__ = [
+    "anomalous_runs",
+    "anomalous_time_ranges",
+    "get_anomalous_time_ranges",
+    "runs_to_lists",
+]
@@ -1,10 +1,14 @@
+from __future__ import annotations
+
 import logging
-from typing import Literal
+from collections import deque
+from typing import TYPE_CHECKING, Literal
 
 import numpy as np
 import pandas as pd
-from pysad.models import RobustRandomCutForest
-from pysad.utils import ArrayStreamer
+
+if TYPE_CHECKING:
+    from rrcf import rrcf
 
 _log = logging.getLogger(__name__)
 
@@ -102,6 +106,9 @@ def run_rrcf(features: np.ndarray, num_trees: int = 40, tree_size: int = 256, sh
     Returns:
         list: returns list of anomaly which is equal to the length of the feature array.
     """
+    from pysad.models import RobustRandomCutForest
+    from pysad.utils import ArrayStreamer
+
     # initializing the model
     model = RobustRandomCutForest(num_trees=num_trees, tree_size=tree_size, shingle_size=shingle)
 
@@ -119,6 +126,128 @@ def run_rrcf(features: np.ndarray, num_trees: int = 40, tree_size: int = 256, sh
     return anomaly_scores
 
 
+def shingle_features(features: np.ndarray, shingle: int = 1) -> np.ndarray:
+    """Stack each row with its `shingle - 1` predecessors into one vector.
+
+    Row `t` of the output is `[x[t-shingle+1], ..., x[t]]` flattened, so output
+    dimension `q` maps back to input feature `q % n_features`. The first rows
+    are left-padded by repeating `x[0]`, which keeps the output aligned 1:1 with
+    the input timeline.
+
+    Note: pysad's `shingle_size` argument is stored but never applied, which is
+    why shingling is done explicitly here.
+    """
+    features = np.asarray(features, dtype=float)
+    if features.ndim == 1:
+        features = features.reshape(-1, 1)
+    if shingle <= 1 or len(features) == 0:
+        return features
+    n, d = features.shape
+    padded = np.vstack([np.repeat(features[:1], shingle - 1, axis=0), features])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, (shingle, d))
+    return windows.reshape(n, shingle * d)
+
+
+def _codisp_with_dimension(tree: rrcf.RCTree, leaf: rrcf.Leaf) -> tuple[float, int]:
+    """Collusive displacement of `leaf` plus the cut dimension responsible.
+
+    Same walk as `RCTree.codisp`, but also remembers which ancestor's cut
+    produced the maximum displacement — that cut's dimension is the feature
+    that isolated the point.
+    """
+    if leaf is tree.root:
+        return 0.0, -1
+    node = leaf
+    best, best_dim = 0.0, -1
+    for _ in range(node.d):
+        parent = node.u
+        if parent is None:
+            break
+        sibling = parent.r if node is parent.l else parent.l
+        disp = sibling.n / node.n
+        if disp > best:
+            best, best_dim = disp, int(parent.q)
+        node = parent
+    return best, best_dim
+
+
+class StreamingRRCF:
+    """Sliding-window RRCF forest scored one point at a time.
+
+    Each tree keeps at most `tree_size + 1` leaves, so memory is bounded no
+    matter how long the stream runs. Points are shingled exactly like
+    `shingle_features` (the first point is repeated to fill the first shingle).
+    """
+
+    def __init__(
+        self, n_features: int = 1, num_trees: int = 40, tree_size: int = 256, shingle: int = 1
+    ) -> None:
+        self.n_features = n_features
+        self.num_trees = num_trees
+        self.tree_size = tree_size
+        self.shingle = max(1, shingle)
+        from rrcf import rrcf
+
+        self.forest = [rrcf.RCTree() for _ in range(num_trees)]
+        self._buffer: deque[np.ndarray] = deque(maxlen=self.shingle)
+        self._index = 0
+
+    def update(self, x: np.ndarray) -> tuple[float, np.ndarray]:
+        """Insert one sample; return its codisp score and per-feature attribution."""
+        x = np.asarray(x, dtype=float).ravel()
+        if not self._buffer:
+            self._buffer.extend([x] * self.shingle)
+        else:
+            self._buffer.append(x)
+        point = np.concatenate(self._buffer)
+
+        idx = self._index
+        score = 0.0
+        attribution = np.zeros(self.n_features)
+        for tree in self.forest:
+            if len(tree.leaves) > self.tree_size:
+                tree.forget_point(idx - self.tree_size - 1)
+            leaf = tree.insert_point(point, index=idx)
+            codisp, dim = _codisp_with_dimension(tree, leaf)
+            share = codisp / self.num_trees
+            score += share
+            if dim >= 0:
+                attribution[dim % self.n_features] += share
+        self._index += 1
+        return score, attribution
+
+
+def run_rrcf_joint(
+    features: np.ndarray, num_trees: int = 40, tree_size: int = 256, shingle: int = 4
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score multi-feature (optionally shingled) vectors with a single forest.
+
+    Args:
+        features (np.ndarray): shape (num_samples, num_features), one column per feature.
+        num_trees (int, optional): No of trees the model should fit. Defaults to 40.
+        tree_size (int, optional): sliding-window size of each tree. Defaults to 256.
+        shingle (int, optional): consecutive samples stacked per point. Defaults to 4.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: `(scores, attributions)` — scores has shape
+        (num_samples,), attributions (num_samples, num_features). Each tree's
+        codisp is credited to the feature whose cut isolated the point, so every
+        attribution row sums to the joint score.
+    """
+    features = np.asarray(features, dtype=float)
+    if features.ndim == 1:
+        features = features.reshape(-1, 1)
+    n, d = features.shape
+    forest = StreamingRRCF(n_features=d, num_trees=num_trees, tree_size=tree_size, shingle=shingle)
+    scores = np.zeros(n)
+    attributions = np.zeros((n, d))
+    for idx in range(n):
+        scores[idx], attributions[idx] = forest.update(features[idx])
+
+    _log.debug("Joint RRCF scored %d points × %d features (shingle=%d)", n, d, shingle)
+    return scores, attributions
+
+
 # def get_anomalous_time_ranges(anomalies_time: pd.DataFrame, min: int = 0.5, max: int = 2.0) -> list[list[float]]:
 #     """Given the anomalous time values, This function tries to find the continous anomalous range not the sudden spikes.
 
@@ -8,6 +8,7 @@ the median/MAD baseline reflects that person's own speech rather than a mix.
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 
 import numpy as np
 import pandas as pd
@@ -33,53 +34,126 @@ AUDIO_SPANS: dict[str, int] = {
 }
 
 
+def _nanmedian(values: np.ndarray) -> float:
+    """Median of the non-NaN entries via `np.partition` (O(n) selection)."""
+    v = values[~np.isnan(values)]
+    n = len(v)
+    if n == 0:
+        return float("nan")
+    k = n // 2
+    if n % 2:
+        return float(np.partition(v, k)[k])
+    part = np.partition(v, (k - 1, k))
+    return float((part[k - 1] + part[k]) / 2.0)
+
+
+def _median_mad(values: np.ndarray) -> tuple[float, float]:
+    median = _nanmedian(values)
+    return median, _nanmedian(np.abs(values - median))
+
+
+def _robust_z(values: np.ndarray) -> np.ndarray:
+    """Array form of `robust_zscore` (same zero-MAD behaviour)."""
+    median, mad = _median_mad(values)
+    if mad <= 0:
+        return np.zeros(len(values))
+    return (values - median) / (1.4826 * mad)
+
+
+def _ewm(values: np.ndarray, span: int) -> np.ndarray:
+    """`Series.ewm(span, adjust=False).mean()` as a compiled IIR filter.
+
+    `y[t] = a·x[t] + (1-a)·y[t-1]` with `y[0] = x[0]` is exactly what
+    `scipy.signal.lfilter` evaluates in C. pandas' NaN re-weighting is not a
+    plain recurrence, so columns containing NaN fall back to pandas.
+    """
+    if len(values) == 0:
+        return values.copy()
+    if np.isnan(values).any():
+        return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+    from scipy.signal import lfilter
+
+    alpha = 2.0 / (span + 1.0)
+    out, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * values[0]])
+    return out
+
+
 def robust_zscore(series: pd.Series) -> pd.Series:
     """Robust z-score using median and 1.4826·MAD (consistent estimator)."""
-    arr = series.astype(float)
-    median = np.nanmedian(arr)
-    mad = np.nanmedian(np.abs(arr - median))
-    if mad <= 0:
-        return pd.Series(np.zeros(len(arr)), index=series.index)
-    return (arr - median) / (1.4826 * mad)
+    return pd.Series(_robust_z(series.to_numpy(dtype=float)), index=series.index)
+
 
+def smooth_and_rz(
+    df: pd.DataFrame,
+    spans: Mapping[str, int],
+    *,
+    mask: np.ndarray | pd.Series | None = None,
+    inplace: bool = False,
+) -> pd.DataFrame:
+    """Fused EWM smoothing + robust z-score over the `spans` columns.
 
-def smooth_and_rz_visual(df: pd.DataFrame) -> pd.DataFrame:
+    Gathers just the needed columns (restricted to `mask` rows when given) into
+    one contiguous float64 block, smooths each with `_ewm`, z-scores with
+    partition-based median/MAD, and writes each `<feature>_smooth` /
+    `<feature>_smooth_rz` column back exactly once. Rows outside `mask` get NaN.
+
+    With `inplace=False` the result is a shallow copy — new columns are added
+    without duplicating the rest of the (wide) frame.
+    """
+    out = df if inplace else df.copy(deep=False)
+    present = [col for col in spans if col in df.columns]
+    for col in spans:
+        if col not in present:
+            _log.warning("smooth_and_rz: column %s missing", col)
+    if not present:
+        return out
+
+    n = len(df)
+    rows = None if mask is None else np.flatnonzero(np.asarray(mask, dtype=bool))
+    n_sel = n if rows is None else len(rows)
+
+    block = np.empty((n_sel, len(present)), dtype=np.float64, order="F")
+    for j, col in enumerate(present):
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        block[:, j] = values if rows is None else values[rows]
+
+    for j, col in enumerate(present):
+        smooth = _ewm(block[:, j], spans[col])
+        if rows is None:
+            smooth_full, rz_full = smooth, _robust_z(smooth)
+        else:
+            smooth_full = np.full(n, np.nan)
+            smooth_full[rows] = smooth
+            median, mad = _median_mad(smooth)
+            # Zero MAD yields an all-zero column, masked rows included — the
+            # same shape `robust_zscore` gives for the NaN-padded column.
+            rz_full = np.zeros(n) if mad <= 0 else np.full(n, np.nan)
+            if mad > 0:
+                rz_full[rows] = (smooth - median) / (1.4826 * mad)
+        out[f"{col}_smooth"] = smooth_full
+        out[f"{col}_smooth_rz"] = rz_full
+    return out
+
+
+def smooth_and_rz_visual(df: pd.DataFrame, *, inplace: bool = False) -> pd.DataFrame:
     """Add `<feature>_smooth` and `<feature>_smooth_rz` columns for the four
     visual features. Operates on the entire dataframe.
     """
-    df = df.copy()
-    for col, span in VISUAL_SPANS.items():
-        if col not in df.columns:
-            _log.warning("smooth_and_rz_visual: column %s missing", col)
-            continue
-        smooth_col = f"{col}_smooth"
-        df[smooth_col] = df[col].ewm(span=span, adjust=False).mean()
-        df[f"{smooth_col}_rz"] = robust_zscore(df[smooth_col])
-    return df
-
-
-def smooth_and_rz_audio(df: pd.DataFrame, speaker: str) -> pd.DataFrame:
+    return smooth_and_rz(df, VISUAL_SPANS, inplace=inplace)
+
+
+def smooth_and_rz_audio(df: pd.DataFrame, speaker: str, *, inplace: bool = False) -> pd.DataFrame:
     """Add `<feature>_smooth` and `<feature>_smooth_rz` for audio features,
     restricted to rows where `speaker == speaker`.
     """
-    df = df.copy()
-    mask = df["speaker"] == speaker
-    for col, span in AUDIO_SPANS.items():
-        if col not in df.columns:
-            _log.warning("smooth_and_rz_audio: column %s missing", col)
-            continue
-        smooth_col = f"{col}_smooth"
-        df[smooth_col] = np.nan
-        temp = df.loc[mask, col].ewm(span=span, adjust=False).mean()
-        df.loc[temp.index, smooth_col] = temp.values
-        df[f"{smooth_col}_rz"] = robust_zscore(df[smooth_col])
-    return df
+    return smooth_and_rz(df, AUDIO_SPANS, mask=(df["speaker"] == speaker), inplace=inplace)
 
 
 __all__ = [
     "AUDIO_SPANS",
     "VISUAL_SPANS",
     "robust_zscore",
+    "smooth_and_rz",
     "smooth_and_rz_audio",
     "smooth_and_rz_visual",
 ]
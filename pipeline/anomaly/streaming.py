@@ -0,0 +1,272 @@
+"""Incremental anomaly detection for long or live-streamed interviews.
+
+The batch stack (`smoothing.py` → robust z-score → RRCF → MAD threshold →
+range grouping) needs the whole recording. `StreamingDetector` runs the same
+chain one window at a time with O(1) state per feature:
+
+- EWM smoothing keeps only the previous smoothed value (`adjust=False`
+  recurrence, identical to the pandas call in `smoothing.py`).
+- Median and MAD are tracked with the P² quantile estimator (five markers),
+  so the robust z-score baseline adapts without storing history.
+- RRCF uses a sliding-window forest (`StreamingRRCF`) bounded by `tree_size`.
+- The score threshold is `median + n_sigma · 1.4826 · MAD` over the running
+  score distribution — the online analogue of `get_threshold_mad`.
+
+Point events are emitted on the update that produced them. Range events are
+emitted as soon as a later window proves the run is over (gap > `max`) or on
+`flush()`, so their latency is bounded by `max` plus one window.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Literal
+
+import numpy as np
+
+from pipeline.anomaly.rrcf import MAX, MIN, StreamingRRCF
+from pipeline.anomaly.smoothing import AUDIO_SPANS, VISUAL_SPANS
+
+_log = logging.getLogger(__name__)
+
+
+class P2Quantile:
+    """P² single-quantile estimator (Jain & Chlamtac, 1985). O(1) memory."""
+
+    def __init__(self, p: float = 0.5) -> None:
+        self.p = p
+        self.count = 0
+        self._q: list[float] = []
+        self._n = [0.0, 1.0, 2.0, 3.0, 4.0]
+        self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float) -> None:
+        self.count += 1
+        q = self._q
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+
+        n = self._n
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        for i in (1, 2, 3):
+            d = self._np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    q[i] = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                n[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self._q, self._n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> float:
+        if not self._q:
+            return math.nan
+        if len(self._q) < 5:
+            return float(np.quantile(self._q, self.p))
+        return self._q[2]
+
+
+class RunningRobustStats:
+    """Running median + MAD (both via P²). MAD is tracked against the current
+    median estimate, which converges as the median settles."""
+
+    def __init__(self) -> None:
+        self._median = P2Quantile(0.5)
+        self._mad = P2Quantile(0.5)
+
+    @property
+    def count(self) -> int:
+        return self._median.count
+
+    def update(self, x: float) -> None:
+        self._median.update(x)
+        self._mad.update(abs(x - self._median.value))
+
+    @property
+    def median(self) -> float:
+        return self._median.value
+
+    @property
+    def mad(self) -> float:
+        return self._mad.value
+
+    def zscore(self, x: float) -> float:
+        """Robust z-score against the running baseline (0 while MAD is 0)."""
+        mad = self.mad
+        if not mad or mad <= 0 or math.isnan(mad):
+            return 0.0
+        return (x - self.median) / (1.4826 * mad)
+
+    def threshold(self, n_sigma: float) -> float:
+        return self.median + n_sigma * 1.4826 * self.mad
+
+
+@dataclass
+class StreamEvent:
+    """One anomaly emitted by `StreamingDetector`.
+
+    `kind="point"` marks a single anomalous window (`start == end`);
+    `kind="range"` marks a closed continuous run, matching one entry of the
+    batch `c_anomalies[col]` lists.
+    """
+
+    feature: str
+    kind: Literal["point", "range"]
+    start: float
+    end: float
+    score: float
+    rz_score: float
+    times: list[float] = field(default_factory=list)
+
+
+@dataclass
+class _FeatureState:
+    alpha: float
+    forest: StreamingRRCF
+    smooth: float | None = None
+    baseline: RunningRobustStats = field(default_factory=RunningRobustStats)
+    scores: RunningRobustStats = field(default_factory=RunningRobustStats)
+    run: list[float] = field(default_factory=list)
+    run_peak: float = 0.0
+    run_peak_rz: float = 0.0
+
+
+class StreamingDetector:
+    """Per-feature online EWM → robust z → RRCF → MAD-threshold detector.
+
+    Feed one analysis window at a time with `update(time, values)`; missing or
+    NaN values (e.g. audio features outside the interviewee's speech) leave
+    that feature's state untouched, mirroring the speaker mask in
+    `smooth_and_rz_audio`. Call `flush()` at end of stream to close open runs.
+    """
+
+    def __init__(
+        self,
+        spans: Mapping[str, int] | None = None,
+        *,
+        num_trees: int = 40,
+        tree_size: int = 256,
+        shingle: int = 1,
+        n_sigma: float = 3.0,
+        warmup: int = 32,
+        min: float = MIN,
+        max: float = MAX,
+    ) -> None:
+        spans = dict(spans) if spans is not None else {**VISUAL_SPANS, **AUDIO_SPANS}
+        self.n_sigma = n_sigma
+        self.warmup = warmup
+        self.min = min
+        self.max = max
+        self._features = {
+            name: _FeatureState(
+                alpha=2.0 / (span + 1.0),
+                forest=StreamingRRCF(
+                    n_features=1, num_trees=num_trees, tree_size=tree_size, shingle=shingle
+                ),
+            )
+            for name, span in spans.items()
+        }
+
+    @property
+    def features(self) -> list[str]:
+        return list(self._features)
+
+    def update(self, time: float, values: Mapping[str, float | None]) -> list[StreamEvent]:
+        """Ingest one window; return any events it completes."""
+        events: list[StreamEvent] = []
+        for name, state in self._features.items():
+            # A run is over once the stream has moved past its continuity window.
+            if state.run and time - state.run[-1] > self.max:
+                events.extend(self._close_run(name, state))
+
+            raw = values.get(name)
+            if raw is None or (isinstance(raw, float) and math.isnan(raw)):
+                continue
+            x = float(raw)
+
+            if state.smooth is None:
+                state.smooth = x
+            else:
+                state.smooth = state.alpha * x + (1.0 - state.alpha) * state.smooth
+            state.baseline.update(state.smooth)
+            rz = state.baseline.zscore(state.smooth)
+
+            score, _ = state.forest.update(np.array([rz]))
+            warmed_up = state.scores.count >= self.warmup
+            threshold = state.scores.threshold(self.n_sigma) if warmed_up else math.inf
+            state.scores.update(score)
+            if score <= threshold:
+                continue
+
+            events.append(
+                StreamEvent(
+                    feature=name,
+                    kind="point",
+                    start=float(time),
+                    end=float(time),
+                    score=float(score),
+                    rz_score=float(rz),
+                    times=[float(time)],
+                )
+            )
+            if state.run and not (self.min <= time - state.run[-1] <= self.max):
+                events.extend(self._close_run(name, state))
+            state.run.append(float(time))
+            if score > state.run_peak:
+                state.run_peak, state.run_peak_rz = float(score), float(rz)
+        return events
+
+    def flush(self) -> list[StreamEvent]:
+        """Close every open run (end of stream)."""
+        events: list[StreamEvent] = []
+        for name, state in self._features.items():
+            events.extend(self._close_run(name, state))
+        return events
+
+    def _close_run(self, name: str, state: _FeatureState) -> list[StreamEvent]:
+        run, peak, peak_rz = state.run, state.run_peak, state.run_peak_rz
+        state.run, state.run_peak, state.run_peak_rz = [], 0.0, 0.0
+        if len(run) < 2:
+            return []
+        return [
+            StreamEvent(
+                feature=name,
+                kind="range",
+                start=run[0],
+                end=run[-1],
+                score=peak,
+                rz_score=peak_rz,
+                times=run,
+            )
+        ]
+
+
+__all__ = ["P2Quantile", "RunningRobustStats", "StreamEvent", "StreamingDetector"]
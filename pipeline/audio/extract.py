@@ -11,8 +11,6 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-from moviepy import VideoFileClip
-
 _log = logging.getLogger(__name__)
 
 
@@ -44,6 +42,8 @@ def extract_audio(
         _log.info("Audio already exists, reusing: %s", output_path)
         return output_path
 
+    from moviepy import VideoFileClip
+
     try:
         video_clip = VideoFileClip(str(video_path))
         if video_clip.audio is None:
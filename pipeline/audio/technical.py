@@ -7,7 +7,6 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-import librosa
 import numpy as np
 import pandas as pd
 
@@ -30,6 +29,8 @@ def analyze_audio_layers(
         _log.error("Audio file not found: %s", audio_path)
         return None
 
+    import librosa
+
     y, sr = librosa.load(str(audio_path), sr=None)
     total_duration = librosa.get_duration(y=y, sr=sr)
 
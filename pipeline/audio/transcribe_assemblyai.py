@@ -10,13 +10,14 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-import assemblyai as aai
 import pandas as pd
 
 _log = logging.getLogger(__name__)
 
 
 def get_utterances_data(api_key: str, audio_path: str | Path) -> pd.DataFrame:
+    import assemblyai as aai
+
     aai.settings.api_key = api_key
 
     _log.info("Uploading audio to AssemblyAI: %s", audio_path)
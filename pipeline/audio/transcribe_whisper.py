@@ -12,10 +12,8 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-import librosa
 import numpy as np
 import pandas as pd
-import whisper_timestamped as wp
 
 _log = logging.getLogger(__name__)
 
@@ -28,6 +26,9 @@ def get_whisper_data(
     lang: str | None = None,
     device: str = "cpu",
 ) -> pd.DataFrame:
+    import librosa
+    import whisper_timestamped as wp
+
     audio_path = str(audio_path)
     _log.info("Loading whisper model: %s on %s", model_size, device)
     model = wp.load_model(model_size, device=device)
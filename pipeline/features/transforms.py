@@ -1,7 +1,6 @@
 import math
 from typing import Literal
 
-import librosa
 import numpy as np
 import pandas as pd
 
@@ -262,6 +261,8 @@ def compute_speaker_median_pitch(
     fmax: float = 600.0,
 ):
     # loading the audio
+    import librosa
+
     y, sr = librosa.load(audio_path, sr=sr)
 
     # Extracting pitch
@@ -0,0 +1,83 @@
+"""Stage-level checkpoint manifest for resumable pipeline runs.
+
+Each completed stage records a fingerprint of its inputs + config, plus a
+stamp (size, mtime) of every output it wrote, in `<job_dir>/manifest.json`.
+On resume a stage is skipped only when its fingerprint still matches and
+its outputs are untouched. Downstream stages fold the upstream output
+stamps into their own fingerprint, so re-running any stage invalidates
+everything after it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+_log = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def path_stamp(path: Path) -> dict[str, int] | None:
+    """Cheap identity of a file or directory: sizes + mtimes, no content hash.
+
+    Directories are stamped by entry count and total size. Missing paths
+    return None.
+    """
+    if path.is_dir():
+        entries = [p.stat() for p in path.iterdir() if p.is_file()]
+        return {"files": len(entries), "size": sum(st.st_size for st in entries)}
+    if path.is_file():
+        st = path.stat()
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    return None
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable sha256 over JSON-serializable parts (paths via `str`)."""
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class StageManifest:
+    """Read/write view over one job's `manifest.json`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._stages: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+            except (OSError, json.JSONDecodeError):
+                _log.warning("Ignoring unreadable checkpoint manifest: %s", self.path)
+                data = {}
+            if data.get("version") == MANIFEST_VERSION:
+                self._stages = data.get("stages", {})
+
+    def is_fresh(self, stage: str, fp: str) -> bool:
+        """True when `stage` completed with fingerprint `fp` and its outputs are intact."""
+        entry = self._stages.get(stage)
+        if entry is None or entry.get("fingerprint") != fp:
+            return False
+        for output, stamp in entry.get("outputs", {}).items():
+            if path_stamp(Path(output)) != stamp:
+                _log.info("Checkpoint %s: output changed or missing: %s", stage, output)
+                return False
+        return True
+
+    def record(self, stage: str, fp: str, outputs: list[Path]) -> None:
+        """Mark `stage` complete. Written atomically so a crash never leaves a torn file."""
+        self._stages[stage] = {
+            "fingerprint": fp,
+            "outputs": {str(p): path_stamp(p) for p in outputs},
+        }
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "stages": self._stages}, indent=2))
+        os.replace(tmp, self.path)
+
+
+__all__ = ["MANIFEST_VERSION", "StageManifest", "fingerprint", "path_stamp"]
@@ -0,0 +1,72 @@
+"""Uncompressed Arrow IPC (Feather v2) storage for pipeline intermediates.
+
+Intermediates are written and re-read inside one job, so paying parquet's
+encode + compression cost on every stage boundary buys nothing. IPC files
+share the parquet path's column encoding and `.schema.json` sidecar, and are
+opened memory-mapped: null-free numeric columns reach pandas without a copy.
+
+`save_frame` / `load_frame` dispatch on the file suffix so callers holding a
+`PipelinePaths` don't need to know which format the job was configured with.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from pipeline.io.parquet import (
+    _decode_table,
+    _encode_table,
+    _write_schema_sidecar,
+    load_df_parquet_safe,
+    save_df_parquet_safe,
+)
+
+_log = logging.getLogger(__name__)
+
+IPC_SUFFIX = ".arrow"
+
+
+def save_df_ipc_safe(df: pd.DataFrame, path: str | Path) -> None:
+    """Write `df` as an uncompressed Arrow IPC file (+ schema sidecar)."""
+    path = str(path)
+    table, schema = _encode_table(df)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    schema_path = _write_schema_sidecar(path, schema)
+    _log.info("Saved arrow ipc: %s (+ %s)", path, schema_path)
+
+
+def load_df_ipc_safe(path: str | Path, *, columns: list[str] | None = None) -> pd.DataFrame:
+    """Memory-map an IPC file written by `save_df_ipc_safe` and decode it.
+
+    Numeric columns may come back as read-only views onto the mapped file;
+    assign a new column rather than writing into one in place.
+    """
+    path = str(path)
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(list(dict.fromkeys(columns)))
+    return _decode_table(table, path, split_blocks=True)
+
+
+def save_frame(df: pd.DataFrame, path: str | Path) -> None:
+    """Save via IPC for `.arrow` paths, parquet otherwise."""
+    if Path(path).suffix == IPC_SUFFIX:
+        save_df_ipc_safe(df, path)
+    else:
+        save_df_parquet_safe(df, path)
+
+
+def load_frame(path: str | Path, *, columns: list[str] | None = None) -> pd.DataFrame:
+    """Load a frame written by `save_frame`, picking the reader from the suffix."""
+    if Path(path).suffix == IPC_SUFFIX:
+        return load_df_ipc_safe(path, columns=columns)
+    return load_df_parquet_safe(path, columns=columns)
+
+
+__all__ = ["IPC_SUFFIX", "load_df_ipc_safe", "load_frame", "save_df_ipc_safe", "save_frame"]
@@ -4,6 +4,8 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 _log = logging.getLogger(__name__)
 
@@ -41,29 +43,148 @@ def _jsonify_cell(x):
         return json.dumps(str(x))
 
 
-def save_df_parquet_safe(df: pd.DataFrame, path: str | Path) -> None:
-    """Save a DataFrame to Parquet while preserving object-typed columns.
+def _is_missing(x) -> bool:
+    """Cheap top-level NA test for object cells (None / NaN / pd.NA / NaT)."""
+    return x is None or x is pd.NA or x is pd.NaT or (isinstance(x, float) and x != x)
+
+
+def _first_present(values: list):
+    return next((v for v in values if v is not None), None)
 
-    Object columns are JSON-encoded and a sidecar `<path>.schema.json` records
-    which columns to JSON-decode on load. Pydantic `.model_dump()` dicts and
-    nested lists round-trip cleanly through this pair.
+
+def _ordered_type(arrow_type: pa.DataType, sample) -> pa.DataType:
+    """Re-order inferred struct fields to match `sample`'s key order.
+
+    pyarrow sorts struct fields alphabetically on inference; keeping the
+    original `model_dump()` order means decoded dicts (and anything that
+    serialises them, e.g. agent prompts) are unchanged by the Arrow path.
     """
-    path = str(path)
-    df = df.copy()
+    if pa.types.is_struct(arrow_type) and isinstance(sample, dict):
+        by_name = {f.name: f for f in arrow_type}
+        if set(by_name) != set(sample):
+            return arrow_type
+        return pa.struct(
+            [pa.field(name, _ordered_type(by_name[name].type, sample[name])) for name in sample]
+        )
+    if pa.types.is_list(arrow_type) and isinstance(sample, list):
+        inner = _ordered_type(arrow_type.value_type, _first_present(sample))
+        return pa.list_(inner)
+    return arrow_type
+
+
+def _arrow_to_py(arr: pa.Array) -> list:
+    """Arrow → Python objects without numpy arrays leaking into nested values.
+
+    Structs are rebuilt column-wise from their children, and null-free numeric
+    or boolean children go through numpy's bulk `tolist()`, which is far
+    cheaper than per-cell `json.loads` or Arrow's per-scalar `to_pylist()`.
+    """
+    arrow_type = arr.type
+    if pa.types.is_struct(arrow_type):
+        names = [f.name for f in arrow_type]
+        children = [_arrow_to_py(child) for child in arr.flatten()]
+        rows: list = [dict(zip(names, vals, strict=True)) for vals in zip(*children, strict=True)]
+        if arr.null_count:
+            nulls = arr.is_null().to_numpy(zero_copy_only=False)
+            rows = [None if null else row for row, null in zip(rows, nulls, strict=True)]
+        return rows
+    if arr.null_count == 0 and (
+        pa.types.is_floating(arrow_type)
+        or pa.types.is_integer(arrow_type)
+        or pa.types.is_boolean(arrow_type)
+    ):
+        return arr.to_numpy(zero_copy_only=False).tolist()
+    return arr.to_pylist()
+
 
+def _to_arrow_column(series: pd.Series) -> pa.Array | None:
+    """Native Arrow encoding for an object column, or None to use JSON instead.
+
+    The type is inferred from the values (nested dicts → struct, lists →
+    list). A column only takes the Arrow path when decoding it reproduces
+    exactly what the JSON round-trip would — heterogeneous dict keys, int/float
+    mixes, numpy scalars or non-serialisable objects all fall back to JSON.
+    """
+    values = [None if _is_missing(v) else v for v in series.tolist()]
+    try:
+        expected = json.dumps(values)
+        inferred = pa.array(values)
+        arr = pa.array(values, type=_ordered_type(inferred.type, _first_present(values)))
+    except (pa.ArrowException, TypeError, ValueError, OverflowError):
+        return None
+    if pa.types.is_null(arr.type):
+        return None
+    try:
+        if json.dumps(_arrow_to_py(arr)) != expected:
+            return None
+    except (TypeError, ValueError):
+        return None
+    return arr
+
+
+def _encode_table(df: pd.DataFrame) -> tuple[pa.Table, dict[str, str]]:
+    """DataFrame → Arrow table plus the per-column encoding map for the sidecar."""
+    df = df.copy()
     schema: dict[str, str] = {}
+    arrow_columns: dict[str, pa.Array] = {}
     for col in df.columns:
         if df[col].dtype == "object":
+            arr = _to_arrow_column(df[col])
+            if arr is not None:
+                arrow_columns[col] = arr
+                schema[col] = "arrow"
+                continue
             df[col] = df[col].apply(_jsonify_cell)
             df[col] = df[col].astype("string")
             schema[col] = "json"
         else:
             schema[col] = "normal"
 
-    df.to_parquet(path=path, engine="pyarrow")
+    table = pa.Table.from_pandas(df.drop(columns=list(arrow_columns)))
+    for col, arr in arrow_columns.items():
+        table = table.append_column(col, arr)
+    ordered = [str(c) for c in df.columns]
+    table = table.select(ordered + [n for n in table.column_names if n not in ordered])
+    if df.attrs:
+        # Same key pandas' own `to_parquet` uses, so `pd.read_parquet` restores attrs too.
+        metadata = {**(table.schema.metadata or {}), b"PANDAS_ATTRS": json.dumps(df.attrs)}
+        table = table.replace_schema_metadata(metadata)
+    return table, schema
+
+
+def _write_schema_sidecar(path: str, schema: dict[str, str]) -> str:
     schema_path = path + ".schema.json"
     with open(schema_path, "w") as f:
         json.dump(schema, f)
+    return schema_path
+
+
+def save_df_parquet_safe(
+    df: pd.DataFrame,
+    path: str | Path,
+    *,
+    sort_by: str | None = None,
+    row_group_size: int | None = None,
+) -> None:
+    """Save a DataFrame to Parquet while preserving object-typed columns.
+
+    Object columns holding consistently-shaped values (Pydantic
+    `.model_dump()` dicts, nested lists, strings) are stored as native Arrow
+    struct/list/string columns. Anything heterogeneous is JSON-encoded as
+    before. A sidecar `<path>.schema.json` records each column's encoding
+    (`normal` / `arrow` / `json`) so `load_df_parquet_safe` knows how to
+    restore it.
+
+    `sort_by` + `row_group_size` lay the file out for range reads: rows are
+    sorted on that column, so each row group's min/max statistics cover a
+    disjoint slice and `load_df_parquet_safe(time_range=...)` can skip the rest.
+    """
+    path = str(path)
+    if sort_by:
+        df = df.sort_values(sort_by, kind="stable", ignore_index=True)
+    table, schema = _encode_table(df)
+    pq.write_table(table, path, row_group_size=row_group_size)
+    schema_path = _write_schema_sidecar(path, schema)
 
     _log.info("Saved parquet: %s (+ %s)", path, schema_path)
 
@@ -86,21 +207,35 @@ def _try_json_decode_column(series: pd.Series) -> pd.Series:
     return decoded
 
 
-def load_df_parquet_safe(path: str | Path) -> pd.DataFrame:
-    """Load a parquet written by `save_df_parquet_safe`, restoring object columns.
+def _is_nested(arrow_type: pa.DataType) -> bool:
+    return pa.types.is_struct(arrow_type) or pa.types.is_list(arrow_type)
 
-    The sidecar `<path>.schema.json` is the authoritative source of which
-    columns were JSON-encoded. If the sidecar is missing (e.g. test uploads
-    of just the parquet), object/string columns whose values are valid JSON
-    are auto-decoded as a fallback.
-    """
-    path = str(path)
-    df = pd.read_parquet(path=path, engine="pyarrow")
 
+def _decode_table(table: pa.Table, path: str, *, split_blocks: bool = False) -> pd.DataFrame:
+    """Arrow table → DataFrame, restoring object columns per the `path` sidecar.
+
+    `split_blocks=True` lets pyarrow hand null-free numeric columns to pandas
+    without copying (used for memory-mapped IPC reads).
+    """
     schema_path = path + ".schema.json"
+    schema: dict[str, str] | None = None
     if Path(schema_path).exists():
         with open(schema_path) as f:
-            schema = json.load(f)
+            schema = {c: t for c, t in json.load(f).items() if c in table.schema.names}
+        arrow_cols = [c for c, t in schema.items() if t == "arrow"]
+    else:
+        arrow_cols = [f.name for f in table.schema if _is_nested(f.type)]
+
+    df = table.drop_columns(arrow_cols).to_pandas(split_blocks=split_blocks)
+    # Insert (rather than append + reorder) so the other columns aren't copied.
+    positions = {name: i for i, name in enumerate(table.column_names)}
+    for col in sorted(arrow_cols, key=positions.__getitem__):
+        decoded = _arrow_to_py(table.column(col).combine_chunks())
+        df.insert(positions[col], col, pd.Series(decoded, index=df.index, dtype=object))
+    if table.schema.metadata and b"PANDAS_ATTRS" in table.schema.metadata:
+        df.attrs = json.loads(table.schema.metadata[b"PANDAS_ATTRS"])
+
+    if schema is not None:
         for col, col_type in schema.items():
             if col_type == "json":
                 df[col] = df[col].apply(lambda x: json.loads(x) if pd.notna(x) else None)
@@ -108,6 +243,38 @@ def load_df_parquet_safe(path: str | Path) -> pd.DataFrame:
 
     _log.debug("No sidecar at %s — falling back to JSON auto-decode", schema_path)
     for col in df.columns:
+        if col in arrow_cols:
+            continue
         if df[col].dtype == "object" or str(df[col].dtype) == "string":
             df[col] = _try_json_decode_column(df[col])
     return df
+
+
+def load_df_parquet_safe(
+    path: str | Path,
+    *,
+    columns: list[str] | None = None,
+    time_range: tuple[float, float] | None = None,
+    time_column: str = "Time",
+) -> pd.DataFrame:
+    """Load a parquet written by `save_df_parquet_safe`, restoring object columns.
+
+    The sidecar `<path>.schema.json` is the authoritative source of which
+    columns were Arrow- or JSON-encoded. If the sidecar is missing (e.g. test
+    uploads of just the parquet), nested Arrow columns are still decoded and
+    object/string columns whose values are valid JSON are auto-decoded as a
+    fallback.
+
+    `columns` restricts the read (and decode) to those columns; the index is
+    then a fresh RangeIndex. `time_range=(start, end)` keeps rows with
+    `start <= time_column <= end`. Both are pushed down into pyarrow, so only
+    matching row groups are read from files written with `sort_by`.
+    """
+    path = str(path)
+    filters = None
+    if time_range is not None:
+        start, end = time_range
+        filters = [(time_column, ">=", start), (time_column, "<=", end)]
+    read_cols = list(dict.fromkeys(columns)) if columns is not None else None
+    table = pq.read_table(path, columns=read_cols, filters=filters)
+    return _decode_table(table, path)
@@ -3,12 +3,19 @@
 Single source of truth for where intermediate and final files land.
 The orchestrator (M2) builds a `PipelinePaths` for each job and reads/writes
 through it instead of hard-coding paths.
+
+`intermediate_format="arrow"` switches every intermediate frame (everything
+except `master.parquet`, the archival output) to uncompressed, memory-mapped
+Arrow IPC; read and write them through `pipeline.io.ipc.load_frame` /
+`save_frame`, which dispatch on the suffix. The `*_parquet` property names
+are kept either way so callers don't change.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Literal
 
 
 @dataclass(frozen=True)
@@ -17,6 +24,11 @@ class PipelinePaths:
 
     root: Path
     job_id: str
+    intermediate_format: Literal["parquet", "arrow"] = "parquet"
+
+    def _intermediate(self, stem: str) -> Path:
+        suffix = ".arrow" if self.intermediate_format == "arrow" else ".parquet"
+        return self.job_dir / f"{stem}{suffix}"
 
     @property
     def job_dir(self) -> Path:
@@ -32,28 +44,44 @@ class PipelinePaths:
 
     @property
     def face_features_parquet(self) -> Path:
-        return self.job_dir / "face_features.parquet"
+        return self._intermediate("face_features")
 
     @property
     def audio_features_parquet(self) -> Path:
-        return self.job_dir / "audio_features.parquet"
+        return self._intermediate("audio_features")
 
     @property
     def utterances_parquet(self) -> Path:
-        return self.job_dir / "utterances.parquet"
+        return self._intermediate("utterances")
 
     @property
     def whisper_parquet(self) -> Path:
-        return self.job_dir / "whisper.parquet"
+        return self._intermediate("whisper")
 
     @property
     def merged_parquet(self) -> Path:
-        return self.job_dir / "merged.parquet"
+        return self._intermediate("merged")
+
+    @property
+    def enriched_parquet(self) -> Path:
+        return self._intermediate("enriched")
+
+    @property
+    def anomaly_scores_parquet(self) -> Path:
+        return self._intermediate("anomaly_scores")
 
     @property
     def master_parquet(self) -> Path:
         return self.job_dir / "master.parquet"
 
+    @property
+    def manifest_json(self) -> Path:
+        return self.job_dir / "manifest.json"
+
+    @property
+    def metrics_json(self) -> Path:
+        return self.job_dir / "metrics.json"
+
     @property
     def log_file(self) -> Path:
         return self.job_dir / "job.log"
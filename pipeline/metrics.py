@@ -0,0 +1,194 @@
+"""Per-stage resource metrics for pipeline runs.
+
+`StageRecorder` brackets each orchestrator stage and records wall time, CPU
+time (this process plus reaped children such as ffmpeg), peak RSS and I/O
+bytes. Metrics are rewritten to `metrics.json` whenever a stage closes, so a
+crashed run still leaves the numbers for the stages that finished. Used as a
+context manager, the recorder also closes a stage that raises (flagged
+`failed`), stopping its profiler.
+
+One stage can optionally be profiled with cProfile (`.prof`, open with
+`snakeviz` / `pstats`) or pyinstrument (`.html`, optional dependency).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Literal, Self
+
+_log = logging.getLogger(__name__)
+
+Profiler = Literal["cprofile", "pyinstrument"]
+
+
+@dataclass
+class StageMetrics:
+    """Resource usage of one pipeline stage."""
+
+    stage: str
+    wall_s: float
+    cpu_s: float
+    peak_rss_mb: float | None
+    io_read_bytes: int | None
+    io_write_bytes: int | None
+    skipped: bool = False
+    failed: bool = False
+
+
+def _cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _peak_rss_mb() -> float | None:
+    """High-water RSS of this process so far (monotonic over the run)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _io_bytes() -> tuple[int, int] | None:
+    """Bytes read/written by this process (`/proc/self/io`; Linux only)."""
+    try:
+        fields = dict(
+            line.split(": ", 1) for line in Path("/proc/self/io").read_text().splitlines()
+        )
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class StageRecorder:
+    """Open/close stages in sequence; `start()` closes the previous one."""
+
+    def __init__(
+        self,
+        metrics_path: Path | None = None,
+        *,
+        profile_stage: str | None = None,
+        profiler: Profiler = "cprofile",
+    ) -> None:
+        self.metrics_path = metrics_path
+        self.profile_stage = profile_stage
+        self.profiler = profiler
+        self.metrics: list[StageMetrics] = []
+        self._current: str | None = None
+        self._skipped = False
+        self._t0 = 0.0
+        self._cpu0 = 0.0
+        self._io0: tuple[int, int] | None = None
+        self._profile: Any = None
+
+    def start(self, stage: str) -> None:
+        self.finish()
+        self._current = stage
+        self._skipped = False
+        if stage == self.profile_stage:
+            self._start_profile()
+        self._io0 = _io_bytes()
+        self._cpu0 = _cpu_seconds()
+        self._t0 = time.perf_counter()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.finish(failed=exc_type is not None)
+
+    def mark_skipped(self) -> None:
+        """Flag the open stage as restored from a checkpoint rather than run."""
+        self._skipped = True
+
+    def finish(self, *, failed: bool = False) -> None:
+        """Close the open stage (if any) and persist `metrics.json`."""
+        if self._current is None:
+            return
+        wall = time.perf_counter() - self._t0
+        cpu = _cpu_seconds() - self._cpu0
+        io1 = _io_bytes()
+        read = write = None
+        if self._io0 is not None and io1 is not None:
+            read, write = io1[0] - self._io0[0], io1[1] - self._io0[1]
+        if self._profile is not None:
+            self._stop_profile(self._current)
+
+        entry = StageMetrics(
+            stage=self._current,
+            wall_s=round(wall, 4),
+            cpu_s=round(cpu, 4),
+            peak_rss_mb=_peak_rss_mb(),
+            io_read_bytes=read,
+            io_write_bytes=write,
+            skipped=self._skipped,
+            failed=failed,
+        )
+        self.metrics.append(entry)
+        self._current = None
+        _log.info(
+            "[stage] %s: wall %.2fs, cpu %.2fs, peak rss %s MB%s",
+            entry.stage,
+            entry.wall_s,
+            entry.cpu_s,
+            f"{entry.peak_rss_mb:.0f}" if entry.peak_rss_mb is not None else "?",
+            " (failed)" if entry.failed else " (resumed)" if entry.skipped else "",
+        )
+        self._write()
+
+    def _write(self) -> None:
+        if self.metrics_path is None:
+            return
+        payload = {
+            "stages": [asdict(m) for m in self.metrics],
+            "total_wall_s": round(sum(m.wall_s for m in self.metrics), 4),
+            "total_cpu_s": round(sum(m.cpu_s for m in self.metrics), 4),
+        }
+        self.metrics_path.write_text(json.dumps(payload, indent=2))
+
+    def _start_profile(self) -> None:
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler as PyinstrumentProfiler
+            except ImportError as exc:
+                raise RuntimeError(
+                    "pyinstrument is not installed — `pip install pyinstrument` "
+                    "or profile with cprofile."
+                ) from exc
+            self._profile = PyinstrumentProfiler()
+            self._profile.start()
+        else:
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def _stop_profile(self, stage: str) -> None:
+        out_dir = self.metrics_path.parent if self.metrics_path is not None else Path.cwd()
+        if self.profiler == "pyinstrument":
+            self._profile.stop()
+            out = out_dir / f"profile_{stage}.html"
+            out.write_text(self._profile.output_html())
+        else:
+            self._profile.disable()
+            out = out_dir / f"profile_{stage}.prof"
+            self._profile.dump_stats(str(out))
+        self._profile = None
+        _log.info("Profile for stage %s written to %s", stage, out)
+
+
+__all__ = ["Profiler", "StageMetrics", "StageRecorder"]
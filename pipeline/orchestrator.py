@@ -7,6 +7,9 @@ Usage (CLI):
     python -m pipeline.orchestrator <video_path> [--job-id ID] [--speaker B]
         [--data-root data] [--face-model models/face_landmarker.task]
         [--no-transcribe-assemblyai] [--no-transcribe-whisper]
+        [--rrcf-mode per_feature|joint] [--rrcf-shingle 4] [--resume]
+        [--intermediate-format parquet|arrow]
+        [--profile-stage STAGE] [--profiler cprofile|pyinstrument]
 """
 
 from __future__ import annotations
@@ -14,11 +17,13 @@ from __future__ import annotations
 import argparse
 import logging
 import os
+import shutil
 import sys
 import uuid
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Literal
 
 import numpy as np
 import pandas as pd
@@ -26,21 +31,26 @@ import pandas as pd
 from pipeline._logging import configure_logging
 from pipeline.anomaly import (
     adaptive_n_sigma,
-    get_anomalous_time_ranges,
+    anomalous_time_ranges,
     get_threshold_mad,
     run_rrcf,
+    run_rrcf_joint,
     smooth_and_rz_audio,
     smooth_and_rz_visual,
 )
+from pipeline.anomaly.rrcf import MAX, MIN
 from pipeline.audio.extract import extract_audio
 from pipeline.audio.technical import analyze_audio_layers
 from pipeline.audio.transcribe_assemblyai import get_utterances_data
 from pipeline.audio.transcribe_whisper import get_whisper_data
 from pipeline.features.linguistic import detect_interviewee, get_speaker_segments
 from pipeline.features.transforms import compute_speaker_median_pitch, feature_engineering
+from pipeline.io.checkpoint import StageManifest, fingerprint, path_stamp
+from pipeline.io.ipc import load_frame, save_frame
 from pipeline.io.parquet import save_df_parquet_safe
 from pipeline.io.paths import PipelinePaths
 from pipeline.merge import merge_streams
+from pipeline.metrics import Profiler, StageMetrics, StageRecorder
 from pipeline.video.face_features import face_analysis_data
 from pipeline.video.frame_extractor import extract_frames
 
@@ -73,6 +83,11 @@ _RZ_AUDIO = [
     "pitch_expressiveness_st_smooth_rz",
     "wps_smooth_rz",
 ]
+_RZ_GROUPS = {"visual": _RZ_VISUAL, "audio": _RZ_AUDIO}
+
+# master.parquet is written sorted on `Time` in row groups of this many rows
+# (~4 min of 0.5 s windows), so time-range reads only touch the groups they need.
+MASTER_ROW_GROUP_SIZE = 512
 
 # Linguistic features are categorical: `is_anomalous` derives directly from
 # `filler_percentage > 0` and `pause_percent_pr == 1.0` per the legacy
@@ -103,6 +118,19 @@ class PipelineConfig:
     enable_assemblyai: bool = True
     enable_whisper: bool = True
 
+    # Anomaly detection: "per_feature" runs one 1-D forest per rz column;
+    # "joint" runs one forest per modality over shingled multi-feature vectors.
+    rrcf_mode: Literal["per_feature", "joint"] = "per_feature"
+    rrcf_shingle: int = 4
+
+    # "arrow" keeps intermediates as uncompressed, memory-mapped Arrow IPC;
+    # master.parquet is always parquet.
+    intermediate_format: Literal["parquet", "arrow"] = "parquet"
+
+    # Profile one stage (by STAGES name) into the job dir; off by default.
+    profile_stage: str | None = None
+    profiler: Profiler = "cprofile"
+
 
 @dataclass
 class PipelineResult:
@@ -112,6 +140,8 @@ class PipelineResult:
     paths: PipelinePaths
     master_df_path: Path
     speaker_label: str = "B"
+    # Per-stage wall/CPU/RSS/I-O, also written to `paths.metrics_json`.
+    metrics: list[StageMetrics] = field(default_factory=list)
 
 
 def _resolve_speaker(requested: str, utterances_df: pd.DataFrame) -> str:
@@ -132,44 +162,150 @@ def _emit(progress_cb: ProgressCallback | None, stage: str, frac: float) -> None
             _log.exception("Progress callback raised")
 
 
+def _score_per_feature(df: pd.DataFrame, rz_columns: list[str]) -> dict[str, np.ndarray]:
+    """Raw RRCF score per rz column, aligned to `df` rows (NaN where unscored)."""
+    scores: dict[str, np.ndarray] = {}
+    for col in rz_columns:
+        col_scores = np.full(len(df), np.nan)
+        scores[col] = col_scores
+        if col not in df.columns:
+            _log.warning("anomaly detection: column %s missing — skipping", col)
+            continue
+        values = df[col].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        if valid.any():
+            col_scores[valid] = run_rrcf(values[valid].reshape(-1, 1))
+    return scores
+
+
+def _threshold_per_feature(
+    times: np.ndarray,
+    scores: dict[str, np.ndarray],
+    *,
+    n_sigma: float | None = None,
+    range_min: float = MIN,
+    range_max: float = MAX,
+) -> tuple[dict[str, list[float]], dict[str, list[list[float]]]]:
+    """Adaptive MAD threshold + continuous-range grouping over cached scores."""
+    anomalies: dict[str, list[float]] = {}
+    c_anomalies: dict[str, list[list[float]]] = {}
+    for col, col_scores in scores.items():
+        valid = ~np.isnan(col_scores)
+        if not valid.any():
+            anomalies[col] = []
+            c_anomalies[col] = []
+            continue
+        scored = col_scores[valid]
+        sigma = n_sigma if n_sigma is not None else adaptive_n_sigma(scored)
+        threshold = get_threshold_mad(scored, n_sigma=sigma)
+
+        anomalous_times = times[valid][scored > threshold]
+        anomalies[col] = anomalous_times.tolist()
+        c_anomalies[col] = anomalous_time_ranges(anomalous_times, min=range_min, max=range_max)
+    return anomalies, c_anomalies
+
+
 def _detect_per_feature(
     df: pd.DataFrame,
     rz_columns: list[str],
 ) -> tuple[dict[str, list[float]], dict[str, list[list[float]]]]:
     """RRCF + adaptive MAD threshold + continuous-range grouping per column."""
-    anomalies: dict[str, list[float]] = {}
-    c_anomalies: dict[str, list[list[float]]] = {}
+    times = df["Time"].to_numpy(dtype=float)
+    return _threshold_per_feature(times, _score_per_feature(df, rz_columns))
+
 
+def _score_joint(
+    df: pd.DataFrame,
+    rz_columns: list[str],
+    *,
+    shingle: int = 4,
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Joint RRCF score plus per-column attribution, aligned to `df` rows.
+
+    Rows with any missing rz value are left unscored (NaN); columns absent
+    from `df` get an all-NaN attribution.
+    """
+    joint = np.full(len(df), np.nan)
+    attributions = {col: np.full(len(df), np.nan) for col in rz_columns}
+
+    present = [col for col in rz_columns if col in df.columns]
     for col in rz_columns:
-        if col not in df.columns:
+        if col not in present:
             _log.warning("anomaly detection: column %s missing — skipping", col)
-            anomalies[col] = []
-            c_anomalies[col] = []
-            continue
+    if not present:
+        return joint, attributions
 
-        series = df[col].dropna()
-        if series.empty:
-            anomalies[col] = []
-            c_anomalies[col] = []
-            continue
+    block = df[present].to_numpy(dtype=float)
+    valid = ~np.isnan(block).any(axis=1)
+    if not valid.any():
+        return joint, attributions
+
+    scores, attribution = run_rrcf_joint(block[valid], shingle=shingle)
+    joint[valid] = scores
+    for j, col in enumerate(present):
+        attributions[col][valid] = attribution[:, j]
+    return joint, attributions
 
-        features = series.to_numpy().reshape(-1, 1)
-        scores = np.asarray(run_rrcf(features))
-        n_sigma = adaptive_n_sigma(scores)
-        threshold = get_threshold_mad(scores, n_sigma=n_sigma)
 
-        mask = scores > threshold
-        anomalous_times = df.loc[series.index[mask], "Time"].astype(float).tolist()
-        anomalies[col] = anomalous_times
+def _threshold_joint(
+    times: np.ndarray,
+    joint: np.ndarray,
+    attributions: dict[str, np.ndarray],
+    *,
+    n_sigma: float | None = None,
+    range_min: float = MIN,
+    range_max: float = MAX,
+) -> tuple[dict[str, list[float]], dict[str, list[list[float]]]]:
+    """Threshold a cached joint score and credit rows to their dominant columns.
 
-        time_df = pd.DataFrame({"Time": anomalous_times}).reset_index(drop=True)
-        c_anomalies[col] = get_anomalous_time_ranges(time_df, min=0.5, max=2.0)
+    A row is anomalous when the joint score clears the adaptive MAD threshold;
+    it is then credited to every feature carrying at least an equal share of
+    that row's score.
+    """
+    anomalies: dict[str, list[float]] = {col: [] for col in attributions}
+    c_anomalies: dict[str, list[list[float]]] = {col: [] for col in attributions}
+
+    valid = ~np.isnan(joint)
+    if not valid.any():
+        return anomalies, c_anomalies
+    present = [col for col, attr in attributions.items() if not np.isnan(attr[valid]).all()]
+
+    scores = joint[valid]
+    sigma = n_sigma if n_sigma is not None else adaptive_n_sigma(scores)
+    threshold = get_threshold_mad(scores, n_sigma=sigma)
+    row_mask = scores > threshold
+    fair_share = scores / len(present)
+
+    times = times[valid]
+    for col in present:
+        mask = row_mask & (attributions[col][valid] >= fair_share)
+        anomalies[col] = times[mask].tolist()
+        c_anomalies[col] = anomalous_time_ranges(times[mask], min=range_min, max=range_max)
 
     return anomalies, c_anomalies
 
 
+def _detect_joint(
+    df: pd.DataFrame,
+    rz_columns: list[str],
+    *,
+    shingle: int = 4,
+) -> tuple[dict[str, list[float]], dict[str, list[list[float]]]]:
+    """One shingled RRCF forest over all of a modality's rz columns.
+
+    Yields the same `{col: [times]}` shape as `_detect_per_feature`; see
+    `_threshold_joint` for how joint anomalies are credited to columns.
+    """
+    times = df["Time"].to_numpy(dtype=float)
+    joint, attributions = _score_joint(df, rz_columns, shingle=shingle)
+    return _threshold_joint(times, joint, attributions)
+
+
 def _detect_categorical(
     df: pd.DataFrame,
+    *,
+    range_min: float = MIN,
+    range_max: float = MAX,
 ) -> tuple[dict[str, list[float]], dict[str, list[list[float]]]]:
     """Categorical anomaly bookkeeping for filler %, pause %.
 
@@ -188,153 +324,359 @@ def _detect_categorical(
             mask = df[col].fillna(0) > 0.0
         else:  # pause_percent_pr
             mask = df[col].fillna(0) >= 1.0
-        anomalous_times = df.loc[mask, "Time"].astype(float).tolist()
-        anomalies[col] = anomalous_times
-        time_df = pd.DataFrame({"Time": anomalous_times}).reset_index(drop=True)
-        c_anomalies[col] = get_anomalous_time_ranges(time_df, min=0.5, max=2.0)
+        anomalous_times = df["Time"].to_numpy(dtype=float)[mask.to_numpy()]
+        anomalies[col] = anomalous_times.tolist()
+        c_anomalies[col] = anomalous_time_ranges(anomalous_times, min=range_min, max=range_max)
     return anomalies, c_anomalies
 
 
+def score_anomalies(
+    enriched: pd.DataFrame,
+    *,
+    rrcf_mode: Literal["per_feature", "joint"] = "per_feature",
+    shingle: int = 4,
+) -> pd.DataFrame:
+    """Run RRCF over the smoothed rz columns and return the raw scores.
+
+    This is the expensive half of anomaly detection. The result is aligned
+    row-for-row with `enriched` (plus its `Time` column) so it can be cached
+    and re-thresholded by `threshold_anomalies` without rerunning the forests.
+    In per-feature mode each rz column holds that column's RRCF score; in
+    joint mode the rz columns hold their attribution share and
+    `joint_visual` / `joint_audio` hold the modality scores. The mode is
+    recorded in `attrs["rrcf_mode"]`, which survives the parquet round-trip.
+    """
+    columns: dict[str, np.ndarray] = {"Time": enriched["Time"].to_numpy(dtype=float)}
+    if rrcf_mode == "joint":
+        for group, rz_columns in _RZ_GROUPS.items():
+            joint, attributions = _score_joint(enriched, rz_columns, shingle=shingle)
+            columns[f"joint_{group}"] = joint
+            columns.update(attributions)
+    else:
+        for rz_columns in _RZ_GROUPS.values():
+            columns.update(_score_per_feature(enriched, rz_columns))
+
+    scores = pd.DataFrame(columns)
+    scores.attrs["rrcf_mode"] = rrcf_mode
+    return scores
+
+
+def threshold_anomalies(
+    enriched: pd.DataFrame,
+    scores: pd.DataFrame,
+    *,
+    n_sigma: float | None = None,
+    range_min: float = MIN,
+    range_max: float = MAX,
+) -> tuple[dict[str, list[float]], dict[str, list[list[float]]]]:
+    """Turn cached RRCF `scores` into the `anomalies` / `c_anomalies` dicts.
+
+    `n_sigma=None` keeps the adaptive per-distribution rule; a number pins it
+    for every feature. `range_min` / `range_max` are the continuity window
+    used to group anomalous times into ranges. Categorical features are
+    re-derived from `enriched` (cheap) under the same range rule.
+    """
+    times = scores["Time"].to_numpy(dtype=float)
+    joint_mode = scores.attrs.get("rrcf_mode") == "joint"
+
+    anomalies: dict[str, list[float]] = {}
+    c_anomalies: dict[str, list[list[float]]] = {}
+    for group, rz_columns in _RZ_GROUPS.items():
+        by_column = {col: scores[col].to_numpy(dtype=float) for col in rz_columns}
+        if joint_mode:
+            group_anom, group_c_anom = _threshold_joint(
+                times,
+                scores[f"joint_{group}"].to_numpy(dtype=float),
+                by_column,
+                n_sigma=n_sigma,
+                range_min=range_min,
+                range_max=range_max,
+            )
+        else:
+            group_anom, group_c_anom = _threshold_per_feature(
+                times, by_column, n_sigma=n_sigma, range_min=range_min, range_max=range_max
+            )
+        anomalies.update(group_anom)
+        c_anomalies.update(group_c_anom)
+
+    cat_anom, cat_c_anom = _detect_categorical(enriched, range_min=range_min, range_max=range_max)
+    anomalies.update(cat_anom)
+    c_anomalies.update(cat_c_anom)
+    return anomalies, c_anomalies
+
+
+def build_master_df(
+    enriched: pd.DataFrame,
+    anomalies: dict[str, list[float]],
+    c_anomalies: dict[str, list[list[float]]],
+    *,
+    speaker: str,
+) -> pd.DataFrame:
+    """Evaluation-mode `feature_engineering` → the Pydantic-dict master frame."""
+    master_rows = feature_engineering(
+        c_anomalies=c_anomalies,
+        anomalies=anomalies,
+        df=enriched,
+        norm_rz_df=enriched,
+        speaker_median_pitch=0.0,  # only used in training mode
+        speaker=speaker,
+        mode="evaluation",
+    )
+    return pd.concat(
+        [enriched[["Time", "speaker"]].reset_index(drop=True), master_rows.reset_index(drop=True)],
+        axis=1,
+    )
+
+
 def run_pipeline(
     video_path: str | Path,
     config: PipelineConfig | None = None,
     *,
     progress_cb: ProgressCallback | None = None,
+    resume: bool = False,
 ) -> PipelineResult:
     """Run the full pipeline end-to-end.
 
     Reports progress through `progress_cb(stage_name, fraction_0_to_1)`.
     Returns a `PipelineResult` whose `master_df_path` points at the final
     Pydantic-dict parquet.
+
+    Every completed stage is checkpointed in `paths.manifest_json`. With
+    `resume=True`, stages whose input/config fingerprint and outputs are
+    unchanged are skipped and their outputs loaded from disk instead.
     """
     config = config or PipelineConfig()
     video_path = Path(video_path)
     if not video_path.exists():
         raise FileNotFoundError(f"video not found: {video_path}")
 
-    paths = PipelinePaths(root=config.data_root, job_id=config.job_id)
+    paths = PipelinePaths(
+        root=config.data_root,
+        job_id=config.job_id,
+        intermediate_format=config.intermediate_format,
+    )
     paths.ensure_dirs()
+    manifest = StageManifest(paths.manifest_json)
+    recorder = StageRecorder(
+        paths.metrics_json, profile_stage=config.profile_stage, profiler=config.profiler
+    )
 
     n_stages = len(STAGES)
 
     def _stage_started(name: str, idx: int) -> None:
+        recorder.start(name)
         _log.info("[stage %d/%d] %s", idx + 1, n_stages, name)
         _emit(progress_cb, name, idx / n_stages)
 
-    # 1. extracting_frames
-    _stage_started("extracting_frames", 0)
-    extract_frames(video_path, paths.frames_dir, nof_ps=config.frames_per_second)
-
-    # 2. extracting_audio
-    _stage_started("extracting_audio", 1)
-    audio_path = extract_audio(video_path, output_path=paths.audio_wav)
-    if audio_path is None:
-        raise RuntimeError("Video has no audio track — cannot continue.")
+    def _is_fresh(name: str, fp: str) -> bool:
+        if resume and manifest.is_fresh(name, fp):
+            _log.info("Resuming: %s is up to date, skipping", name)
+            return True
+        return False
+
+    def _can_skip(name: str, fp: str) -> bool:
+        """`_is_fresh` for the stage that is currently open."""
+        if _is_fresh(name, fp):
+            recorder.mark_skipped()
+            return True
+        return False
+
+    # Leaving the block closes the open stage, recorded as failed if it raised.
+    with recorder:
+        # 1. extracting_frames
+        _stage_started("extracting_frames", 0)
+        frames_fp = fingerprint(path_stamp(video_path), config.frames_per_second)
+        if not _can_skip("extracting_frames", frames_fp):
+            # Drop frames from an earlier (possibly partial) run so stale files
+            # never leak into face analysis.
+            shutil.rmtree(paths.frames_dir, ignore_errors=True)
+            extract_frames(video_path, paths.frames_dir, nof_ps=config.frames_per_second)
+            manifest.record("extracting_frames", frames_fp, [paths.frames_dir])
+
+        # 2. extracting_audio
+        _stage_started("extracting_audio", 1)
+        audio_fp = fingerprint(path_stamp(video_path))
+        if _can_skip("extracting_audio", audio_fp):
+            audio_path = paths.audio_wav
+        else:
+            # `extract_audio` reuses any existing WAV; only a checkpointed one is trusted.
+            paths.audio_wav.unlink(missing_ok=True)
+            extracted = extract_audio(video_path, output_path=paths.audio_wav)
+            if extracted is None:
+                raise RuntimeError("Video has no audio track — cannot continue.")
+            audio_path = extracted
+            manifest.record("extracting_audio", audio_fp, [audio_path])
+
+        # 3. extracting_face_features
+        _stage_started("extracting_face_features", 2)
+        if not config.face_model_path.exists():
+            raise FileNotFoundError(
+                f"MediaPipe face_landmarker model not found at {config.face_model_path}. "
+                "Download `face_landmarker.task` from MediaPipe and place it there."
+            )
+        face_fp = fingerprint(path_stamp(paths.frames_dir), path_stamp(config.face_model_path))
+        if _can_skip("extracting_face_features", face_fp):
+            face_df = load_frame(paths.face_features_parquet)
+        else:
+            face_df = face_analysis_data(
+                model_path=str(config.face_model_path), images_path=str(paths.frames_dir)
+            )
+            save_frame(face_df, paths.face_features_parquet)
+            manifest.record("extracting_face_features", face_fp, [paths.face_features_parquet])
+
+        # 4. extracting_audio_features
+        _stage_started("extracting_audio_features", 3)
+        audio_features_fp = fingerprint(path_stamp(audio_path), config.window_size_sec)
+        if _can_skip("extracting_audio_features", audio_features_fp):
+            audio_df = load_frame(paths.audio_features_parquet)
+        else:
+            audio_df = analyze_audio_layers(audio_path, segment_length=config.window_size_sec)
+            if audio_df is None:
+                raise RuntimeError("Audio feature extraction returned None.")
+            save_frame(audio_df, paths.audio_features_parquet)
+            manifest.record(
+                "extracting_audio_features", audio_features_fp, [paths.audio_features_parquet]
+            )
 
-    # 3. extracting_face_features
-    _stage_started("extracting_face_features", 2)
-    if not config.face_model_path.exists():
-        raise FileNotFoundError(
-            f"MediaPipe face_landmarker model not found at {config.face_model_path}. "
-            "Download `face_landmarker.task` from MediaPipe and place it there."
+        # 5. transcribing
+        _stage_started("transcribing", 4)
+        transcripts = [
+            p
+            for p, enabled in (
+                (paths.utterances_parquet, config.enable_assemblyai),
+                (paths.whisper_parquet, config.enable_whisper),
+            )
+            if enabled
+        ]
+        transcribe_fp = fingerprint(
+            path_stamp(audio_path),
+            config.enable_assemblyai,
+            config.enable_whisper,
+            config.whisper_model_size,
         )
-    face_df = face_analysis_data(
-        model_path=str(config.face_model_path), images_path=str(paths.frames_dir)
-    )
-    save_df_parquet_safe(face_df, paths.face_features_parquet)
-
-    # 4. extracting_audio_features
-    _stage_started("extracting_audio_features", 3)
-    audio_df = analyze_audio_layers(audio_path, segment_length=config.window_size_sec)
-    if audio_df is None:
-        raise RuntimeError("Audio feature extraction returned None.")
-    save_df_parquet_safe(audio_df, paths.audio_features_parquet)
-
-    # 5. transcribing
-    _stage_started("transcribing", 4)
-    utterances_df = pd.DataFrame()
-    whisper_df = pd.DataFrame()
-    if config.enable_assemblyai:
-        if not config.assemblyai_api_key:
-            raise RuntimeError(
-                "AssemblyAI enabled but ASSEMBLYAI_API_KEY is not set. "
-                "Set the env var or pass enable_assemblyai=False."
+        utterances_df = pd.DataFrame()
+        whisper_df = pd.DataFrame()
+        if _can_skip("transcribing", transcribe_fp):
+            if config.enable_assemblyai:
+                utterances_df = load_frame(paths.utterances_parquet)
+            if config.enable_whisper:
+                whisper_df = load_frame(paths.whisper_parquet)
+        else:
+            if config.enable_assemblyai:
+                if not config.assemblyai_api_key:
+                    raise RuntimeError(
+                        "AssemblyAI enabled but ASSEMBLYAI_API_KEY is not set. "
+                        "Set the env var or pass enable_assemblyai=False."
+                    )
+                utterances_df = get_utterances_data(config.assemblyai_api_key, audio_path)
+                save_frame(utterances_df, paths.utterances_parquet)
+            if config.enable_whisper:
+                whisper_df = get_whisper_data(
+                    str(audio_path),
+                    model_size=config.whisper_model_size,
+                    device=config.whisper_device,
+                )
+                save_frame(whisper_df, paths.whisper_parquet)
+            manifest.record("transcribing", transcribe_fp, transcripts)
+
+        # 6. merging
+        _stage_started("merging", 5)
+        merge_fp = fingerprint(
+            path_stamp(paths.face_features_parquet),
+            path_stamp(paths.audio_features_parquet),
+            [path_stamp(p) for p in transcripts],
+            config.window_size_sec,
+        )
+        if _can_skip("merging", merge_fp):
+            merged = load_frame(paths.merged_parquet)
+        else:
+            merged = merge_streams(
+                face_df=face_df,
+                audio_df=audio_df,
+                whisper_df=whisper_df,
+                utterances_df=utterances_df,
+                window_size=config.window_size_sec,
             )
-        utterances_df = get_utterances_data(config.assemblyai_api_key, audio_path)
-        save_df_parquet_safe(utterances_df, paths.utterances_parquet)
-    if config.enable_whisper:
-        whisper_df = get_whisper_data(
-            str(audio_path),
-            model_size=config.whisper_model_size,
-            device=config.whisper_device,
+            save_frame(merged, paths.merged_parquet)
+            manifest.record("merging", merge_fp, [paths.merged_parquet])
+
+        # Stages 7 + 8 checkpoint together: training-mode output only lives on
+        # disk as part of the smoothed `enriched` frame written after stage 8.
+        anomaly_fp = fingerprint(
+            path_stamp(paths.merged_parquet),
+            path_stamp(audio_path),
+            config.speaker_label,
+            config.rrcf_mode,
+            config.rrcf_shingle,
         )
-        save_df_parquet_safe(whisper_df, paths.whisper_parquet)
-
-    # 6. merging
-    _stage_started("merging", 5)
-    merged = merge_streams(
-        face_df=face_df,
-        audio_df=audio_df,
-        whisper_df=whisper_df,
-        utterances_df=utterances_df,
-        window_size=config.window_size_sec,
-    )
-    save_df_parquet_safe(merged, paths.merged_parquet)
-
-    # Resolve which diarized speaker is the interviewee. When the caller passes
-    # "auto" (the default from the UI) we infer it from who holds the floor
-    # longest; an explicit label still wins. Everything downstream — pitch
-    # normalization, audio anomaly smoothing, the agent transcript filter — keys
-    # off this single resolved label.
-    speaker = _resolve_speaker(config.speaker_label, utterances_df)
-
-    # 7. feature_engineering (training mode → raw transformed metrics)
-    _stage_started("feature_engineering", 6)
-    speaker_segments = get_speaker_segments(utterances_df, speaker=speaker)
-    speaker_median_pitch = (
-        compute_speaker_median_pitch(audio_path=str(audio_path), speaker_segments=speaker_segments)
-        if speaker_segments
-        else 0.0
-    )
-    trained = feature_engineering(
-        c_anomalies=None,
-        anomalies=None,
-        df=merged,
-        norm_rz_df=None,
-        speaker_median_pitch=speaker_median_pitch or 0.0,
-        speaker=speaker,
-        mode="training",
-    )
-    enriched = pd.concat([merged.reset_index(drop=True), trained.reset_index(drop=True)], axis=1)
-
-    # 8. anomaly_detection
-    _stage_started("anomaly_detection", 7)
-    enriched = smooth_and_rz_visual(enriched)
-    enriched = smooth_and_rz_audio(enriched, speaker=speaker)
+        if _is_fresh("anomaly_detection", anomaly_fp):
+            _stage_started("feature_engineering", 6)
+            recorder.mark_skipped()
+            _stage_started("anomaly_detection", 7)
+            recorder.mark_skipped()
+            enriched = load_frame(paths.enriched_parquet)
+            scores = load_frame(paths.anomaly_scores_parquet)
+            speaker = scores.attrs.get("speaker") or _resolve_speaker(
+                config.speaker_label, utterances_df
+            )
+        else:
+            # Resolve which diarized speaker is the interviewee. When the caller passes
+            # "auto" (the default from the UI) we infer it from who holds the floor
+            # longest; an explicit label still wins. Everything downstream — pitch
+            # normalization, audio anomaly smoothing, the agent transcript filter — keys
+            # off this single resolved label.
+            speaker = _resolve_speaker(config.speaker_label, utterances_df)
+
+            # 7. feature_engineering (training mode → raw transformed metrics)
+            _stage_started("feature_engineering", 6)
+            speaker_segments = get_speaker_segments(utterances_df, speaker=speaker)
+            speaker_median_pitch = (
+                compute_speaker_median_pitch(
+                    audio_path=str(audio_path), speaker_segments=speaker_segments
+                )
+                if speaker_segments
+                else 0.0
+            )
+            trained = feature_engineering(
+                c_anomalies=None,
+                anomalies=None,
+                df=merged,
+                norm_rz_df=None,
+                speaker_median_pitch=speaker_median_pitch or 0.0,
+                speaker=speaker,
+                mode="training",
+            )
+            enriched = pd.concat(
+                [merged.reset_index(drop=True), trained.reset_index(drop=True)], axis=1
+            )
 
-    visual_anom, visual_c_anom = _detect_per_feature(enriched, _RZ_VISUAL)
-    audio_anom, audio_c_anom = _detect_per_feature(enriched, _RZ_AUDIO)
-    cat_anom, cat_c_anom = _detect_categorical(enriched)
+            # 8. anomaly_detection
+            _stage_started("anomaly_detection", 7)
+            # `enriched` is owned here, so smooth in place rather than copying the wide frame.
+            smooth_and_rz_visual(enriched, inplace=True)
+            smooth_and_rz_audio(enriched, speaker=speaker, inplace=True)
 
-    anomalies = {**visual_anom, **audio_anom, **cat_anom}
-    c_anomalies = {**visual_c_anom, **audio_c_anom, **cat_c_anom}
+            # Cache the expensive half (smoothed frame + raw RRCF scores) so thresholds
+            # can be re-tuned later via `rebuild_master` without rerunning the forests.
+            scores = score_anomalies(
+                enriched, rrcf_mode=config.rrcf_mode, shingle=config.rrcf_shingle
+            )
+            scores.attrs["speaker"] = speaker
+            save_frame(enriched, paths.enriched_parquet)
+            save_frame(scores, paths.anomaly_scores_parquet)
+            manifest.record(
+                "anomaly_detection",
+                anomaly_fp,
+                [paths.enriched_parquet, paths.anomaly_scores_parquet],
+            )
+        anomalies, c_anomalies = threshold_anomalies(enriched, scores)
 
-    # 9. building_master_df (evaluation mode → Pydantic-dict columns)
-    _stage_started("building_master_df", 8)
-    master_rows = feature_engineering(
-        c_anomalies=c_anomalies,
-        anomalies=anomalies,
-        df=enriched,
-        norm_rz_df=enriched,
-        speaker_median_pitch=speaker_median_pitch or 0.0,
-        speaker=speaker,
-        mode="evaluation",
-    )
-    master_df = pd.concat(
-        [enriched[["Time", "speaker"]].reset_index(drop=True), master_rows.reset_index(drop=True)],
-        axis=1,
-    )
-    save_df_parquet_safe(master_df, paths.master_parquet)
+        # 9. building_master_df (evaluation mode → Pydantic-dict columns)
+        _stage_started("building_master_df", 8)
+        master_df = build_master_df(enriched, anomalies, c_anomalies, speaker=speaker)
+        save_df_parquet_safe(
+            master_df, paths.master_parquet, sort_by="Time", row_group_size=MASTER_ROW_GROUP_SIZE
+        )
 
     _emit(progress_cb, "building_master_df", 1.0)
     _log.info("Pipeline complete. Master parquet at %s", paths.master_parquet)
@@ -344,10 +686,43 @@ def run_pipeline(
         paths=paths,
         master_df_path=paths.master_parquet,
         speaker_label=speaker,
+        metrics=recorder.metrics,
     )
 
 
-def _parse_argv(argv: list[str]) -> tuple[Path, PipelineConfig]:
+def rebuild_master(
+    paths: PipelinePaths,
+    *,
+    n_sigma: float | None = None,
+    range_min: float = MIN,
+    range_max: float = MAX,
+) -> Path:
+    """Re-threshold a finished job's cached RRCF scores and rewrite master.parquet.
+
+    Reads `enriched.parquet` + `anomaly_scores.parquet` written by
+    `run_pipeline`, so only thresholding, range grouping and the evaluation
+    pass run — no extraction, smoothing or RRCF.
+    """
+    if not paths.anomaly_scores_parquet.exists() or not paths.enriched_parquet.exists():
+        raise FileNotFoundError(
+            f"no cached anomaly scores under {paths.job_dir} — run the full pipeline first"
+        )
+    enriched = load_frame(paths.enriched_parquet)
+    scores = load_frame(paths.anomaly_scores_parquet)
+    speaker = scores.attrs.get("speaker", "B")
+
+    anomalies, c_anomalies = threshold_anomalies(
+        enriched, scores, n_sigma=n_sigma, range_min=range_min, range_max=range_max
+    )
+    master_df = build_master_df(enriched, anomalies, c_anomalies, speaker=speaker)
+    save_df_parquet_safe(
+        master_df, paths.master_parquet, sort_by="Time", row_group_size=MASTER_ROW_GROUP_SIZE
+    )
+    _log.info("Rebuilt master parquet from cached scores at %s", paths.master_parquet)
+    return paths.master_parquet
+
+
+def _parse_argv(argv: list[str]) -> tuple[Path, PipelineConfig, bool]:
     parser = argparse.ArgumentParser(description="MMR end-to-end pipeline")
     parser.add_argument("video_path", type=Path)
     parser.add_argument("--job-id", default=None)
@@ -360,6 +735,16 @@ def _parse_argv(argv: list[str]) -> tuple[Path, PipelineConfig]:
     parser.add_argument("--no-transcribe-whisper", action="store_true")
     parser.add_argument("--whisper-model", default="small")
     parser.add_argument("--whisper-device", default="cpu")
+    parser.add_argument("--rrcf-mode", choices=("per_feature", "joint"), default="per_feature")
+    parser.add_argument("--rrcf-shingle", type=int, default=4)
+    parser.add_argument("--intermediate-format", choices=("parquet", "arrow"), default="parquet")
+    parser.add_argument(
+        "--profile-stage", choices=STAGES, default=None, help="profile one stage into the job dir"
+    )
+    parser.add_argument("--profiler", choices=("cprofile", "pyinstrument"), default="cprofile")
+    parser.add_argument(
+        "--resume", action="store_true", help="skip stages whose checkpoints are still valid"
+    )
     parser.add_argument("--log-level", default="INFO")
     args = parser.parse_args(argv)
 
@@ -375,8 +760,13 @@ def _parse_argv(argv: list[str]) -> tuple[Path, PipelineConfig]:
         enable_whisper=not args.no_transcribe_whisper,
         whisper_model_size=args.whisper_model,
         whisper_device=args.whisper_device,
+        rrcf_mode=args.rrcf_mode,
+        rrcf_shingle=args.rrcf_shingle,
+        intermediate_format=args.intermediate_format,
+        profile_stage=args.profile_stage,
+        profiler=args.profiler,
     )
-    return args.video_path, cfg
+    return args.video_path, cfg, args.resume
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -390,10 +780,10 @@ def main(argv: list[str] | None = None) -> int:
         pass
 
     argv = argv if argv is not None else sys.argv[1:]
-    video_path, config = _parse_argv(argv)
+    video_path, config, resume = _parse_argv(argv)
 
     configure_logging(level=logging.INFO)
-    result = run_pipeline(video_path, config)
+    result = run_pipeline(video_path, config, resume=resume)
     sys.stdout.write(str(result.master_df_path) + "\n")
     return 0
 
@@ -403,8 +793,13 @@ if __name__ == "__main__":
 
 
 __all__ = [
+    "MASTER_ROW_GROUP_SIZE",
     "STAGES",
     "PipelineConfig",
     "PipelineResult",
+    "build_master_df",
+    "rebuild_master",
     "run_pipeline",
+    "score_anomalies",
+    "threshold_anomalies",
 ]
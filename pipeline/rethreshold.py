@@ -0,0 +1,59 @@
+"""Rebuild a finished job's master.parquet under new anomaly thresholds.
+
+`run_pipeline` caches the smoothed frame and the raw RRCF scores; this entry
+point re-runs only thresholding, range grouping and the evaluation pass, so
+tuning `n_sigma` or the continuity window takes seconds instead of a full
+pipeline rerun.
+
+Usage (CLI):
+    python -m pipeline.rethreshold <job_id> [--data-root data/processed]
+        [--n-sigma 3.0] [--range-min 0.5] [--range-max 2.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from pipeline._logging import configure_logging
+from pipeline.anomaly.rrcf import MAX, MIN
+from pipeline.io.paths import PipelinePaths
+from pipeline.orchestrator import rebuild_master
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-threshold cached anomaly scores")
+    parser.add_argument("job_id")
+    parser.add_argument("--data-root", type=Path, default=Path("data/processed"))
+    parser.add_argument(
+        "--n-sigma",
+        type=float,
+        default=None,
+        help="fixed MAD multiplier (default: adaptive per feature)",
+    )
+    parser.add_argument("--range-min", type=float, default=MIN)
+    parser.add_argument("--range-max", type=float, default=MAX)
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    configure_logging(level=logging.INFO)
+    paths = PipelinePaths(root=args.data_root, job_id=args.job_id)
+    if not paths.enriched_parquet.exists():
+        # The job may have been run with memory-mapped Arrow intermediates.
+        paths = PipelinePaths(root=args.data_root, job_id=args.job_id, intermediate_format="arrow")
+    master_path = rebuild_master(
+        paths,
+        n_sigma=args.n_sigma,
+        range_min=args.range_min,
+        range_max=args.range_max,
+    )
+    sys.stdout.write(str(master_path) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+
+__all__ = ["main"]
@@ -2,10 +2,7 @@ import logging
 import math
 from pathlib import Path
 
-import mediapipe as mp
 import pandas as pd
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
 
 _log = logging.getLogger(__name__)
 
@@ -96,6 +93,10 @@ def face_analysis_data(model_path, images_path) -> pd.DataFrame:
     Output:
         fa_data - Time-Series data about the face emotions changing frame by frame in the video.
     """
+    import mediapipe as mp
+    from mediapipe.tasks import python
+    from mediapipe.tasks.python import vision
+
     # Initializing the DataFrame
     fa_data = []
 
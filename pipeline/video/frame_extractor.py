@@ -9,8 +9,6 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-import cv2 as cv
-
 _log = logging.getLogger(__name__)
 
 
@@ -22,6 +20,8 @@ def extract_frames(
     Returns a list of `(frame_path, time_seconds)` pairs sorted by time.
     Raises `FileNotFoundError` if the video can't be opened.
     """
+    import cv2 as cv
+
     video_path = str(video_path)
     output_path = Path(output_path)
     output_path.mkdir(parents=True, exist_ok=True)
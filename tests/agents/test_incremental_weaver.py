@@ -0,0 +1,66 @@
+"""Incremental synthesis: the weaver folds chronological chunks as windows finish."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from agents import orchestrator
+from agents.orchestrator import build_report
+from agents.schemas import WeaverDraft, WindowAnalysis
+from agents.window_analyst import SoloWindowInput
+from agents.windows import select_windows
+from pipeline.io.parquet import load_df_parquet_safe
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "tiny_master_df.parquet"
+
+
+@pytest.fixture
+def master_df(monkeypatch: pytest.MonkeyPatch) -> pd.DataFrame:
+    monkeypatch.setenv("LLM_PROVIDER", "stub")
+    monkeypatch.setenv("AGENT_WEAVER_CHUNK_WINDOWS", "2")
+    return load_df_parquet_safe(FIXTURE)
+
+
+async def test_incremental_mode_publishes_provisional_drafts(master_df: pd.DataFrame) -> None:
+    drafts: list[WeaverDraft] = []
+    journal, final = await build_report(master_df, on_draft=drafts.append)
+
+    n = len(select_windows(master_df))
+    assert len(journal) == n
+    assert len(drafts) == (n + 1) // 2
+    assert final.headline == drafts[-1].headline
+    # Earlier chunks' highlights carry through to the final draft.
+    assert final.highlights[: len(drafts[0].highlights)] == drafts[0].highlights
+
+
+async def test_chunks_fold_in_order_before_the_last_window_lands(
+    master_df: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    events: list[tuple[str, float]] = []
+    real_process = orchestrator._process_window
+    real_weaver = orchestrator.run_pattern_weaver
+
+    async def _slow_tail(inp: SoloWindowInput, *args: object, **kw: object) -> object:
+        # Later windows take longer, so the tail gates the run.
+        await asyncio.sleep(0.02 * inp.window.index)
+        note = await real_process(inp, *args, **kw)  # type: ignore[arg-type]
+        events.append(("done", inp.window.start))
+        return note
+
+    async def _weaver(notes: list[WindowAnalysis], **kw: object) -> WeaverDraft:
+        events.append(("fold", notes[0].time_start))
+        return await real_weaver(notes, **kw)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(orchestrator, "_process_window", _slow_tail)
+    monkeypatch.setattr(orchestrator, "run_pattern_weaver", _weaver)
+    await build_report(master_df)
+
+    windows = select_windows(master_df)
+    folds = [t for kind, t in events if kind == "fold"]
+    assert folds == [w.start for w in windows[::2]]
+    first_fold = events.index(("fold", windows[0].start))
+    assert first_fold < events.index(("done", windows[-1].start))
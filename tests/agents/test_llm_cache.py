@@ -0,0 +1,134 @@
+"""Persistent agent response cache: keying, hits, TTL/LRU eviction, bypass."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from agents._cache import ResponseCache, cache_key, cached_run
+from agents._settings import AgentSettings
+from agents._stub import stub_audio
+from agents._usage import capture_usage
+from agents.schemas import AudioObservation, VocabObservation
+
+
+class _FakeAgent:
+    """Stands in for a pydantic-ai Agent: counts calls, returns a fixed output."""
+
+    def __init__(self, output: AudioObservation) -> None:
+        self.output = output
+        self.calls = 0
+
+    async def run(self, user_msg: str) -> SimpleNamespace:
+        self.calls += 1
+        usage = SimpleNamespace(input_tokens=100, output_tokens=20, requests=1)
+        return SimpleNamespace(output=self.output, usage=lambda: usage)
+
+
+def _observation() -> AudioObservation:
+    return stub_audio(1.0, 2.0, [], "steady voice")
+
+
+def _settings(tmp_path: Path, **overrides: object) -> AgentSettings:
+    return AgentSettings(
+        llm_provider="groq",
+        llm_model="groq:test-model",
+        llm_cache_path=str(tmp_path / "cache.db"),
+        **overrides,  # type: ignore[arg-type]
+    )
+
+
+def test_key_covers_model_prompt_schema_and_message() -> None:
+    base = cache_key("m", "prompt", AudioObservation, "msg")
+    assert base == cache_key("m", "prompt", AudioObservation, "msg")
+    assert base != cache_key("m2", "prompt", AudioObservation, "msg")
+    assert base != cache_key("m", "prompt v2", AudioObservation, "msg")
+    assert base != cache_key("m", "prompt", VocabObservation, "msg")
+    assert base != cache_key("m", "prompt", AudioObservation, "msg!")
+
+
+async def test_second_identical_call_is_served_from_disk(tmp_path: Path) -> None:
+    settings = _settings(tmp_path)
+    agent = _FakeAgent(_observation())
+
+    async def _run(prompt: str) -> AudioObservation:
+        return await cached_run(
+            agent, "msg", system_prompt=prompt, output_type=AudioObservation, settings=settings
+        )
+
+    with capture_usage() as usage:
+        first = await _run("prompt")
+        second = await _run("prompt")
+    assert agent.calls == 1
+    assert second == first and second is not first
+    assert usage.requests == 1  # hits spend no tokens
+
+    await _run("edited prompt")
+    assert agent.calls == 2
+
+
+async def test_bypass_flag_always_calls_the_model(tmp_path: Path) -> None:
+    settings = _settings(tmp_path, llm_cache_enabled=False)
+    agent = _FakeAgent(_observation())
+    for _ in range(2):
+        await cached_run(
+            agent, "msg", system_prompt="p", output_type=AudioObservation, settings=settings
+        )
+    assert agent.calls == 2
+    assert not (tmp_path / "cache.db").exists()
+
+
+async def test_sqlite_io_runs_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = _settings(tmp_path)
+    threads: list[int] = []
+    for name in ("get", "put"):
+        real = getattr(ResponseCache, name)
+
+        def _spy(self: ResponseCache, *args: object, _real: Any = real) -> Any:
+            threads.append(threading.get_ident())
+            return _real(self, *args)
+
+        monkeypatch.setattr(ResponseCache, name, _spy)
+
+    await cached_run(
+        _FakeAgent(_observation()),
+        "msg",
+        system_prompt="p",
+        output_type=AudioObservation,
+        settings=settings,
+    )
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+def test_expired_entries_miss(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ResponseCache(tmp_path / "c.db", ttl_sec=60, max_entries=10)
+    cache.put("k", _observation())
+    assert cache.get("k", AudioObservation) == _observation()
+
+    later = time.time() + 61
+    monkeypatch.setattr("agents._cache.time.time", lambda: later)
+    assert cache.get("k", AudioObservation) is None
+
+
+def test_least_recently_used_entries_are_evicted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clock = iter(range(1_000, 2_000))
+    monkeypatch.setattr("agents._cache.time.time", lambda: float(next(clock)))
+    cache = ResponseCache(tmp_path / "c.db", ttl_sec=3600, max_entries=2)
+    cache.put("a", _observation())
+    cache.put("b", _observation())
+    assert cache.get("a", AudioObservation) is not None  # "b" is now the LRU entry
+    cache.put("c", _observation())
+
+    assert len(cache) == 2
+    assert cache.get("b", AudioObservation) is None
+    assert cache.get("a", AudioObservation) is not None
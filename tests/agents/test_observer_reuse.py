@@ -0,0 +1,161 @@
+"""Observer short-circuit for baseline modalities and per-run memoization."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from agents import _stub, orchestrator
+from agents._reuse import ObserverMemo
+from agents.orchestrator import build_report
+from agents.schemas import VisualAnomalyEvent, VisualObservation
+from pipeline.io.parquet import load_df_parquet_safe
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "tiny_master_df.parquet"
+
+
+def _blink(start: float) -> VisualAnomalyEvent:
+    return VisualAnomalyEvent(
+        timestamp_start=start + 0.5,
+        timestamp_end=start + 1.0,
+        feature_type="Blink",
+        behavioral_tag="Visual anomaly",
+        intensity_score=3.04,
+        is_sustained=False,
+    )
+
+
+async def test_baseline_modality_never_reaches_the_llm() -> None:
+    memo = ObserverMemo()
+
+    async def _never() -> VisualObservation:
+        raise AssertionError("baseline modality should not call the observer")
+
+    obs = await memo.observe(
+        "visual", 10.0, 14.0, [], "blink avg=0.21; smile avg=0.05", _never, anomalous=0
+    )
+    assert obs.overall_visual_state == "Baseline"
+    assert (obs.time_range_start, obs.time_range_end) == (10.0, 14.0)
+    assert memo.baseline_skips == 1
+
+
+async def test_baseline_is_decided_by_the_anomaly_count_not_the_summary_text() -> None:
+    memo = ObserverMemo()
+    calls: list[int] = []
+    summary = "blink avg=0.21"  # nothing in the text marks the anomalous samples
+
+    async def _observe() -> VisualObservation:
+        calls.append(1)
+        return _stub.stub_visual(10.0, 14.0, [], summary)
+
+    await memo.observe("visual", 10.0, 14.0, [], summary, _observe, anomalous=2)
+    assert calls == [1]
+    assert memo.baseline_skips == 0
+
+
+async def test_identical_relative_inputs_share_one_call() -> None:
+    memo = ObserverMemo()
+    calls: list[float] = []
+    summary = "blink avg=0.40 [3 anomalous, peak 3.0σ]"
+
+    async def _observe(start: float) -> VisualObservation:
+        calls.append(start)
+        await asyncio.sleep(0.01)
+        return _stub.stub_visual(start, start + 4.0, [_blink(start)], summary)
+
+    first, second = await asyncio.gather(
+        *(
+            memo.observe(
+                "visual", s, s + 4.0, [_blink(s)], summary, lambda s=s: _observe(s), anomalous=3
+            )
+            for s in (10.0, 30.0)
+        )
+    )
+
+    assert calls == [10.0]
+    assert memo.memo_hits == 1
+    assert (second.time_range_start, second.time_range_end) == (30.0, 34.0)
+    assert second.detected_anomalies == [_blink(30.0)]
+    assert first.detected_anomalies == [_blink(10.0)]
+
+    # A different summary is a different input.
+    await memo.observe(
+        "visual", 50.0, 54.0, [_blink(50.0)], summary + "!", lambda: _observe(50), anomalous=3
+    )
+    assert calls == [10.0, 50.0]
+
+
+async def test_paid_run_skips_observers_for_calm_modalities(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LLM_PROVIDER", "stub")
+    master_df: pd.DataFrame = load_df_parquet_safe(FIXTURE)
+    calls = {"visual": 0, "audio": 0, "vocab": 0}
+
+    def _counting(kind: str, real: object) -> object:
+        async def _run(*args: object, **kwargs: object) -> object:
+            calls[kind] += 1
+            return await real(*args, **kwargs)  # type: ignore[operator]
+
+        return _run
+
+    for kind in calls:
+        name = f"run_{kind}_observer"
+        monkeypatch.setattr(orchestrator, name, _counting(kind, getattr(orchestrator, name)))
+
+    journal, _ = await build_report(master_df)
+
+    assert journal
+    # The fixture's anomalies are one visual and one audio range.
+    assert 1 <= calls["visual"] < len(journal)
+    assert 1 <= calls["audio"] < len(journal)
+    assert calls["vocab"] < len(journal)
+
+
+async def test_failed_shared_call_is_not_replayed() -> None:
+    memo = ObserverMemo()
+    summary = "blink avg=0.40 [3 anomalous, peak 3.0σ]"
+    attempts: list[int] = []
+
+    async def _observe() -> VisualObservation:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise TimeoutError("provider timed out")
+        return _stub.stub_visual(10.0, 14.0, [_blink(10.0)], summary)
+
+    with pytest.raises(TimeoutError):
+        await memo.observe("visual", 10.0, 14.0, [_blink(10.0)], summary, _observe, anomalous=3)
+    obs = await memo.observe("visual", 10.0, 14.0, [_blink(10.0)], summary, _observe, anomalous=3)
+
+    assert len(attempts) == 2
+    assert obs.detected_anomalies == [_blink(10.0)]
+
+
+async def test_cancel_stops_shared_calls_in_flight() -> None:
+    memo = ObserverMemo()
+    summary = "blink avg=0.40 [3 anomalous, peak 3.0σ]"
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def _hang() -> VisualObservation:
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        raise AssertionError("unreachable")
+
+    window = asyncio.ensure_future(
+        memo.observe("visual", 10.0, 14.0, [_blink(10.0)], summary, _hang, anomalous=3)
+    )
+    await started.wait()
+    window.cancel()  # the shield keeps the shared call alive ...
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+
+    memo.cancel()  # ... until the memo's owner cancels it
+    await asyncio.wait_for(cancelled.wait(), 1.0)
@@ -9,6 +9,7 @@ Weaver → Editor synthesis).
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
 
 import pandas as pd
@@ -19,6 +20,10 @@ from agents._extract import (
     extract_transcript_slice,
     extract_visual_events,
     extract_vocab_events,
+    extract_windows,
+    summarize_audio_raw,
+    summarize_visual_raw,
+    summarize_vocab_raw,
 )
 from agents.orchestrator import build_report
 from agents.schemas import FinalReport, WindowAnalysis
@@ -104,6 +109,41 @@ def test_extract_transcript_slice_handles_missing_transcript() -> None:
     assert extract_transcript_slice(pd.DataFrame(), 0.0, 5.0) == ""
 
 
+def test_extract_windows_matches_per_window_helpers(master_df: pd.DataFrame) -> None:
+    spans = [(w.start, w.end) for w in select_windows(master_df)] + [(4.0, 24.0)]
+    for (start, end), got in zip(spans, extract_windows(master_df, spans), strict=True):
+        rows = master_df[(master_df["Time"] >= start) & (master_df["Time"] <= end)]
+        assert got.visual_events == extract_visual_events(rows)
+        assert got.audio_events == extract_audio_events(rows)
+        assert got.vocab_events == extract_vocab_events(rows)
+        assert got.visual_raw == summarize_visual_raw(rows)
+        assert got.audio_raw == summarize_audio_raw(rows)
+        assert got.vocab_raw == summarize_vocab_raw(rows)
+        for kind, raw in (
+            ("visual", got.visual_raw),
+            ("audio", got.audio_raw),
+            ("vocab", got.vocab_raw),
+        ):
+            shown = sum(int(n) for n in re.findall(r"\[(\d+) anomalous", raw))
+            assert getattr(got, f"{kind}_anomalies") == shown
+
+
+def test_extract_windows_slices_transcript_per_span(master_df: pd.DataFrame) -> None:
+    transcript = pd.DataFrame(
+        [
+            {"start": 0.0, "end": 20.0, "text": "long answer", "speaker": "B"},
+            {"start": 1.0, "end": 2.0, "text": "short aside", "speaker": "B"},
+            {"start": 6.0, "end": 7.0, "text": "question", "speaker": "A"},
+            {"start": 21.0, "end": 22.5, "text": "follow-up", "speaker": "B"},
+        ]
+    )
+    spans = [(5.0, 6.0), (21.0, 23.0), (25.0, 26.0)]
+    out = extract_windows(master_df, spans, transcript, speaker_label="B")
+    assert [x.transcript for x in out] == ["long answer", "follow-up", ""]
+    for (start, end), x in zip(spans, out, strict=True):
+        assert x.transcript == extract_transcript_slice(transcript, start, end, speaker_label="B")
+
+
 # --------------------------------------------------------------------------
 # Agent chain end-to-end (stub provider)
 # --------------------------------------------------------------------------
@@ -0,0 +1,101 @@
+"""Per-job budget planner: rank, merge and drop windows to fit the budget."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from agents._settings import AgentSettings
+from agents.orchestrator import _window_input
+from agents.planner import plan_windows
+from agents.window_analyst import SoloWindowInput
+from agents.windows import AnalysisWindow, select_windows, slice_rows
+from pipeline.io.parquet import load_df_parquet_safe
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "tiny_master_df.parquet"
+
+
+@pytest.fixture
+def master_df() -> pd.DataFrame:
+    return load_df_parquet_safe(FIXTURE)
+
+
+def _make(w: AnalysisWindow) -> SoloWindowInput:
+    return _window_input(w, None, "B")
+
+
+def _plan(master_df: pd.DataFrame, inputs: list[SoloWindowInput], **budget: int):
+    return plan_windows(master_df, inputs, _make, settings=AgentSettings(**budget), tier="paid")
+
+
+def test_unlimited_budget_keeps_every_window(master_df: pd.DataFrame) -> None:
+    inputs = [_make(w) for w in select_windows(master_df)]
+    plan = _plan(master_df, inputs)
+    assert [i.window.start for i in plan.inputs] == [i.window.start for i in inputs]
+    assert plan.dropped == plan.merged == 0
+
+
+def test_request_budget_keeps_active_windows_first(master_df: pd.DataFrame) -> None:
+    inputs = [_make(w) for w in select_windows(master_df)]
+    full = _plan(master_df, inputs)
+    plan = _plan(master_df, inputs, agent_job_request_budget=6)
+    assert plan.requests <= 6 < full.requests
+    assert plan.inputs and not any(i.window.is_baseline for i in plan.inputs)
+    # Survivors are back in chronological order with fresh phase context.
+    starts = [i.window.start for i in plan.inputs]
+    assert starts == sorted(starts)
+    assert [i.window.index for i in plan.inputs] == list(range(len(starts)))
+
+
+def test_token_budget_is_respected(master_df: pd.DataFrame) -> None:
+    inputs = [_make(w) for w in select_windows(master_df)]
+    full = _plan(master_df, inputs)
+    plan = _plan(master_df, inputs, agent_job_token_budget=full.tokens // 2)
+    assert plan.tokens <= full.tokens // 2
+    assert 0 < len(plan.inputs) < len(inputs)
+    assert plan.dropped == len(inputs) - len(plan.inputs)
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_close_active_windows_merge_before_dropping(master_df: pd.DataFrame, shuffle: bool) -> None:
+    def active(start: float, end: float) -> SoloWindowInput:
+        rows = slice_rows(master_df, start, end)
+        return _make(AnalysisWindow(start, end, rows, modalities_with_anomalies={"Visual"}))
+
+    inputs = [active(5.0, 6.0), active(8.0, 9.0)]
+    frame = master_df.sample(frac=1.0, random_state=0) if shuffle else master_df
+    full = _plan(frame, inputs)
+    plan = _plan(frame, inputs, agent_job_request_budget=full.requests - 1)
+    assert plan.merged == 1 and plan.dropped == 0
+    (only,) = plan.inputs
+    assert (only.window.start, only.window.end) == (5.0, 9.0)
+    # The merged window reads exactly the rows of its span, whatever the frame order.
+    times = only.window.rows["Time"]
+    assert times.is_monotonic_increasing
+    assert times.min() >= 5.0 and times.max() <= 9.0
+    assert len(only.window.rows) == len(slice_rows(master_df, 5.0, 9.0))
+
+
+def test_budget_below_one_window_still_analyses_one(master_df: pd.DataFrame) -> None:
+    inputs = [_make(w) for w in select_windows(master_df)]
+    plan = _plan(master_df, inputs, agent_job_token_budget=1)
+    assert len(plan.inputs) == 1
+    assert not plan.inputs[0].window.is_baseline
+
+
+def test_each_window_is_priced_once(
+    master_df: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inputs = [_make(w) for w in select_windows(master_df)]
+    renders: list[float] = []
+    real_render = SoloWindowInput.render
+
+    def counting_render(self: SoloWindowInput, **kw: bool) -> str:
+        renders.append(self.window.start)
+        return real_render(self, **kw)
+
+    monkeypatch.setattr(SoloWindowInput, "render", counting_render)
+    _plan(master_df, inputs, agent_job_token_budget=1)
+    assert sorted(renders) == sorted(i.window.start for i in inputs)
@@ -0,0 +1,138 @@
+"""Compact agent inputs and the per-role / per-window usage breakdown."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from agents import _stub, narrative_editor, pattern_weaver, window_analyst
+from agents._cache import cached_run
+from agents._compact import dump_model
+from agents._settings import AgentSettings
+from agents._usage import capture_usage, format_usage, usage_window
+from agents.orchestrator import _window_inputs, build_report
+from agents.schemas import AudioObservation
+from agents.windows import select_windows
+from pipeline.io.parquet import load_df_parquet_safe
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "tiny_master_df.parquet"
+
+
+@pytest.fixture
+def master_df() -> pd.DataFrame:
+    return load_df_parquet_safe(FIXTURE)
+
+
+def test_dump_model_drops_defaults_and_shortens_keys() -> None:
+    obs = AudioObservation(
+        time_range_start=1.0,
+        time_range_end=2.5,
+        overall_vocal_state="Baseline_Calm",
+        contradiction_context="steady",
+    )
+    data = json.loads(dump_model(obs, compact=True))
+    assert data["start"] == 1.0 and data["end"] == 2.5
+    assert "anomalies" not in data and "raw" not in data  # defaults dropped
+    assert "\n" not in dump_model(obs, compact=True)
+    assert "time_range_start" in dump_model(obs, compact=False)
+
+
+async def test_compact_inputs_are_much_smaller(
+    master_df: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LLM_PROVIDER", "stub")
+    inputs = _window_inputs(master_df, select_windows(master_df), None, "B")
+    journal, _ = await build_report(master_df)
+    draft = _stub.stub_pattern_weaver(journal)
+
+    def analyst(compact: bool) -> str:
+        return "".join(
+            window_analyst._format_input(
+                inp.window,
+                _stub.stub_visual(inp.window.start, inp.window.end, inp.visual_events),
+                _stub.stub_audio(inp.window.start, inp.window.end, inp.audio_events),
+                _stub.stub_vocab(inp.window.start, inp.window.end, inp.vocab_events),
+                inp.transcript,
+                compact=compact,
+            )
+            for inp in inputs
+        )
+
+    pairs = {
+        "analyst": (analyst(False), analyst(True)),
+        "weaver": (
+            pattern_weaver._format_input(journal),
+            pattern_weaver._format_input(journal, compact=True),
+        ),
+        "editor": (
+            narrative_editor._format_input(draft),
+            narrative_editor._format_input(draft, compact=True),
+        ),
+    }
+    for name, (verbose, compact) in pairs.items():
+        assert len(compact) < 0.8 * len(verbose), name
+
+
+class _TimedAgent:
+    async def run(self, user_msg: str) -> SimpleNamespace:
+        usage = SimpleNamespace(input_tokens=len(user_msg), output_tokens=5, requests=1)
+        return SimpleNamespace(output=_stub.stub_audio(0.0, 1.0, []), usage=lambda: usage)
+
+
+async def test_usage_is_broken_down_by_role_and_window() -> None:
+    settings = AgentSettings(llm_provider="groq", llm_cache_enabled=False)
+
+    async def call(msg: str, role: str) -> None:
+        await cached_run(
+            _TimedAgent(),
+            msg,
+            system_prompt="p",
+            output_type=AudioObservation,
+            settings=settings,
+            role=role,
+        )
+
+    with capture_usage() as usage:
+        with usage_window("0.00–3.00s"):
+            await call("aaaa", "audio_observer")
+            await call("bb", "window_analyst")
+        await call("cccccc", "pattern_weaver")
+
+    assert usage.input_tokens == 12 and usage.requests == 3
+    assert usage.by_role["audio_observer"].input_tokens == 4
+    assert usage.by_role["pattern_weaver"].input_tokens == 6
+    assert list(usage.by_window) == ["0.00–3.00s"]
+    assert usage.by_window["0.00–3.00s"].input_tokens == 6
+    assert usage.latency_sec >= 0.0
+    report = format_usage(usage)
+    assert report.index("pattern_weaver") < report.index("audio_observer")  # heaviest first
+    assert "0.00–3.00s" in report
+
+
+class _FailingAgent:
+    async def run(self, user_msg: str) -> SimpleNamespace:
+        raise TimeoutError("provider timed out")
+
+
+async def test_failed_calls_are_counted_with_their_latency() -> None:
+    settings = AgentSettings(llm_provider="groq", llm_cache_enabled=False)
+    with capture_usage() as usage, usage_window("0.00–3.00s"):
+        with pytest.raises(TimeoutError):
+            await cached_run(
+                _FailingAgent(),
+                "aaaa",
+                system_prompt="p",
+                output_type=AudioObservation,
+                settings=settings,
+                role="audio_observer",
+            )
+
+    assert (usage.failures, usage.requests, usage.input_tokens) == (1, 0, 0)
+    assert usage.by_role["audio_observer"].failures == 1
+    assert usage.by_window["0.00–3.00s"].failures == 1
+    assert usage.latency_sec >= 0.0
+    assert "failures=1" in format_usage(usage)
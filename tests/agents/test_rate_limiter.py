@@ -0,0 +1,74 @@
+"""Proactive LLM pacing: token-bucket math and the shared per-key limiter."""
+
+from __future__ import annotations
+
+import pytest
+
+from agents import _ratelimit
+from agents._ratelimit import (
+    RateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+    reset_rate_limiters,
+)
+from agents._settings import AgentSettings, RateLimit
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters() -> None:
+    reset_rate_limiters()
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1_000.0]
+    monkeypatch.setattr(_ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_a_burst_then_spaces_requests(clock: list[float]) -> None:
+    bucket = TokenBucket(per_minute=60)  # 1/s, burst 60
+    assert all(bucket.reserve(1) == 0.0 for _ in range(60))
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)  # queued behind the previous caller
+
+    clock[0] += 2.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_settle_refunds_overestimated_tokens(clock: list[float]) -> None:
+    limiter = RateLimiter(rpm=0, tpm=6_000)
+    assert limiter.tokens is not None
+    assert limiter.tokens.reserve(5_000) == 0.0
+    assert limiter.tokens.reserve(2_000) > 0  # 1,000 tokens short
+    limiter.settle(5_000, 1_000)  # the first call actually used 1,000
+    assert limiter.tokens.reserve(0) == 0.0
+
+
+async def test_acquire_sleeps_for_the_reservation(
+    clock: list[float], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    slept: list[float] = []
+
+    async def _sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    monkeypatch.setattr(_ratelimit.asyncio, "sleep", _sleep)
+    limiter = RateLimiter(rpm=2, tpm=0)
+    for _ in range(3):
+        await limiter.acquire(100)
+    assert slept == [pytest.approx(30.0)]
+
+
+def test_limiter_is_shared_per_key_and_model() -> None:
+    base = AgentSettings(
+        llm_provider="groq",
+        llm_model="google-gla:gemini-2.5-flash",
+        gemini_api_key="server-key",
+        llm_rate_limits={"google-gla:gemini-2.5-flash": RateLimit(rpm=10, tpm=250_000)},
+    )
+    limiter = get_rate_limiter(base)
+    assert limiter is not None
+    assert get_rate_limiter(base.model_copy()) is limiter
+    assert get_rate_limiter(base.model_copy(update={"gemini_api_key": "byok"})) is not limiter
+    assert get_rate_limiter(base.model_copy(update={"llm_model": "groq:other"})) is None
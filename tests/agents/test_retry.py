@@ -0,0 +1,131 @@
+"""Retry backoff: server retry hints, jitter and AIMD concurrency feedback."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from agents import _retry
+from agents._retry import (
+    AdaptiveSemaphore,
+    is_transient,
+    reset_adaptive_limit,
+    retry_after,
+    use_adaptive_limit,
+    with_retries,
+)
+
+
+class _ModelError(Exception):
+    def __init__(self, message: str, body: object = None) -> None:
+        super().__init__(message)
+        self.body = body
+
+
+def test_retry_after_reads_provider_hints() -> None:
+    gemini = _ModelError(
+        "status_code: 429, model_name: gemini-2.5-flash",
+        body={"error": {"details": [{"@type": "RetryInfo", "retryDelay": "37s"}]}},
+    )
+    assert retry_after(gemini) == 37.0
+    assert retry_after(RuntimeError("Rate limit reached. Please try again in 1m7.5s.")) == 67.5
+    assert retry_after(RuntimeError("Please try again in 750ms")) == 0.75
+    assert retry_after(RuntimeError("429 quota exceeded")) is None
+
+
+def test_retry_after_prefers_header_on_wrapped_cause() -> None:
+    request = httpx.Request("POST", "https://api.example")
+    response = httpx.Response(429, headers={"retry-after": "12"}, request=request)
+    cause = httpx.HTTPStatusError("429", request=request, response=response)
+    try:
+        try:
+            raise cause
+        except httpx.HTTPStatusError as e:
+            raise _ModelError("status_code: 429, try again in 3s") from e
+    except _ModelError as wrapped:
+        assert retry_after(wrapped) == 12.0
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    slept: list[float] = []
+
+    async def _sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    monkeypatch.setattr(_retry.asyncio, "sleep", _sleep)
+    return slept
+
+
+def _failing(errors: list[Exception]) -> object:
+    async def _call() -> str:
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return _call
+
+
+async def test_rate_limit_waits_for_the_server_hint(sleeps: list[float]) -> None:
+    call = _failing([RuntimeError("429 rate limit. Please try again in 20s")])
+    assert await with_retries(call) == "ok"  # type: ignore[arg-type]
+    assert len(sleeps) == 1
+    assert 20.0 <= sleeps[0] <= 20.0 + _retry._HINT_JITTER
+
+
+async def test_backoff_is_jittered_and_bounded(sleeps: list[float]) -> None:
+    call = _failing([RuntimeError("429 rate limit")] * 5)
+    await with_retries(call)  # type: ignore[arg-type]
+    assert len(sleeps) == 5
+    assert all(_retry._RATE_LIMIT_MIN_DELAY <= s <= _retry._MAX_DELAY for s in sleeps)
+    assert len(set(sleeps)) > 1
+
+
+async def test_retry_if_limits_retries_to_matching_errors(sleeps: list[float]) -> None:
+    call = _failing([ValueError("bad output")])
+    with pytest.raises(ValueError):
+        await with_retries(call, retry_if=is_transient)  # type: ignore[arg-type]
+    assert sleeps == []
+
+    call = _failing([TimeoutError(), RuntimeError("429 rate limit")])
+    assert await with_retries(call, retry_if=is_transient) == "ok"  # type: ignore[arg-type]
+    assert len(sleeps) == 2
+
+
+async def test_rate_limits_shrink_and_successes_regrow_the_limit(
+    sleeps: list[float], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clock = [0.0]
+    monkeypatch.setattr(_retry.time, "monotonic", lambda: clock[0])
+    sem = AdaptiveSemaphore(8)
+    token = use_adaptive_limit(sem)
+    try:
+        await with_retries(_failing([RuntimeError("429")] * 2))  # type: ignore[arg-type]
+        # Two 429s inside the cooldown halve once (the final success adds 1/limit).
+        assert int(sem.limit) == 4
+        clock[0] += _retry._AIMD_COOLDOWN_SEC
+        await with_retries(_failing([RuntimeError("429")]))  # type: ignore[arg-type]
+        assert int(sem.limit) == 2
+        for _ in range(40):  # +1 per round of `limit` successes
+            await with_retries(_failing([]))  # type: ignore[arg-type]
+        assert sem.limit == 8
+    finally:
+        reset_adaptive_limit(token)
+
+
+async def test_adaptive_semaphore_caps_concurrency() -> None:
+    sem = AdaptiveSemaphore(4)
+    sem.limit = 2
+    peak = 0
+
+    async def _work() -> None:
+        nonlocal peak
+        async with sem:
+            peak = max(peak, sem.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(_work() for _ in range(6)))
+    assert peak == 2
+    assert sem.active == 0
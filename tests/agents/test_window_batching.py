@@ -0,0 +1,145 @@
+"""Free-tier batching: K consecutive windows per request, split on bad replies."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from agents import _stub, window_analyst
+from agents._ratelimit import estimate_input_tokens
+from agents._settings import AgentSettings
+from agents.orchestrator import _window_input, build_report
+from agents.schemas import WindowAnalysis, WindowAnalysisBatch
+from agents.window_analyst import SoloWindowInput, plan_batches, run_window_analyst_batch
+from agents.windows import select_windows
+from pipeline.io.parquet import load_df_parquet_safe
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "tiny_master_df.parquet"
+
+
+@pytest.fixture
+def inputs() -> list[SoloWindowInput]:
+    master_df = load_df_parquet_safe(FIXTURE)
+    return [_window_input(w, None, "B") for w in select_windows(master_df)]
+
+
+def _note(inp: SoloWindowInput) -> WindowAnalysis:
+    w = inp.window
+    return _stub.stub_window_analysis(
+        w.start,
+        w.end,
+        w.phase,
+        w.position_pct,
+        _stub.stub_visual(w.start, w.end, inp.visual_events),
+        _stub.stub_audio(w.start, w.end, inp.audio_events),
+        _stub.stub_vocab(w.start, w.end, inp.vocab_events),
+        "",
+    )
+
+
+class _FlakyBatchAgent:
+    """Answers batches of up to `max_ok` windows; larger ones drop a note (or,
+    with `raise_on_fail`, fail the way an unparseable reply does)."""
+
+    def __init__(
+        self,
+        inputs: list[SoloWindowInput],
+        max_ok: int,
+        *,
+        compact: bool,
+        raise_on_fail: bool = False,
+    ) -> None:
+        self.by_msg = {inp.render(compact=compact): inp for inp in inputs}
+        self.max_ok = max_ok
+        self.raise_on_fail = raise_on_fail
+        self.batch_sizes: list[int] = []
+
+    async def run(self, user_msg: str) -> SimpleNamespace:
+        if user_msg in self.by_msg:  # single-window fallback
+            output: object = _note(self.by_msg[user_msg])
+        else:
+            batch = [inp for msg, inp in self.by_msg.items() if msg in user_msg]
+            self.batch_sizes.append(len(batch))
+            if self.raise_on_fail and len(batch) > self.max_ok:
+                raise ValueError("Exceeded maximum retries for output validation")
+            notes = [_note(inp) for inp in batch]
+            output = WindowAnalysisBatch(
+                analyses=notes if len(batch) <= self.max_ok else notes[:-1]
+            )
+        return SimpleNamespace(output=output, usage=lambda: None)
+
+
+def test_plan_batches_respects_count_and_token_budget(inputs: list[SoloWindowInput]) -> None:
+    assert len(inputs) >= 4
+    by_count = plan_batches(inputs, max_windows=3, token_budget=10**9)
+    assert [len(b) for b in by_count[:-1]] == [3] * (len(by_count) - 1)
+    assert [inp for b in by_count for inp in b] == inputs  # consecutive, in order
+
+    one_each = plan_batches(inputs, max_windows=10, token_budget=1)
+    assert [len(b) for b in one_each] == [1] * len(inputs)
+
+    # Every window also reserves room for its note in the reply.
+    allowance = window_analyst._NOTE_TOKEN_ALLOWANCE
+    pair = sum(estimate_input_tokens(inp.render()) + allowance for inp in inputs[:2])
+    for budget, sizes in ((pair, [2]), (pair - 1, [1, 1])):
+        batches = plan_batches(inputs[:2], max_windows=10, token_budget=budget)
+        assert [len(b) for b in batches] == sizes
+
+
+async def test_mismatched_batch_is_split_until_it_validates(
+    inputs: list[SoloWindowInput], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    batch = inputs[:4]
+    settings = AgentSettings(llm_provider="groq", llm_cache_enabled=False)
+    agent = _FlakyBatchAgent(batch, max_ok=2, compact=settings.agent_compact_prompts)
+    monkeypatch.setattr(window_analyst, "make_agent", lambda **_: agent)
+
+    notes = await run_window_analyst_batch(batch, settings=settings)
+
+    assert agent.batch_sizes == [4, 2, 2]
+    assert [n.time_start for n in notes] == [inp.window.start for inp in batch]
+
+
+async def test_invalid_batch_is_split_without_resending(
+    inputs: list[SoloWindowInput], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    batch = inputs[:4]
+    settings = AgentSettings(llm_provider="groq", llm_cache_enabled=False)
+    agent = _FlakyBatchAgent(
+        batch, max_ok=2, compact=settings.agent_compact_prompts, raise_on_fail=True
+    )
+    monkeypatch.setattr(window_analyst, "make_agent", lambda **_: agent)
+
+    notes = await run_window_analyst_batch(batch, settings=settings)
+
+    assert agent.batch_sizes == [4, 2, 2]  # the bad batch was sent exactly once
+    assert len(notes) == 4
+
+
+async def test_mismatched_batch_reply_is_not_cached(
+    inputs: list[SoloWindowInput], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    batch = inputs[:4]
+    settings = AgentSettings(llm_provider="groq", llm_cache_path=str(tmp_path / "c.db"))
+    agent = _FlakyBatchAgent(batch, max_ok=2, compact=settings.agent_compact_prompts)
+    monkeypatch.setattr(window_analyst, "make_agent", lambda **_: agent)
+
+    await run_window_analyst_batch(batch, settings=settings)
+    await run_window_analyst_batch(batch, settings=settings)
+
+    # Rerun: the halves replay from cache; the short reply was never stored.
+    assert agent.batch_sizes == [4, 2, 2, 4]
+
+
+async def test_free_tier_batching_matches_per_window_journal(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LLM_PROVIDER", "stub")
+    master_df: pd.DataFrame = load_df_parquet_safe(FIXTURE)
+    batched, _ = await build_report(master_df, tier="free")
+    monkeypatch.setenv("AGENT_BATCH_MAX_WINDOWS", "1")
+    single, _ = await build_report(master_df, tier="free")
+    assert batched == single
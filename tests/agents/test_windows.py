@@ -117,3 +117,39 @@ def test_empty_and_degenerate_df() -> None:
     ws = select_windows(one)
     assert all(w.position_pct == 0.0 for w in ws)
     _ = np  # keep import used if assertions above change
+
+
+def test_merge_sweep_chains_through_long_ranges() -> None:
+    # (0, 10) swallows (2, 3); (10.5, 12) is within `gap` of the running max end.
+    starts = np.array([2.0, 0.0, 10.5, 20.0])
+    ends = np.array([3.0, 10.0, 12.0, 21.0])
+    peaks = np.array([4.0, 2.5, 3.0, 0.0])
+    codes = np.array([1, 0, 2, 0])
+    merged = windows_mod._merge_overlapping(starts, ends, peaks, codes, gap=1.0)
+    assert merged == [
+        (0.0, 12.0, {"Visual", "Audio", "Verbal"}, 4.0),
+        (20.0, 21.0, {"Visual"}, 0.0),
+    ]
+
+
+def test_windows_carry_peak_rz_of_their_ranges(master_df: pd.DataFrame) -> None:
+    for w in select_windows(master_df):
+        peak = 0.0
+        for col in windows_mod._ANOMALY_COLUMNS:
+            for cell in w.rows.get(col, []):
+                if isinstance(cell, dict) and cell.get("part_of_anomalous_range"):
+                    peak = max(peak, windows_mod._abs_rz(cell))
+        assert w.peak_rz == pytest.approx(peak)
+        assert (w.peak_rz > 0) == (not w.is_baseline)
+
+
+def test_slice_rows_matches_inclusive_mask(master_df: pd.DataFrame) -> None:
+    rows = windows_mod.slice_rows(master_df, 5.0, 9.5)
+    expected = master_df[(master_df["Time"] >= 5.0) & (master_df["Time"] <= 9.5)]
+    assert rows["Time"].tolist() == expected["Time"].tolist()
+
+
+def test_select_windows_sorts_unsorted_input(master_df: pd.DataFrame) -> None:
+    shuffled = master_df.sample(frac=1.0, random_state=0)
+    got = [(w.start, w.end, len(w.rows)) for w in select_windows(shuffled)]
+    assert got == [(w.start, w.end, len(w.rows)) for w in select_windows(master_df)]
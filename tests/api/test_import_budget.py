@@ -0,0 +1,75 @@
+"""Import-time budget for the API app.
+
+Stage modules import mediapipe, torch (whisper), librosa, cv2, moviepy,
+pysad/rrcf and assemblyai on first use, so an API worker boots without
+them. These tests run `python -X importtime` in a fresh interpreter and fail
+if a heavy dependency sneaks back into the import graph or the app's
+cumulative import time exceeds the budget (override with
+`MMR_IMPORT_BUDGET_S` on slow machines).
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = (
+    "assemblyai",
+    "cv2",
+    "librosa",
+    "mediapipe",
+    "moviepy",
+    "pysad",
+    "rrcf",
+    "sklearn",
+    "torch",
+    "whisper_timestamped",
+)
+
+IMPORT_BUDGET_S = float(os.environ.get("MMR_IMPORT_BUDGET_S", "5.0"))
+
+
+def _importtime(statement: str) -> dict[str, int]:
+    """Top-level module -> cumulative import µs, from `-X importtime` output."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+    )
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line.split("|")
+        if cum.strip().isdigit():
+            cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+@pytest.fixture(scope="module")
+def app_imports() -> dict[str, int]:
+    return _importtime("import backend.app.main")
+
+
+def test_api_app_does_not_import_heavy_stage_dependencies(app_imports: dict[str, int]) -> None:
+    loaded = sorted(m for m in HEAVY_MODULES if m in app_imports)
+    assert loaded == [], f"heavy modules imported by backend.app.main: {loaded}"
+
+
+def test_api_app_imports_within_budget(app_imports: dict[str, int]) -> None:
+    seconds = app_imports["backend.app.main"] / 1e6
+    assert seconds < IMPORT_BUDGET_S, f"backend.app.main took {seconds:.2f}s to import"
+
+
+def test_pipeline_cli_module_does_not_import_heavy_stage_dependencies() -> None:
+    imports = _importtime("import pipeline.orchestrator")
+    assert sorted(m for m in HEAVY_MODULES if m in imports) == []
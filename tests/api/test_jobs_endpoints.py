@@ -224,3 +224,20 @@ def test_logs_returns_tail(client: TestClient, tiny_parquet_path: Path) -> None:
     assert "lines" in body
     # Logs are written during stage transitions; should be non-empty for succeeded job.
     assert isinstance(body["lines"], list)
+
+
+def test_master_df_json_time_range_and_columns(client: TestClient, tiny_parquet_path: Path) -> None:
+    job_id = _upload(client, tiny_parquet_path)
+    r = client.get(
+        f"/api/jobs/{job_id}/master_df",
+        params={"format": "json", "start": 5.0, "end": 6.0, "columns": ["blinking_data"]},
+    )
+    assert r.status_code == 200
+    records = r.json()
+    assert [rec["Time"] for rec in records] == [5.0, 5.5, 6.0]
+    assert set(records[0]) == {"Time", "blinking_data"}
+
+    bad = client.get(
+        f"/api/jobs/{job_id}/master_df", params={"format": "json", "columns": ["nope"]}
+    )
+    assert bad.status_code == 400
@@ -0,0 +1,109 @@
+"""Admission control: priority slot pools and queue positions."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.db import session_scope
+from backend.app.models import Job
+from backend.app.services.scheduler import PrioritySlots, tier_priority
+
+
+def test_slots_cap_concurrency_and_admit_paid_first() -> None:
+    slots = PrioritySlots(1)
+    order: list[str] = []
+    release = threading.Event()
+
+    def _holder() -> None:
+        with slots.slot():
+            release.wait(5)
+
+    def _waiter(name: str, tier: str) -> None:
+        with slots.slot(tier_priority(tier)):
+            order.append(name)
+
+    holder = threading.Thread(target=_holder)
+    holder.start()
+    while slots.active == 0:
+        time.sleep(0.001)
+
+    # Free job arrives first, paid second — paid still runs first.
+    waiters = [
+        threading.Thread(target=_waiter, args=("free", "free")),
+        threading.Thread(target=_waiter, args=("paid", "paid")),
+    ]
+    for t in waiters:
+        t.start()
+        while slots.waiting < waiters.index(t) + 1:
+            time.sleep(0.001)
+    assert order == []
+
+    release.set()
+    for t in (holder, *waiters):
+        t.join(5)
+    assert order == ["paid", "free"]
+    assert slots.active == 0
+
+
+def test_queue_position_orders_paid_before_free(settings: Settings, client: TestClient) -> None:
+    now = datetime.now(UTC)
+    with session_scope(settings) as session:
+        for job_id, tier, age in (("free-old", "free", 3), ("paid-new", "paid", 1)):
+            session.add(
+                Job(
+                    id=job_id,
+                    filename="x.mp4",
+                    upload_path="/nope",
+                    tier=tier,
+                    created_at=now - timedelta(minutes=age),
+                )
+            )
+        session.add(Job(id="done", filename="x.mp4", upload_path="/nope", status="succeeded"))
+        session.commit()
+
+    assert client.get("/api/jobs/paid-new").json()["queue_position"] == 1
+    assert client.get("/api/jobs/free-old").json()["queue_position"] == 2
+    assert client.get("/api/jobs/done").json()["queue_position"] is None
+    listed = {j["id"]: j["queue_position"] for j in client.get("/api/jobs").json()["items"]}
+    assert listed == {"free-old": 2, "paid-new": 1, "done": None}
+
+
+async def test_async_waiters_queue_without_threads() -> None:
+    slots = PrioritySlots(1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def _holder() -> None:
+        async with slots.slot_async():
+            await release.wait()
+
+    async def _waiter(name: str, tier: str) -> None:
+        async with slots.slot_async(tier_priority(tier)):
+            order.append(name)
+
+    threads = threading.active_count()
+    tasks = [asyncio.create_task(_holder())]
+    await asyncio.sleep(0)
+    for name, tier in (("free", "free"), ("paid", "paid")):
+        tasks.append(asyncio.create_task(_waiter(name, tier)))
+        await asyncio.sleep(0)
+    assert (slots.active, slots.waiting) == (1, 2)
+    assert threading.active_count() == threads
+
+    # A cancelled waiter leaves the queue instead of taking a slot later.
+    gone = asyncio.create_task(_waiter("cancelled", "paid"))
+    await asyncio.sleep(0)
+    gone.cancel()
+    await asyncio.gather(gone, return_exceptions=True)
+    assert slots.waiting == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["paid", "free"]
+    assert slots.active == 0
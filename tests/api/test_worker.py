@@ -0,0 +1,243 @@
+"""Worker-mode job execution: DB claiming, heartbeats, stale re-queueing."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import worker
+from backend.app.config import Settings, get_settings
+from backend.app.db import session_scope
+from backend.app.models import Job
+from backend.app.services.job_queue import (
+    STALE_ERROR,
+    claim_next_job,
+    heartbeat,
+    requeue_stale_jobs,
+)
+from backend.worker import run_worker
+from tests.api.test_jobs_endpoints import _upload
+
+
+@pytest.fixture
+def worker_settings(settings: Settings, monkeypatch: pytest.MonkeyPatch) -> Settings:
+    monkeypatch.setenv("JOB_EXECUTOR", "worker")
+    monkeypatch.setenv("WORKER_POLL_INTERVAL_SEC", "0.05")
+    get_settings.cache_clear()
+    return get_settings()
+
+
+def _crash_first_child(job_id: str, settings: Settings) -> str | None:
+    """Pool entrypoint whose first call kills its process outright."""
+    marker = settings.processed_dir / f"{job_id}.crashed"
+    if not marker.exists():
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        os._exit(1)
+    return worker.run_pipeline_phase_in_child(job_id, settings)
+
+
+def _add_job(settings: Settings, job_id: str, **fields: object) -> None:
+    with session_scope(settings) as session:
+        session.add(Job(id=job_id, filename="x.mp4", upload_path="/nope", **fields))
+        session.commit()
+
+
+def _get(settings: Settings, job_id: str) -> Job:
+    with session_scope(settings) as session:
+        job = session.get(Job, job_id)
+        assert job is not None
+        session.expunge(job)
+        return job
+
+
+def test_worker_mode_queues_and_worker_runs_job(
+    worker_settings: Settings, client: TestClient, tiny_parquet_path: Path
+) -> None:
+    job_id = _upload(client, tiny_parquet_path)
+    assert client.get(f"/api/jobs/{job_id}").json()["status"] == "queued"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        ran = run_worker(worker_settings, drain=True, executor=pool)
+
+    assert ran == 1
+    job = _get(worker_settings, job_id)
+    assert job.status == "succeeded"
+    assert job.attempts == 1
+    assert job.worker_id
+    assert client.get(f"/api/jobs/{job_id}/report").status_code == 200
+
+
+def test_agent_phases_overlap_while_pipeline_slot_moves_on(
+    worker_settings: Settings,
+    client: TestClient,
+    tiny_parquet_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    job_ids = [_upload(client, tiny_parquet_path) for _ in range(2)]
+    started: list[str] = []
+    release = threading.Event()
+    real_agent_phase = worker.run_agent_phase
+
+    async def _held_agent_phase(job_id: str, settings: Settings, speaker_label: str) -> None:
+        started.append(job_id)
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        await real_agent_phase(job_id, settings, speaker_label)
+
+    monkeypatch.setattr(worker, "run_agent_phase", _held_agent_phase)
+    result: list[int] = []
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        t = threading.Thread(
+            target=lambda: result.append(
+                run_worker(worker_settings, concurrency=1, drain=True, executor=pool)
+            )
+        )
+        t.start()
+        deadline = time.monotonic() + 10
+        # One pipeline slot, yet both jobs reach the agent loop concurrently.
+        while len(started) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        t.join(10)
+
+    assert sorted(started) == sorted(job_ids)
+    assert result == [2]
+    assert all(_get(worker_settings, j).status == "succeeded" for j in job_ids)
+
+
+def test_worker_mode_rejects_per_request_keys(
+    worker_settings: Settings, client: TestClient, tiny_parquet_path: Path
+) -> None:
+    with tiny_parquet_path.open("rb") as f:
+        r = client.post(
+            "/api/jobs",
+            files={"video": (tiny_parquet_path.name, f, "application/octet-stream")},
+            data={"gemini_api_key": "user-key"},
+        )
+    assert r.status_code == 400
+
+
+def test_claim_is_exclusive_and_oldest_first(settings: Settings) -> None:
+    now = datetime.now(UTC)
+    _add_job(settings, "newer", created_at=now)
+    _add_job(settings, "older", created_at=now - timedelta(minutes=1))
+
+    assert claim_next_job(settings, "w1") == "older"
+    assert claim_next_job(settings, "w2") == "newer"
+    assert claim_next_job(settings, "w3") is None
+    job = _get(settings, "older")
+    assert (job.status, job.worker_id, job.attempts) == ("running", "w1", 1)
+
+
+def test_stale_jobs_are_requeued_then_failed(settings: Settings) -> None:
+    _add_job(settings, "j")
+    assert claim_next_job(settings, "dead") == "j"
+
+    # Fresh heartbeat: nothing to do.
+    heartbeat(settings, "dead", ["j"])
+    assert requeue_stale_jobs(settings) == []
+
+    old = datetime.now(UTC) - timedelta(seconds=settings.worker_stale_after_sec + 5)
+    with session_scope(settings) as session:
+        job = session.get(Job, "j")
+        assert job is not None
+        job.heartbeat_at = old
+        job.attempts = 1
+        session.add(job)
+        session.commit()
+    assert requeue_stale_jobs(settings) == ["j"]
+    job = _get(settings, "j")
+    assert (job.status, job.worker_id) == ("queued", None)
+
+    # Once out of attempts, a stale job fails instead of looping.
+    assert claim_next_job(settings, "dead-again") == "j"
+    with session_scope(settings) as session:
+        job = session.get(Job, "j")
+        assert job is not None
+        job.heartbeat_at = old
+        job.attempts = settings.worker_max_attempts
+        session.add(job)
+        session.commit()
+    assert requeue_stale_jobs(settings) == []
+    job = _get(settings, "j")
+    assert (job.status, job.error) == ("failed", STALE_ERROR)
+
+
+def test_job_logs_stay_isolated_in_process(tmp_path: Path) -> None:
+    from backend.app.services import job_runner
+
+    log = logging.getLogger("backend.test_job_log")
+    root_handlers = list(logging.getLogger().handlers)
+    barrier = threading.Barrier(2)
+
+    def _run(job_id: str) -> None:
+        with job_runner._job_log(tmp_path / job_id / "job.log", job_id):
+            barrier.wait()
+            log.warning("record from %s", job_id)
+            barrier.wait()
+
+    threads = [threading.Thread(target=_run, args=(j,)) for j in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    assert logging.getLogger().handlers == root_handlers
+    for job_id, other in (("a", "b"), ("b", "a")):
+        text = (tmp_path / job_id / "job.log").read_text()
+        assert f"record from {job_id}" in text
+        assert f"record from {other}" not in text
+
+
+@pytest.mark.parametrize("crashes", [1, 3])
+def test_broken_pool_requeues_until_max_attempts(
+    worker_settings: Settings,
+    client: TestClient,
+    tiny_parquet_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    crashes: int,
+) -> None:
+    job_id = _upload(client, tiny_parquet_path)
+    calls: list[str] = []
+    real_pipeline_phase = worker.run_pipeline_phase
+
+    def _crashing(job_id: str, settings: Settings) -> str | None:
+        calls.append(job_id)
+        if len(calls) <= crashes:
+            raise BrokenProcessPool("child died")
+        return real_pipeline_phase(job_id, settings)
+
+    monkeypatch.setattr(worker, "run_pipeline_phase", _crashing)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert run_worker(worker_settings, concurrency=1, drain=True, executor=pool) == 1
+
+    job = _get(worker_settings, job_id)
+    max_attempts = worker_settings.worker_max_attempts
+    assert job.attempts == min(crashes + 1, max_attempts)
+    assert job.status == ("succeeded" if crashes < max_attempts else "failed")
+
+
+def test_crashed_process_pool_is_replaced_and_job_retried(
+    worker_settings: Settings,
+    client: TestClient,
+    tiny_parquet_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    job_id = _upload(client, tiny_parquet_path)
+    monkeypatch.setattr(worker, "run_pipeline_phase_in_child", _crash_first_child)
+
+    assert run_worker(worker_settings, concurrency=1, drain=True) == 1
+
+    job = _get(worker_settings, job_id)
+    assert (job.status, job.attempts) == ("succeeded", 2)
@@ -10,13 +10,18 @@ import pytest
 
 from pipeline.anomaly import (
     adaptive_n_sigma,
+    anomalous_runs,
+    anomalous_time_ranges,
     get_anomalous_time_ranges,
     get_threshold_mad,
     robust_zscore,
     run_rrcf,
+    run_rrcf_joint,
+    shingle_features,
     smooth_and_rz_audio,
     smooth_and_rz_visual,
 )
+from pipeline.anomaly.smoothing import AUDIO_SPANS
 
 # ---------- run_rrcf ----------
 
@@ -40,6 +45,41 @@ def test_run_rrcf_spike_scores_higher_than_baseline() -> None:
     assert scores[-1] >= np.percentile(scores, 75)
 
 
+# ---------- run_rrcf_joint / shingle_features ----------
+
+
+def test_shingle_features_stacks_predecessors() -> None:
+    x = np.arange(8, dtype=float).reshape(4, 2)
+    out = shingle_features(x, shingle=3)
+    assert out.shape == (4, 6)
+    # Row 3 = [x1, x2, x3]; row 0 is left-padded with x0.
+    assert out[3].tolist() == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+    assert out[0].tolist() == [0.0, 1.0, 0.0, 1.0, 0.0, 1.0]
+
+
+def test_shingle_features_size_one_is_identity() -> None:
+    x = np.arange(6, dtype=float).reshape(3, 2)
+    assert np.array_equal(shingle_features(x, shingle=1), x)
+
+
+def test_run_rrcf_joint_attributions_sum_to_score() -> None:
+    rng = np.random.default_rng(0)
+    features = rng.normal(0, 1, (60, 3))
+    scores, attr = run_rrcf_joint(features, num_trees=10, tree_size=64, shingle=2)
+    assert scores.shape == (60,)
+    assert attr.shape == (60, 3)
+    assert np.allclose(attr.sum(axis=1), scores)
+
+
+def test_run_rrcf_joint_attributes_spike_to_its_feature() -> None:
+    rng = np.random.default_rng(0)
+    features = rng.normal(0, 1, (80, 3))
+    features[70:74, 1] = 40.0  # sustained shift in feature 1 only
+    scores, attr = run_rrcf_joint(features, num_trees=20, tree_size=64, shingle=4)
+    assert scores[70] >= np.percentile(scores, 90)
+    assert int(np.argmax(attr[70])) == 1
+
+
 # ---------- get_threshold_mad ----------
 
 
@@ -104,6 +144,32 @@ def test_get_anomalous_time_ranges_drops_isolated_singletons() -> None:
     assert out[0] == [5.0, 5.5, 6.0]
 
 
+def test_anomalous_runs_returns_inclusive_indices() -> None:
+    times = np.array([0.5, 1.0, 1.5, 4.0, 4.5, 9.0])
+    starts, ends = anomalous_runs(times, min=0.5, max=2.0)
+    assert starts.tolist() == [0, 3]
+    assert ends.tolist() == [2, 4]
+
+
+def test_anomalous_runs_empty() -> None:
+    starts, ends = anomalous_runs(np.array([]))
+    assert len(starts) == 0
+    assert len(ends) == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_anomalous_time_ranges_matches_legacy(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    # Half-second grid with random holes + a few sub-min gaps.
+    times = np.sort(rng.choice(np.arange(0, 60, 0.25), size=80, replace=False))
+    legacy = get_anomalous_time_ranges(pd.DataFrame({"Time": times}), min=0.5, max=2.0)
+    assert anomalous_time_ranges(times, min=0.5, max=2.0) == legacy
+
+
+def test_anomalous_time_ranges_single_point_matches_legacy() -> None:
+    assert anomalous_time_ranges(np.array([3.5])) == [[3.5]]
+
+
 # ---------- robust_zscore + smoothing ----------
 
 
@@ -158,3 +224,54 @@ def test_smooth_and_rz_audio_only_smooths_target_speaker() -> None:
     # Speaker A rows should have NaN smoothed values (mask excluded them)
     assert out.loc[0, "loudness_db_smooth"] != out.loc[0, "loudness_db_smooth"]  # NaN
     assert not np.isnan(out.loc[10, "loudness_db_smooth"])
+
+
+def _legacy_smooth_and_rz_audio(df: pd.DataFrame, speaker: str) -> pd.DataFrame:
+    """Reference pandas implementation the fused kernel replaced."""
+    df = df.copy()
+    mask = df["speaker"] == speaker
+    for col, span in AUDIO_SPANS.items():
+        smooth_col = f"{col}_smooth"
+        df[smooth_col] = np.nan
+        temp = df.loc[mask, col].ewm(span=span, adjust=False).mean()
+        df.loc[temp.index, smooth_col] = temp.values
+        s = df[smooth_col].astype(float)
+        median = np.nanmedian(s)
+        mad = np.nanmedian(np.abs(s - median))
+        df[f"{smooth_col}_rz"] = 0.0 if mad <= 0 else (s - median) / (1.4826 * mad)
+    return df
+
+
+def test_fused_audio_kernel_matches_pandas_reference() -> None:
+    rng = np.random.default_rng(3)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "speaker": rng.choice(["A", "B"], size=n),
+            "loudness_db": rng.normal(-20, 5, n),
+            "pitch_relative_st": rng.normal(0, 1, n),
+            "pitch_expressiveness_st": rng.gamma(2.0, 1.0, n),
+            "wps": rng.normal(2.5, 0.5, n),
+        }
+    )
+    df.loc[rng.choice(n, 15, replace=False), "wps"] = np.nan  # exercises the NaN fallback
+    expected = _legacy_smooth_and_rz_audio(df, "B")
+    out = smooth_and_rz_audio(df, speaker="B")
+    for col in AUDIO_SPANS:
+        for suffix in ("_smooth", "_smooth_rz"):
+            np.testing.assert_allclose(
+                out[col + suffix].to_numpy(), expected[col + suffix].to_numpy(), rtol=1e-9
+            )
+
+
+def test_smooth_and_rz_visual_does_not_mutate_input_by_default() -> None:
+    df = pd.DataFrame({"blink_intensity": np.linspace(0, 1, 10)})
+    smooth_and_rz_visual(df)
+    assert list(df.columns) == ["blink_intensity"]
+
+
+def test_smooth_and_rz_visual_inplace_adds_columns() -> None:
+    df = pd.DataFrame({"blink_intensity": np.linspace(0, 1, 10)})
+    out = smooth_and_rz_visual(df, inplace=True)
+    assert out is df
+    assert "blink_intensity_smooth_rz" in df.columns
@@ -0,0 +1,94 @@
+"""Tests for `pipeline.anomaly.streaming` (online EWM + P² robust stats +
+sliding-window RRCF detector)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.anomaly import StreamingDetector, StreamingRRCF, run_rrcf_joint
+from pipeline.anomaly.streaming import P2Quantile, RunningRobustStats
+
+
+def test_p2_quantile_tracks_median() -> None:
+    rng = np.random.default_rng(0)
+    data = rng.normal(5.0, 2.0, 5000)
+    est = P2Quantile(0.5)
+    for x in data:
+        est.update(float(x))
+    assert est.value == pytest.approx(np.median(data), abs=0.1)
+
+
+def test_p2_quantile_exact_for_small_samples() -> None:
+    est = P2Quantile(0.5)
+    for x in (3.0, 1.0, 2.0):
+        est.update(x)
+    assert est.value == 2.0
+
+
+def test_running_robust_stats_zscore_matches_batch_scale() -> None:
+    rng = np.random.default_rng(1)
+    data = rng.normal(0.0, 1.0, 5000)
+    stats = RunningRobustStats()
+    for x in data:
+        stats.update(float(x))
+    # 1.4826·MAD is a consistent estimator of σ for normal data.
+    assert 1.4826 * stats.mad == pytest.approx(1.0, abs=0.1)
+    assert stats.zscore(3.0) == pytest.approx(3.0, abs=0.4)
+
+
+def test_streaming_rrcf_matches_batch_joint() -> None:
+    rng = np.random.default_rng(0)
+    x = rng.normal(0, 1, (40, 2))
+    np.random.seed(0)
+    batch_scores, _ = run_rrcf_joint(x, num_trees=5, tree_size=16, shingle=2)
+    np.random.seed(0)
+    forest = StreamingRRCF(n_features=2, num_trees=5, tree_size=16, shingle=2)
+    stream_scores = [forest.update(row)[0] for row in x]
+    assert np.allclose(stream_scores, batch_scores)
+
+
+def test_streaming_rrcf_memory_is_bounded() -> None:
+    forest = StreamingRRCF(num_trees=3, tree_size=20)
+    rng = np.random.default_rng(0)
+    for v in rng.normal(0, 1, 200):
+        forest.update(np.array([v]))
+    assert all(len(tree.leaves) <= 21 for tree in forest.forest)
+
+
+def test_streaming_detector_emits_point_and_range_events() -> None:
+    rng = np.random.default_rng(0)
+    times = np.arange(300) * 0.5
+    values = rng.normal(0.0, 0.05, 300)
+    values[200:206] = 5.0  # sustained shift, 3 s long
+    det = StreamingDetector({"blink_intensity": 3}, num_trees=20, tree_size=64, warmup=32)
+
+    events = []
+    for t, v in zip(times, values, strict=True):
+        events.extend(det.update(float(t), {"blink_intensity": float(v)}))
+    events.extend(det.flush())
+
+    points = [e for e in events if e.kind == "point"]
+    ranges = [e for e in events if e.kind == "range"]
+    assert any(100.0 <= e.start <= 103.0 for e in points)
+    assert any(e.start <= 101.0 <= e.end for e in ranges)
+    for r in ranges:
+        assert len(r.times) >= 2
+        assert all(0.5 <= b - a <= 2.0 for a, b in zip(r.times, r.times[1:], strict=False))
+
+
+def test_streaming_detector_skips_missing_values() -> None:
+    det = StreamingDetector({"loudness_db": 5}, warmup=0)
+    assert det.update(0.0, {"loudness_db": None}) == []
+    assert det.update(0.5, {"loudness_db": float("nan")}) == []
+    assert det.update(1.0, {}) == []
+
+
+def test_streaming_detector_ewm_matches_pandas() -> None:
+    det = StreamingDetector({"x": 4})
+    data = [1.0, 3.0, 2.0, 8.0, 5.0]
+    for i, v in enumerate(data):
+        det.update(i * 0.5, {"x": v})
+    expected = pd.Series(data).ewm(span=4, adjust=False).mean().iloc[-1]
+    assert det._features["x"].smooth == pytest.approx(expected)
@@ -0,0 +1,56 @@
+"""Tests for the synthetic interview generator behind `benchmarks/`."""
+
+from __future__ import annotations
+
+import wave
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synth import (
+    BLENDSHAPES,
+    INTERVIEWEE,
+    INTERVIEWER,
+    script_turns,
+    synthesize_interview,
+    synthetic_face_features,
+)
+from pipeline.audio.extract import extract_audio
+
+
+def test_script_alternates_speakers_with_ordered_word_timings() -> None:
+    turns = script_turns(120.0, seed=3)
+    assert [t.speaker for t in turns[:4]] == [INTERVIEWER, INTERVIEWEE] * 2
+    for prev, turn in pairwise(turns):
+        assert prev.end <= turn.start
+    for turn in turns:
+        starts = [w["start"] for w in turn.words]
+        assert starts == sorted(starts)
+        assert turn.start <= starts[0] and turn.words[-1]["end"] <= 120.0
+    assert script_turns(120.0, seed=3) == turns
+
+
+def test_synthetic_face_features_match_face_analysis_columns() -> None:
+    turns = script_turns(30.0)
+    df = synthetic_face_features(turns, 30.0, fps=1)
+    assert len(df) == 30
+    assert list(df.columns[:3]) == ["Time", "h_ratio", "v_ratio"]
+    assert set(BLENDSHAPES) <= set(df.columns)
+    values = df[list(BLENDSHAPES)].to_numpy()
+    assert np.all((values >= 0) & (values <= 1))
+
+
+def test_synthesized_video_has_audio_and_transcripts(tmp_path: Path) -> None:
+    interview = synthesize_interview(tmp_path, 0.25, seed=1)
+    assert interview.video_path.exists()
+    assert list(tmp_path.iterdir()) == [interview.video_path]
+
+    wav = extract_audio(interview.video_path, output_path=tmp_path / "audio.wav")
+    assert wav is not None
+    with wave.open(str(wav)) as w:
+        assert abs(w.getnframes() / w.getframerate() - 15.0) < 0.5
+
+    assert set(interview.utterances_df["speaker"]) == {INTERVIEWER, INTERVIEWEE}
+    assert len(interview.whisper_df) == len(interview.utterances_df)
+    assert {"start", "end", "text"} <= set(interview.whisper_df.loc[0, "words"][0])
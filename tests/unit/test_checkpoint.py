@@ -0,0 +1,119 @@
+"""Tests for stage checkpointing (`pipeline.io.checkpoint`) and `run_pipeline(resume=True)`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from pipeline import orchestrator
+from pipeline.io.checkpoint import StageManifest, fingerprint, path_stamp
+from pipeline.orchestrator import PipelineConfig, run_pipeline
+
+
+def test_fingerprint_is_order_sensitive_and_stable() -> None:
+    assert fingerprint("a", 1) == fingerprint("a", 1)
+    assert fingerprint("a", 1) != fingerprint(1, "a")
+
+
+def test_manifest_round_trip_and_output_invalidation(tmp_path: Path) -> None:
+    out = tmp_path / "out.parquet"
+    out.write_bytes(b"x")
+    manifest = StageManifest(tmp_path / "manifest.json")
+    manifest.record("merging", "fp1", [out])
+
+    reloaded = StageManifest(tmp_path / "manifest.json")
+    assert reloaded.is_fresh("merging", "fp1")
+    assert not reloaded.is_fresh("merging", "fp2")
+    assert not reloaded.is_fresh("transcribing", "fp1")
+
+    out.write_bytes(b"longer")
+    assert not reloaded.is_fresh("merging", "fp1")
+
+
+def test_manifest_ignores_corrupt_file(tmp_path: Path) -> None:
+    (tmp_path / "manifest.json").write_text("{not json")
+    assert not StageManifest(tmp_path / "manifest.json").is_fresh("merging", "fp")
+
+
+def test_path_stamp_covers_directories(tmp_path: Path) -> None:
+    assert path_stamp(tmp_path / "missing") is None
+    (tmp_path / "a.jpg").write_bytes(b"123")
+    assert path_stamp(tmp_path) == {"files": 1, "size": 3}
+
+
+def _patch_stages(monkeypatch, calls: list[str]) -> None:
+    from tests.unit.test_feature_engineering import _make_raw_df
+
+    def _frames(video_path, out_dir, nof_ps):
+        calls.append("frames")
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        (Path(out_dir) / "frame_0.jpg").write_bytes(b"jpg")
+
+    def _audio(video_path, output_path):
+        calls.append("audio")
+        Path(output_path).write_bytes(b"wav")
+        return Path(output_path)
+
+    def _face(model_path, images_path):
+        calls.append("face")
+        return pd.DataFrame({"Time": [0.0]})
+
+    def _audio_features(audio_path, segment_length):
+        calls.append("audio_features")
+        return pd.DataFrame({"Time": [0.0]})
+
+    def _merge(**kwargs):
+        calls.append("merge")
+        df = _make_raw_df(n=40)
+        df["wps"] = 2.0
+        df["filler_percentage"] = 0.0
+        df["pause_percent_pr"] = 0.0
+        return df
+
+    monkeypatch.setattr(orchestrator, "extract_frames", _frames)
+    monkeypatch.setattr(orchestrator, "extract_audio", _audio)
+    monkeypatch.setattr(orchestrator, "face_analysis_data", _face)
+    monkeypatch.setattr(orchestrator, "analyze_audio_layers", _audio_features)
+    monkeypatch.setattr(orchestrator, "merge_streams", _merge)
+
+
+@pytest.mark.parametrize("intermediate_format", ["parquet", "arrow"])
+def test_run_pipeline_resume_skips_completed_stages(
+    tmp_path: Path, monkeypatch, intermediate_format: str
+) -> None:
+    video = tmp_path / "interview.mp4"
+    video.write_bytes(b"video")
+    model = tmp_path / "face_landmarker.task"
+    model.write_bytes(b"model")
+    cfg = PipelineConfig(
+        job_id="resume",
+        data_root=tmp_path / "processed",
+        face_model_path=model,
+        enable_assemblyai=False,
+        enable_whisper=False,
+        intermediate_format=intermediate_format,
+    )
+    calls: list[str] = []
+    _patch_stages(monkeypatch, calls)
+
+    first = run_pipeline(video, cfg, resume=True)
+    assert calls == ["frames", "audio", "face", "audio_features", "merge"]
+    assert first.paths.manifest_json.exists()
+    assert first.paths.merged_parquet.exists()
+
+    calls.clear()
+    second = run_pipeline(video, cfg, resume=True)
+    assert calls == []
+    assert second.master_df_path.exists()
+    assert [m.stage for m in second.metrics] == list(orchestrator.STAGES)
+    assert all(m.skipped for m in second.metrics[:-1])
+    assert not second.metrics[-1].skipped
+    assert second.paths.metrics_json.exists()
+
+    # A changed config value re-runs that stage and everything downstream of it.
+    calls.clear()
+    cfg.window_size_sec = 1.0
+    run_pipeline(video, cfg, resume=True)
+    assert calls == ["audio_features", "merge"]
@@ -170,7 +170,7 @@ def test_get_speaker_timings_returns_intervals_for_target_speaker() -> None:
 def test_compute_speaker_median_pitch_mocked(monkeypatch) -> None:
     """Mock librosa so we don't need a real audio file. Verifies pitch
     aggregation across multiple speaker segments and the round() at the end."""
-    import pipeline.features.transforms as tf
+    import librosa
 
     def _fake_load(audio_path, sr):
         # 1-second of "audio" sampled at 16k
@@ -184,9 +184,9 @@ def test_compute_speaker_median_pitch_mocked(monkeypatch) -> None:
     def _fake_times_like(f0, sr):
         return np.linspace(0, 1, len(f0))
 
-    monkeypatch.setattr(tf.librosa, "load", _fake_load)
-    monkeypatch.setattr(tf.librosa, "pyin", _fake_pyin)
-    monkeypatch.setattr(tf.librosa, "times_like", _fake_times_like)
+    monkeypatch.setattr(librosa, "load", _fake_load)
+    monkeypatch.setattr(librosa, "pyin", _fake_pyin)
+    monkeypatch.setattr(librosa, "times_like", _fake_times_like)
 
     median = compute_speaker_median_pitch(
         audio_path="ignored", speaker_segments=[(0.0, 0.5), (0.5, 1.0)]
@@ -0,0 +1,58 @@
+"""Round-trip tests for the Arrow IPC intermediate format (`pipeline/io/ipc.py`)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.io.ipc import load_df_ipc_safe, load_frame, save_df_ipc_safe, save_frame
+
+
+def _frame() -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "Time": np.arange(4) * 0.5,
+            "loudness_db": [-20.0, -21.0, np.nan, -19.0],
+            "speaker": ["A", None, "B", "B"],
+            "words": [[{"text": "hi", "start": 0.0}], [], None, [{"text": "um", "start": 1.5}]],
+            "mixed": [{"a": 1}, {"b": 2}, None, {"a": 3}],
+        }
+    )
+    df.attrs["speaker"] = "B"
+    return df
+
+
+def test_ipc_round_trip_preserves_values_and_attrs(tmp_path: Path) -> None:
+    p = tmp_path / "merged.arrow"
+    df = _frame()
+    save_df_ipc_safe(df, p)
+    out = load_df_ipc_safe(p)
+    assert list(out.columns) == list(df.columns)
+    assert out["words"].tolist() == df["words"].tolist()
+    assert out["mixed"].tolist() == df["mixed"].tolist()
+    assert out.attrs == {"speaker": "B"}
+    np.testing.assert_array_equal(out["loudness_db"].to_numpy(), df["loudness_db"].to_numpy())
+
+
+def test_ipc_numeric_columns_are_memory_mapped_views(tmp_path: Path) -> None:
+    p = tmp_path / "scores.arrow"
+    save_df_ipc_safe(pd.DataFrame({"Time": np.arange(8) * 0.5, "x": np.ones(8)}), p)
+    out = load_df_ipc_safe(p, columns=["x"])
+    assert list(out.columns) == ["x"]
+    # Zero-copy: the column is a read-only view onto the mapped file.
+    assert not out["x"].to_numpy().flags.writeable
+    out["y"] = out["x"] * 2  # new columns are fine
+    assert out["y"].sum() == 16
+
+
+@pytest.mark.parametrize("name", ["frame.arrow", "frame.parquet"])
+def test_save_and_load_frame_dispatch_on_suffix(tmp_path: Path, name: str) -> None:
+    p = tmp_path / name
+    save_frame(_frame(), p)
+    out = load_frame(p)
+    assert out["speaker"].tolist() == ["A", None, "B", "B"]
+    magic = b"ARROW1" if name.endswith(".arrow") else b"PAR1"
+    assert p.read_bytes().startswith(magic)
@@ -0,0 +1,62 @@
+"""Tests for `pipeline.metrics.StageRecorder`."""
+
+from __future__ import annotations
+
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+
+from pipeline.metrics import StageRecorder
+
+
+def test_recorder_closes_stages_in_sequence_and_writes_json(tmp_path: Path) -> None:
+    recorder = StageRecorder(tmp_path / "metrics.json")
+    recorder.start("merging")
+    sum(i * i for i in range(50_000))
+    recorder.start("feature_engineering")
+    recorder.mark_skipped()
+    recorder.finish()
+    recorder.finish()  # idempotent once nothing is open
+
+    assert [m.stage for m in recorder.metrics] == ["merging", "feature_engineering"]
+    merging, fe = recorder.metrics
+    assert merging.wall_s >= 0 and merging.cpu_s >= 0
+    assert not merging.skipped and fe.skipped
+
+    payload = json.loads((tmp_path / "metrics.json").read_text())
+    assert [s["stage"] for s in payload["stages"]] == ["merging", "feature_engineering"]
+    assert {"wall_s", "cpu_s", "peak_rss_mb", "io_read_bytes", "io_write_bytes"} <= set(
+        payload["stages"][0]
+    )
+    assert payload["total_wall_s"] >= merging.wall_s
+
+
+def test_recorder_profiles_only_the_chosen_stage(tmp_path: Path) -> None:
+    recorder = StageRecorder(tmp_path / "metrics.json", profile_stage="merging")
+    recorder.start("transcribing")
+    recorder.start("merging")
+    sorted(range(10_000), reverse=True)
+    recorder.finish()
+
+    assert not (tmp_path / "profile_transcribing.prof").exists()
+    stats = pstats.Stats(str(tmp_path / "profile_merging.prof"))
+    assert stats.total_calls > 0
+
+
+def test_recorder_closes_a_failing_stage(tmp_path: Path) -> None:
+    recorder = StageRecorder(tmp_path / "metrics.json", profile_stage="merging")
+    with pytest.raises(ValueError), recorder:
+        recorder.start("transcribing")
+        recorder.start("merging")
+        raise ValueError("boom")
+
+    assert [(m.stage, m.failed) for m in recorder.metrics] == [
+        ("transcribing", False),
+        ("merging", True),
+    ]
+    payload = json.loads((tmp_path / "metrics.json").read_text())
+    assert payload["stages"][-1]["failed"] is True
+    assert recorder._profile is None
+    assert (tmp_path / "profile_merging.prof").exists()
@@ -23,8 +23,18 @@ from pipeline.features.linguistic import (
     is_filler,
     words_to_windows,
 )
+from pipeline.io.parquet import load_df_parquet_safe, save_df_parquet_safe
+from pipeline.io.paths import PipelinePaths
 from pipeline.merge import merge_streams
-from pipeline.orchestrator import STAGES, PipelineConfig, PipelineResult
+from pipeline.orchestrator import (
+    STAGES,
+    PipelineConfig,
+    PipelineResult,
+    _detect_joint,
+    rebuild_master,
+    score_anomalies,
+    threshold_anomalies,
+)
 
 
 def test_stages_match_spec() -> None:
@@ -49,6 +59,7 @@ def test_pipeline_config_defaults() -> None:
     assert cfg.enable_assemblyai is True
     assert cfg.enable_whisper is True
     assert cfg.frames_per_second == 1
+    assert cfg.rrcf_mode == "per_feature"
 
 
 def test_pipeline_result_has_required_fields() -> None:
@@ -199,3 +210,68 @@ def test_anomalous_time_ranges_clusters_consecutive_points() -> None:
     # First three are consecutive ⇒ one range; last two are consecutive ⇒ another
     assert len(ranges) == 2
     assert all(isinstance(r, list) for r in ranges)
+
+
+def test_detect_joint_emits_per_feature_dicts() -> None:
+    rng = np.random.default_rng(0)
+    n = 120
+    df = pd.DataFrame(
+        {
+            "Time": np.arange(n) * 0.5,
+            "a_rz": rng.normal(0, 1, n),
+            "b_rz": rng.normal(0, 1, n),
+        }
+    )
+    df.loc[60:63, "b_rz"] = 30.0
+    anomalies, c_anomalies = _detect_joint(df, ["a_rz", "b_rz", "missing_rz"], shingle=2)
+    assert set(anomalies) == {"a_rz", "b_rz", "missing_rz"}
+    assert anomalies["missing_rz"] == []
+    assert 30.0 in anomalies["b_rz"]
+    assert all(isinstance(r, list) for r in c_anomalies["b_rz"])
+
+
+def _enriched_frame(n: int = 60) -> pd.DataFrame:
+    from tests.unit.test_feature_engineering import _make_raw_df, _make_rz_df
+
+    df = _make_rz_df(_make_raw_df(n=n))
+    df.loc[30:33, "jaw_magnitude_smooth_rz"] = 25.0
+    df["filler_percentage"] = 0.0
+    df["pause_percent_pr"] = 0.0
+    return df
+
+
+def test_threshold_anomalies_retunes_cached_scores() -> None:
+    enriched = _enriched_frame()
+    scores = score_anomalies(enriched)
+    assert scores.attrs["rrcf_mode"] == "per_feature"
+    assert len(scores) == len(enriched)
+
+    loose, _ = threshold_anomalies(enriched, scores, n_sigma=0.0)
+    strict, _ = threshold_anomalies(enriched, scores, n_sigma=50.0)
+    for col in ("jaw_magnitude_smooth_rz", "wps_smooth_rz"):
+        assert set(strict[col]) <= set(loose[col])
+    assert {"filler_percentage", "pause_percent_pr"} <= set(loose)
+
+
+def test_score_anomalies_joint_layout() -> None:
+    enriched = _enriched_frame()
+    scores = score_anomalies(enriched, rrcf_mode="joint", shingle=2)
+    assert {"joint_visual", "joint_audio", "jaw_magnitude_smooth_rz"} <= set(scores.columns)
+    anomalies, c_anomalies = threshold_anomalies(enriched, scores)
+    assert set(anomalies) == set(c_anomalies)
+
+
+def test_rebuild_master_from_cached_scores(tmp_path) -> None:
+    paths = PipelinePaths(root=tmp_path, job_id="cached")
+    paths.ensure_dirs()
+    enriched = _enriched_frame()
+    scores = score_anomalies(enriched)
+    scores.attrs["speaker"] = "B"
+    save_df_parquet_safe(enriched, paths.enriched_parquet)
+    save_df_parquet_safe(scores, paths.anomaly_scores_parquet)
+
+    out = rebuild_master(paths, n_sigma=2.0, range_max=1.0)
+    master = load_df_parquet_safe(out)
+    assert out == paths.master_parquet
+    assert len(master) == len(enriched)
+    assert isinstance(master.iloc[1]["jaw_movement_data"], dict)
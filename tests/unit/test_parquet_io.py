@@ -66,10 +66,49 @@ def test_round_trip_pydantic_dict_columns(tmp_path: Path) -> None:
 
 def test_sidecar_schema_records_column_types(tmp_path: Path) -> None:
     p = tmp_path / "with_schema.parquet"
-    df = pd.DataFrame({"Time": [0.0], "blinking_data": [{"intensity": 0.1}]})
+    df = pd.DataFrame(
+        {
+            "Time": [0.0, 0.5],
+            "blinking_data": [{"intensity": 0.1}, {"intensity": 0.2}],
+            # Differing key sets can't share one struct type → JSON fallback.
+            "mixed": [{"a": 1}, {"b": "x"}],
+        }
+    )
     save_df_parquet_safe(df, p)
     schema = json.loads(Path(str(p) + ".schema.json").read_text())
-    assert schema == {"Time": "normal", "blinking_data": "json"}
+    assert schema == {"Time": "normal", "blinking_data": "arrow", "mixed": "json"}
+    out = load_df_parquet_safe(p)
+    assert out.loc[1, "mixed"] == {"b": "x"}
+
+
+def test_arrow_round_trip_preserves_key_order_lists_and_nan(tmp_path: Path) -> None:
+    p = tmp_path / "arrow.parquet"
+    rows = [
+        {"z": 1.0, "a": [5.0, 5.5], "level": "loud"},
+        {"z": float("nan"), "a": None, "level": None},
+    ]
+    df = pd.DataFrame({"Time": [0.0, 0.5], "data": rows, "ranges": [[[1.0, 1.5]], []]})
+    df.attrs["speaker"] = "B"
+    save_df_parquet_safe(df, p)
+    out = load_df_parquet_safe(p)
+
+    assert list(out.columns) == ["Time", "data", "ranges"]
+    assert list(out.loc[0, "data"]) == ["z", "a", "level"]
+    assert out.loc[0, "data"]["a"] == [5.0, 5.5]
+    assert isinstance(out.loc[0, "data"]["a"], list)
+    assert np.isnan(out.loc[1, "data"]["z"])
+    assert out.loc[0, "ranges"] == [[1.0, 1.5]]
+    assert out.attrs == {"speaker": "B"}
+
+
+def test_arrow_columns_decode_without_sidecar(tmp_path: Path) -> None:
+    p = tmp_path / "arrow_no_sidecar.parquet"
+    df = pd.DataFrame({"Time": [0.0], "data": [{"a": [1.0]}]})
+    save_df_parquet_safe(df, p)
+    Path(str(p) + ".schema.json").unlink()
+    out = load_df_parquet_safe(p)
+    assert out.loc[0, "data"] == {"a": [1.0]}
+    assert isinstance(out.loc[0, "data"]["a"], list)
 
 
 def test_round_trip_numpy_scalars_in_object_column(tmp_path: Path) -> None:
@@ -174,3 +213,27 @@ def test_round_trip_unserializable_falls_back_to_string(tmp_path: Path) -> None:
     save_df_parquet_safe(df, p)
     out = load_df_parquet_safe(p)
     assert out.loc[0, "thing"] == "<Bag>"
+
+
+def test_columns_and_time_range_push_down(tmp_path: Path) -> None:
+    import pyarrow.parquet as pq
+
+    p = tmp_path / "ranged.parquet"
+    n = 40
+    df = pd.DataFrame(
+        {
+            "Time": np.arange(n)[::-1] * 0.5,  # written unsorted on purpose
+            "blinking_data": [{"intensity": float(i)} for i in range(n)],
+            "mixed": [{"a": 1}, {"b": 2}] * (n // 2),
+        }
+    )
+    save_df_parquet_safe(df, p, sort_by="Time", row_group_size=8)
+    assert pq.ParquetFile(p).metadata.num_row_groups == 5
+
+    out = load_df_parquet_safe(p, columns=["Time", "blinking_data"], time_range=(2.0, 4.0))
+    assert list(out.columns) == ["Time", "blinking_data"]
+    assert out["Time"].tolist() == [2.0, 2.5, 3.0, 3.5, 4.0]
+    assert out.loc[0, "blinking_data"] == {"intensity": 35.0}
+
+    only_json = load_df_parquet_safe(p, columns=["mixed"], time_range=(0.0, 0.5))
+    assert only_json["mixed"].tolist() == [{"b": 2}, {"a": 1}]
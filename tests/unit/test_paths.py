@@ -17,7 +17,11 @@ def test_paths_derive_from_root_and_job_id(tmp_path: Path) -> None:
     assert paths.utterances_parquet == tmp_path / "abc123" / "utterances.parquet"
     assert paths.whisper_parquet == tmp_path / "abc123" / "whisper.parquet"
     assert paths.merged_parquet == tmp_path / "abc123" / "merged.parquet"
+    assert paths.enriched_parquet == tmp_path / "abc123" / "enriched.parquet"
+    assert paths.anomaly_scores_parquet == tmp_path / "abc123" / "anomaly_scores.parquet"
     assert paths.master_parquet == tmp_path / "abc123" / "master.parquet"
+    assert paths.manifest_json == tmp_path / "abc123" / "manifest.json"
+    assert paths.metrics_json == tmp_path / "abc123" / "metrics.json"
     assert paths.log_file == tmp_path / "abc123" / "job.log"
 
 
@@ -34,3 +38,11 @@ def test_paths_are_frozen() -> None:
     paths = PipelinePaths(root=Path("/tmp"), job_id="x")
     with __import__("pytest").raises(dataclasses.FrozenInstanceError):
         paths.job_id = "y"  # type: ignore[misc]
+
+
+def test_arrow_intermediates_switch_suffix_but_not_master(tmp_path: Path) -> None:
+    paths = PipelinePaths(root=tmp_path, job_id="ipc", intermediate_format="arrow")
+    assert paths.merged_parquet == tmp_path / "ipc" / "merged.arrow"
+    assert paths.enriched_parquet == tmp_path / "ipc" / "enriched.arrow"
+    assert paths.utterances_parquet == tmp_path / "ipc" / "utterances.arrow"
+    assert paths.master_parquet == tmp_path / "ipc" / "master.parquet"